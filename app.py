@@ -1,18 +1,123 @@
 import streamlit as st
 import ast
+import io
 import pandas as pd
-from io import StringIO
-import json
 
 # Import from your existing project files
-from greedy_syndrome_mapper import GreedySyndromeMapper
-from main import load_patterns
+from app_data import compact_json, csv_chunks, json_chunks, parity_rows, parse_pattern_lines, parse_pattern_list
+from code_cache import CodeCache
+from greedy_syndrome_mapper import ConstructionStats, GreedySyndromeMapper
+from light_cli import SMALL_CODE_PATTERNS
+
+# Large codes (up to 2^16 patterns) stay responsive because nothing proportional to |T| is rebuilt on a rerun:
+# parsing and construction are memoized across reruns and sessions, tables render one page of rows from
+# the packed mapping, and downloads are only generated when requested.
+
+PAGE_SIZES = (50, 200, 1000)
 
 st.set_page_config(layout="wide")
 
 st.title("Greedy Syndrome Mapper")
 st.write("An interactive web app for the Loop Transversal Code project.")
 
+
+@st.cache_data(max_entries=8, show_spinner="Parsing error patterns...")
+def parse_uploaded_patterns(text: str) -> tuple[tuple[int, ...], int]:
+    return parse_pattern_lines(text)
+
+
+@st.cache_resource(max_entries=16, show_spinner="Running the greedy algorithm...")
+def build_code(key: str, n: int, _patterns: frozenset[int]) -> GreedySyndromeMapper:
+    # Shared by every session; key (CodeCache.key of the pattern set) stands in for the unhashed patterns
+    if len(_patterns) > SMALL_CODE_PATTERNS:
+        return CodeCache().get_or_build_packed(_patterns, n)
+    return GreedySyndromeMapper.from_packed(_patterns, n)
+
+
+@st.cache_resource(max_entries=4, show_spinner="Running the greedy algorithm...")
+def build_code_with_stats(key: str, n: int, _patterns: frozenset[int]) -> tuple[GreedySyndromeMapper | None, ConstructionStats, str | None]:
+    # Statistics describe a fresh construction, so this bypasses the disk cache; a failure is kept with its stats
+    stats = ConstructionStats()
+    try:
+        return GreedySyndromeMapper.from_packed(_patterns, n, stats=stats), stats, None
+    except RuntimeError as e:
+        return None, stats, str(e)
+
+
+@st.cache_resource(max_entries=16)
+def sorted_vectors(key: str, _mapper: GreedySyndromeMapper) -> list[int]:
+    return sorted(_mapper.packed_syndrome_map)
+
+
+def bits(value: int, n: int) -> str:
+    return format(value, f"0{n}b")
+
+
+def npz_bytes(mapper: GreedySyndromeMapper) -> bytes:
+    buffer = io.BytesIO()
+    mapper.export(buffer, "all", "npz")
+    return buffer.getvalue()
+
+
+def paginated_table(name: str, widget_key: str, count: int, rows) -> None:
+    """
+    Show rows(start, stop) (a list of dicts) one page at a time; widget_key keeps the paging widgets of
+    different codes apart.
+    """
+    if count == 0:
+        st.info(f"No {name} available.")
+        return
+    col_size, col_page, col_info = st.columns([1, 1, 2])
+    page_size = col_size.selectbox("Rows per page", PAGE_SIZES, key=f"{widget_key}-page-size")
+    pages = -(-count // page_size)
+    page = col_page.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key=f"{widget_key}-page")
+    start = (min(page, pages) - 1) * page_size
+    stop = min(start + page_size, count)
+    col_info.caption(f"Rows {start + 1}-{stop} of {count}")
+    st.dataframe(pd.DataFrame(rows(start, stop)), height=420, use_container_width=True, hide_index=True)
+
+
+def lazy_download(label: str, key: str, name: str, file_name: str, mime: str, generate) -> None:
+    """
+    A download button whose data is only generated (from the chunks yielded by generate()) once the
+    user asks for it. key is the cache key of the data and name tells the downloads of one code apart.
+    The session keeps a single payload: preparing another download replaces it.
+    """
+    prepared = st.session_state.get("download")
+    if prepared is None or prepared[:2] != (key, name):
+        if not st.button(f"Prepare {label}", key=f"prepare-{key}-{name}"):
+            return
+        st.session_state.pop("download", None) # Free the previous payload before building the next one
+        buffer = io.BytesIO()
+        with st.spinner(f"Preparing {label}..."):
+            for chunk in generate():
+                buffer.write(chunk)
+        prepared = st.session_state["download"] = (key, name, buffer.getvalue())
+    st.download_button(f"Download {label}", prepared[2], file_name, mime, key=f"download-{key}-{name}")
+
+
+def drop_stale_download(key: str | None) -> None:
+    """
+    Forget a prepared download that belongs to other data than the current code's key.
+    """
+    prepared = st.session_state.get("download")
+    if prepared is not None and prepared[0] != key:
+        del st.session_state["download"]
+
+
+def show_construction_stats(stats: ConstructionStats):
+    st.subheader("Construction Statistics")
+    totals = stats.totals()
+    col_dims, col_cand, col_time, col_pool = st.columns(4)
+    col_dims.metric("Dimensions", totals["dimensions"])
+    col_cand.metric("Candidates tried", totals["candidates"])
+    col_time.metric("Search time (ms)", f"{totals['seconds'] * 1e3:.2f}")
+    col_pool.metric("Syndromes taken", totals["pool_taken"])
+    df_stats = pd.DataFrame(stats.as_rows())
+    st.dataframe(df_stats, height=420, use_container_width=True)
+    st.line_chart(df_stats.set_index("dimension")[["candidates", "pool_taken"]])
+
+
 # --- Input Section ---
 st.sidebar.header("Input Error Patterns (T)")
 
@@ -21,116 +126,118 @@ input_method = st.sidebar.radio(
     ("Standard Basis", "Text Input", "Upload File")
 )
 
-patterns = None
-
-if input_method == "Standard Basis":
-    st.sidebar.subheader("Generate Standard Basis Vectors")
-    n_basis = st.sidebar.number_input("Enter the dimension (n):", min_value=2, max_value=16, value=3, step=1)
-    if n_basis:
-        patterns = load_patterns(standard_basis=n_basis)
-
-elif input_method == "Text Input":
-    st.sidebar.subheader("Enter Patterns as a Python List")
-    patterns_str = st.sidebar.text_area(
-        "e.g., [[1, 0, 0], [0, 1, 0], [0, 0, 1]]",
-        height=200
-    )
-    if patterns_str:
-        try:
-            patterns = ast.literal_eval(patterns_str)
-        except (ValueError, SyntaxError) as e:
-            st.error(f"Invalid Python literal format: {e}")
-            patterns = None
-
-elif input_method == "Upload File":
-    st.sidebar.subheader("Upload a .txt file")
-    uploaded_file = st.sidebar.file_uploader("Each line should be a vector, e.g., [1, 0, 0]", type=["txt"])
-    if uploaded_file is not None:
-        try:
-            stringio = StringIO(uploaded_file.getvalue().decode("utf-8"))
-            lines = stringio.readlines()
-            patterns = [ast.literal_eval(line.strip()) for line in lines if line.strip()]
-        except Exception as e:
-            st.error(f"Error reading or parsing file: {e}")
-            patterns = None
+packed_patterns = None # (packed patterns in input order, n)
+
+try:
+    if input_method == "Standard Basis":
+        st.sidebar.subheader("Generate Standard Basis Vectors")
+        n_basis = st.sidebar.number_input("Enter the dimension (n):", min_value=2, max_value=16, value=3, step=1)
+        if n_basis:
+            packed_patterns = tuple(1 << i for i in range(n_basis - 1, -1, -1)), n_basis
+
+    elif input_method == "Text Input":
+        st.sidebar.subheader("Enter Patterns as a Python List")
+        patterns_str = st.sidebar.text_area(
+            "e.g., [[1, 0, 0], [0, 1, 0], [0, 0, 1]]",
+            height=200
+        )
+        if patterns_str:
+            packed_patterns = parse_pattern_list(ast.literal_eval(patterns_str))
+
+    elif input_method == "Upload File":
+        st.sidebar.subheader("Upload a .txt file")
+        uploaded_file = st.sidebar.file_uploader("Each line should be a vector, e.g., [1, 0, 0]", type=["txt"])
+        if uploaded_file is not None:
+            packed_patterns = parse_uploaded_patterns(uploaded_file.getvalue().decode("utf-8"))
+except (ValueError, SyntaxError, TypeError) as e:
+    st.error(f"Invalid error patterns: {e}")
+    packed_patterns = None
+
+show_stats = st.sidebar.checkbox("Collect construction statistics", help="Rebuilds the code instead of using the cache.")
 
 # --- Execution and Display Section ---
+# Paging and download widgets rerun the script, so the results stay up once generated
 if st.button("▶️ Generate Mapping"):
-    if patterns:
-        # 上方：Input 概覽（raw style, 可換行，依頁面寬度自動換行）
-        st.header("Input")
-        st.subheader("Error Patterns — Raw View")
-
-        try:
-            # compact_json 為單行 JSON（使用最少空白），不含縮排
-            compact_json = json.dumps(patterns, ensure_ascii=False, separators=(",", ":"))
-        except Exception:
-            compact_json = str(patterns)
-
-        # 直接顯示 compact JSON（字串），讓介面根據頁面寬度換行
-        st.subheader("Error Patterns (compact)")
-        st.write(compact_json)
-
-        # 下載 compact JSON
-        try:
-            st.download_button("Download patterns (JSON)", compact_json.encode('utf-8'), "patterns.json", "application/json")
-        except Exception:
-            pass
-
-        st.markdown("---")
-
-        # 下方：Results（由上到下顯示）
-        st.header("Results")
-
-        try:
-            with st.spinner('Running the greedy algorithm...'):
-                mapper = GreedySyndromeMapper(patterns)
-
-            tab_full, tab_basis, tab_h = st.tabs(["Full Syndrome Mapping", "Basis Mapping", "Parity Check Matrix (H)"])
-
-            with tab_full:
-                st.subheader("Full Syndrome Mapping")
-                full_map_data = [{"Vector": str(k), "Syndrome": str(v)} for k, v in sorted(mapper.syndrome_map.items())]
-                if full_map_data:
-                    df_full = pd.DataFrame(full_map_data)
-                    st.dataframe(df_full, height=420, use_container_width=True)
-                    try:
-                        st.download_button("Download full mapping (CSV)", df_full.to_csv(index=False).encode('utf-8'), "full_mapping.csv", "text/csv")
-                    except Exception:
-                        pass
-                else:
-                    st.info("No full mapping available.")
-
-            with tab_basis:
-                st.subheader("Basis Mapping")
-                basis_map_list = mapper.get_basis_map_list()
-                basis_map_data = [{"Basis Vector": str(item[0]), "Syndrome": str(item[1])} for item in basis_map_list]
-                if basis_map_data:
-                    df_basis = pd.DataFrame(basis_map_data)
-                    st.dataframe(df_basis, height=420, use_container_width=True)
-                    try:
-                        st.download_button("Download basis mapping (CSV)", df_basis.to_csv(index=False).encode('utf-8'), "basis_mapping.csv", "text/csv")
-                    except Exception:
-                        pass
-                else:
-                    st.info("No basis mapping available.")
-
-            with tab_h:
-                st.subheader("Parity Check Matrix (H)")
-                parity_matrix = mapper.get_parity_check_matrix()
-                try:
-                    st.text("Matrix dimensions: " + str(parity_matrix.shape))
-                    st.dataframe(pd.DataFrame(parity_matrix), height=420, use_container_width=True)
-                    try:
-                        st.download_button("Download parity matrix (CSV)", pd.DataFrame(parity_matrix).to_csv(index=False).encode('utf-8'), "parity_matrix.csv", "text/csv")
-                    except Exception:
-                        pass
-                except Exception:
-                    st.write(parity_matrix)
-
-        except (ValueError, RuntimeError, IndexError) as e:
-            st.error(f"An error occurred during mapping: {e}")
-    else:
-        st.warning("Please provide error patterns using one of the methods on the left.")
+    st.session_state["generated"] = True
+if packed_patterns is None and st.session_state.get("generated"):
+    st.warning("Please provide error patterns using one of the methods on the left.")
+    drop_stale_download(None)
+elif st.session_state.get("generated"):
+    input_patterns, n = packed_patterns
+    unique_patterns = frozenset(input_patterns)
+    key = CodeCache.key(unique_patterns, n)
+    # The patterns JSON follows the input order, so downloads are keyed on the input as well as the code
+    data_key = f"{key}-{hash(input_patterns) & 0xFFFFFFFF:08x}"
+    drop_stale_download(data_key)
+    st.header("Input")
+    col_n, col_t = st.columns(2)
+    col_n.metric("Vector length (n)", n)
+    col_t.metric("Error patterns |T|", len(unique_patterns))
+    st.subheader("Error Patterns (compact)")
+    # Compact single-line JSON, wrapped to the page width; large inputs show a prefix and download in full
+    st.write(compact_json(input_patterns, n))
+    lazy_download("patterns (JSON)", data_key, "patterns-json", "patterns.json", "application/json",
+                  lambda: json_chunks(input_patterns, n))
+    with st.expander("Error patterns (sorted, deduplicated)"):
+        patterns = sorted(unique_patterns)
+        paginated_table("error patterns", f"{key}-patterns", len(patterns), lambda start, stop: [{"Vector": bits(v, n)} for v in patterns[start:stop]])
+
+    st.markdown("---")
+    st.header("Results")
+
+    stats = None
+    try:
+        if show_stats:
+            mapper, stats, error = build_code_with_stats(key, n, unique_patterns)
+            if error is not None:
+                raise RuntimeError(error)
+        else:
+            mapper = build_code(key, n, unique_patterns)
+        vectors = sorted_vectors(key, mapper)
+        syndrome_map = mapper.packed_syndrome_map
+
+        tab_names = ["Full Syndrome Mapping", "Basis Mapping", "Parity Check Matrix (H)"]
+        if stats is not None:
+            tab_names.append("Construction Stats")
+        tab_full, tab_basis, tab_h, *tab_stats = st.tabs(tab_names)
+
+        with tab_full:
+            st.subheader("Full Syndrome Mapping")
+            paginated_table("full mapping", f"{key}-full", len(vectors), lambda start, stop: [
+                {"Vector": bits(v, n), "Syndrome": bits(syndrome_map[v], n)} for v in vectors[start:stop]])
+            lazy_download("full mapping (CSV)", data_key, "full-csv", "full_mapping.csv", "text/csv",
+                          lambda: csv_chunks("Vector,Syndrome", len(vectors),
+                                             lambda i: f"{bits(vectors[i], n)},{bits(syndrome_map[vectors[i]], n)}"))
+            lazy_download("all results (NPZ)", data_key, "all-npz", "code.npz", "application/octet-stream",
+                          lambda: [npz_bytes(mapper)])
+
+        with tab_basis:
+            st.subheader("Basis Mapping")
+            basis_map_list = mapper.get_basis_map_list()
+            basis_rows = [("".join(map(str, basis_v)), "".join(map(str, syndrome_v))) for basis_v, syndrome_v in basis_map_list]
+            paginated_table("basis mapping", f"{key}-basis", len(basis_rows), lambda start, stop: [
+                {"Basis Vector": b, "Syndrome": s} for b, s in basis_rows[start:stop]])
+            lazy_download("basis mapping (CSV)", data_key, "basis-csv", "basis_mapping.csv", "text/csv",
+                          lambda: csv_chunks("Basis Vector,Syndrome", len(basis_rows), lambda i: ",".join(basis_rows[i])))
+
+        with tab_h:
+            st.subheader("Parity Check Matrix (H)")
+            parity_matrix = mapper.get_parity_check_matrix()
+            st.text("Matrix dimensions: " + str(parity_matrix.shape))
+            # One bit string per row (H has one column per basis vector), far cheaper to render than a DataFrame
+            h_rows = parity_rows(parity_matrix)
+            columns = parity_matrix.shape[1] if parity_matrix.ndim == 2 else 0
+            st.code("\n".join(h_rows) or "(empty)", language=None)
+            lazy_download("parity matrix (CSV)", data_key, "parity-csv", "parity_matrix.csv", "text/csv",
+                          lambda: csv_chunks(",".join(map(str, range(columns))), len(h_rows), lambda i: ",".join(h_rows[i])))
+
+        if tab_stats:
+            with tab_stats[0]:
+                show_construction_stats(stats)
+
+    except (ValueError, RuntimeError, IndexError) as e:
+        st.error(f"An error occurred during mapping: {e}")
+        if stats is not None and stats.dimensions:
+            show_construction_stats(stats)
 
 st.sidebar.info("After providing input, click the 'Generate Mapping' button to see the results.")
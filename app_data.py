@@ -0,0 +1,93 @@
+import ast
+
+# Data helpers of app.py, kept free of Streamlit so that they can be tested without it.
+# Patterns are packed ints (leftmost position = most significant bit), as in greedy_syndrome_mapper.
+
+PREVIEW_PATTERNS = 256 # Patterns shown in the compact JSON view; the download holds all of them
+DOWNLOAD_CHUNK_ROWS = 8192
+
+
+def _line_bits(line: str) -> str:
+    """
+    The bit string of one vector line such as "[1, 0, 0]" or "(1, 0, 0)".
+    """
+    if line[:1] in "[(" and line[-1:] in "])":
+        tokens = [token.strip() for token in line[1:-1].split(",")]
+        if all(token in ("0", "1") for token in tokens):
+            return "".join(tokens) # Plain 0/1 lines skip ast.literal_eval, which takes seconds for 2^16 lines
+    return _vector_bits(ast.literal_eval(line))
+
+
+def _vector_bits(vector) -> str:
+    if not isinstance(vector, (list, tuple)) or not vector or any(bit not in (0, 1) for bit in vector):
+        raise ValueError(f"Not a vector of 0/1 entries: {vector!r}")
+    return "".join(str(int(bit)) for bit in vector)
+
+
+def parse_pattern_lines(text: str) -> tuple[tuple[int, ...], int]:
+    """
+    Packed patterns in file order (duplicates kept) and n, from one vector per line, e.g. "[1, 0, 0]".
+    """
+    return _pack_bit_strings([_line_bits(line) for line in map(str.strip, text.splitlines()) if line])
+
+
+def parse_pattern_list(vectors) -> tuple[tuple[int, ...], int]:
+    """
+    Packed patterns in input order and n, from a list of 0/1 vectors such as [[1, 0, 0], [0, 1, 0]].
+    """
+    if not isinstance(vectors, (list, tuple)):
+        raise ValueError("Error patterns must be a list of vectors.")
+    return _pack_bit_strings([_vector_bits(vector) for vector in vectors])
+
+
+def _pack_bit_strings(vectors: list[str]) -> tuple[tuple[int, ...], int]:
+    if not vectors:
+        raise ValueError("error_patterns cannot be an empty set.")
+    n = len(vectors[0])
+    if any(len(v) != n for v in vectors):
+        raise ValueError("All vectors in error_patterns must have the same length.")
+    return tuple(int(v, 2) for v in vectors), n
+
+
+def vector_json(value: int, n: int) -> str:
+    return "[" + ",".join(format(value, f"0{n}b")) + "]"
+
+
+def compact_json(patterns, n: int, limit: int = PREVIEW_PATTERNS) -> str:
+    """
+    Single-line JSON of the first limit patterns, noting how many were left out.
+    """
+    shown = "[" + ",".join(vector_json(v, n) for v in patterns[:limit]) + "]"
+    if len(patterns) > limit:
+        shown += f" ... and {len(patterns) - limit} more patterns (in the download)"
+    return shown
+
+
+def json_chunks(patterns, n: int, chunk_rows: int = DOWNLOAD_CHUNK_ROWS):
+    """
+    Yield the compact JSON list of all patterns as encoded chunks of chunk_rows vectors.
+    """
+    yield b"["
+    for start in range(0, len(patterns), chunk_rows):
+        separator = "," if start else ""
+        yield (separator + ",".join(vector_json(v, n) for v in patterns[start:start + chunk_rows])).encode("utf-8")
+    yield b"]"
+
+
+def csv_chunks(header: str, count: int, line, chunk_rows: int = DOWNLOAD_CHUNK_ROWS):
+    """
+    Yield a CSV file as encoded chunks of chunk_rows lines, formatting line(i) for each row i.
+    """
+    yield (header + "\n").encode("utf-8")
+    for start in range(0, count, chunk_rows):
+        yield "".join(line(i) + "\n" for i in range(start, min(start + chunk_rows, count))).encode("utf-8")
+
+
+def parity_rows(matrix) -> list[str]:
+    """
+    The rows of a parity check matrix as bit strings. H has one column per basis vector, not
+    necessarily n, and an empty code gives a matrix without rows.
+    """
+    if matrix.ndim != 2:
+        return []
+    return ["".join(map(str, row)) for row in matrix.tolist()]
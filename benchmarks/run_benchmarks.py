@@ -0,0 +1,183 @@
+"""
+Benchmark harness for the greedy construction and the batch decoder.
+
+Sweeps block lengths and error pattern families, records construction time, peak memory
+(tracemalloc), syndrome pool size, decode throughput and the construction backend (native
+library or pure Python), and writes everything to JSON. When the native library (the C++
+build in src_cpp) is available, every case is also timed with LTC_BACKEND=python and with
+LTC_BACKEND=native, and the record holds both timings and their ratio. A previous JSON file can be passed
+with --baseline to fail the run when any case got slower than the allowed ratio; cases that
+ran on another backend than in the baseline are refused rather than compared.
+
+Example:
+    python benchmarks/run_benchmarks.py --n 8 --n 16 --n 24 --output bench.json
+"""
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import typer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import native_backend
+from greedy_syndrome_mapper import GreedySyndromeMapper
+from pattern_generators import family_patterns
+from syndrome_decoder import SyndromeDecoder
+
+DEFAULT_NS = [8, 12, 16, 20, 24, 28, 32]
+DEFAULT_FAMILIES = ["weight:{n}:1", "weight:{n}:2", "weight:{n}:3", "burst:{n}:4"]
+
+app = typer.Typer()
+
+
+@contextlib.contextmanager
+def forced_backend(backend: str):
+    """
+    Run the enclosed constructions with LTC_BACKEND set to backend.
+    """
+    previous = os.environ.get("LTC_BACKEND")
+    os.environ["LTC_BACKEND"] = backend
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ["LTC_BACKEND"]
+        else:
+            os.environ["LTC_BACKEND"] = previous
+
+
+def best_construction_time(patterns: list[int], n: int, repeat: int) -> tuple[GreedySyndromeMapper, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        mapper = GreedySyndromeMapper.from_packed(patterns, n)
+        best = min(best, time.perf_counter() - start)
+    return mapper, best
+
+
+def measure_construction(patterns: list[int], n: int, repeat: int = 3) -> tuple[GreedySyndromeMapper, dict]:
+    """
+    Build the code repeat times and report the best wall-clock time, then once more under tracemalloc for peak memory.
+    If the native library can build this code, also report the best time of each backend and the
+    Python/native ratio (None otherwise).
+    """
+    mapper, best = best_construction_time(patterns, n, repeat)
+    tracemalloc.start()
+    GreedySyndromeMapper.from_packed(patterns, n)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    backend = GreedySyndromeMapper.construction_backend(n)
+    python_s = native_s = speedup = None
+    if native_backend.available() and backend == "native":
+        with forced_backend("python"):
+            python_s = best_construction_time(patterns, n, repeat)[1]
+        with forced_backend("native"):
+            native_s = best_construction_time(patterns, n, repeat)[1]
+        speedup = python_s / native_s if native_s > 0 else None
+    return mapper, {
+        "construction_s": best,
+        "peak_bytes": peak,
+        "pool_taken": len(mapper.available_syndromes.taken),
+        "check_bits": int(mapper.get_parity_check_matrix().shape[0]),
+        "backend": backend,
+        "python_construction_s": python_s,
+        "native_construction_s": native_s,
+        "native_speedup": speedup,
+    }
+
+
+def measure_decode(mapper: GreedySyndromeMapper, words: int, seed: int = 0) -> dict:
+    """
+    Decode random packed words and report throughput; skipped when the syndromes do not fit in 64 bits.
+    """
+    try:
+        decoder = SyndromeDecoder(mapper)
+    except ValueError:
+        return {"decode_words_per_s": None}
+    rng = np.random.default_rng(seed)
+    received = rng.integers(0, 256, size=(words, decoder.n_bytes), dtype=np.uint8)
+    start = time.perf_counter()
+    decoder.decode_batch(received, packed=True)
+    seconds = time.perf_counter() - start
+    return {"decode_words_per_s": words / seconds if seconds > 0 else None}
+
+
+def run_suite(ns: list[int], families: list[str], decode_words: int = 200_000, repeat: int = 3) -> dict:
+    results = []
+    for n in ns:
+        for template in families:
+            spec = template.format(n=n)
+            patterns = family_patterns(spec, packed=True)
+            mapper, record = measure_construction(patterns, n, repeat)
+            record.update(measure_decode(mapper, decode_words))
+            record.update({"family": spec, "n": n, "patterns": len(patterns)})
+            results.append(record)
+            speedup = f"  native x{record['native_speedup']:.1f}" if record["native_speedup"] else ""
+            typer.echo(f"{spec:>18}  |T|={len(patterns):<7} construct {record['construction_s'] * 1e3:9.2f} ms  "
+                       f"peak {record['peak_bytes'] / 1024:9.1f} KiB  r={record['check_bits']}  {record['backend']}{speedup}")
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, max_ratio: float) -> list[str]:
+    """
+    Return a message for every case whose construction time exceeds max_ratio times the baseline.
+    Raise ValueError if a case ran on another construction backend than in the baseline (or the
+    baseline does not record it), since native and Python timings are not comparable.
+    """
+    previous = {r["family"]: r for r in baseline.get("results", [])}
+    mismatched = [f"{r['family']} ({previous[r['family']].get('backend', 'unknown')} -> {r['backend']})"
+                  for r in current["results"] if r["family"] in previous and previous[r["family"]].get("backend") != r["backend"]]
+    if mismatched:
+        raise ValueError("The baseline ran on another construction backend for: " + ", ".join(mismatched)
+                         + ". Rerun it with the same backend (see LTC_BACKEND).")
+    regressions = []
+    for record in current["results"]:
+        old = previous.get(record["family"])
+        if old and old["construction_s"] > 0 and record["construction_s"] > max_ratio * old["construction_s"]:
+            regressions.append(f"{record['family']}: {old['construction_s']:.4f} s -> {record['construction_s']:.4f} s")
+    return regressions
+
+
+@app.command()
+def main(n: list[int] = typer.Option(DEFAULT_NS, help="Block lengths to sweep."),
+         family: list[str] = typer.Option(DEFAULT_FAMILIES, help="Family templates; {n} is replaced by the block length."),
+         decode_words: int = typer.Option(200_000), repeat: int = typer.Option(3),
+         output: str = typer.Option("benchmark_results.json"),
+         baseline: str = typer.Option(None, help="Previous results JSON to compare against."),
+         max_ratio: float = typer.Option(1.5, help="Allowed slowdown versus the baseline.")):
+    """
+    Run the benchmark sweep and write the results to JSON.
+    """
+    report = run_suite(n, family, decode_words, repeat)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    typer.echo(f"Results written to {output}")
+    if baseline:
+        with open(baseline) as f:
+            try:
+                regressions = compare(report, json.load(f), max_ratio)
+            except ValueError as e:
+                typer.echo(f"Error: {e}", err=True)
+                raise typer.Exit(code=2) from None
+        for message in regressions:
+            typer.echo(f"Regression: {message}", err=True)
+        if regressions:
+            raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
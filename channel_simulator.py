@@ -0,0 +1,217 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from greedy_syndrome_mapper import GreedySyndromeMapper
+from syndrome_decoder import SyndromeDecoder
+
+CHANNELS = ("bsc", "burst")
+Z_95 = 1.959963984540054 # Two-sided 95% normal quantile
+
+
+@dataclass(frozen=True)
+class Channel:
+    """
+    A memoryless channel applied word by word.
+
+    bsc: every bit flips independently with probability p.
+    burst: with probability p a word is hit by one burst: a window of 1..burst_length positions (uniform)
+    at a uniform start, with both end bits flipped and each bit in between flipped with probability 1/2,
+    i.e. one of the patterns of pattern_generators.burst_patterns.
+    """
+    kind: str = "bsc"
+    burst_length: int = 1
+
+    def __post_init__(self) -> None:
+        if self.kind not in CHANNELS:
+            raise ValueError(f"Unknown channel {self.kind!r}; expected one of {', '.join(CHANNELS)}.")
+        if self.burst_length < 1:
+            raise ValueError("burst_length must be positive.")
+
+    @classmethod
+    def parse(cls, spec: str) -> "Channel":
+        """
+        "bsc" or "burst:L".
+        """
+        kind, _, parameter = spec.partition(":")
+        if kind == "burst":
+            if not parameter.isdigit():
+                raise ValueError("A burst channel is written burst:L, with L the maximum burst length.")
+            return cls(kind, int(parameter))
+        if parameter:
+            raise ValueError(f"Channel {kind!r} takes no parameter.")
+        return cls(kind)
+
+    def errors(self, rng: np.random.Generator, words: int, n: int, p: float) -> np.ndarray:
+        """
+        Error patterns for a batch of words, as np.packbits rows (words, ceil(n / 8)).
+        """
+        if self.kind == "bsc":
+            return np.packbits(rng.random((words, n)) < p, axis=1)
+        length_cap = min(self.burst_length, n)
+        errors = np.zeros((words, n + length_cap), dtype=np.uint8) # Spare columns absorb the masked tails
+        hit = np.flatnonzero(rng.random(words) < p)
+        lengths = rng.integers(1, length_cap + 1, size=len(hit))
+        starts = rng.integers(0, n - lengths + 1)
+        offsets = np.arange(length_cap)
+        bits = (rng.random((len(hit), length_cap)) < 0.5) & (offsets < lengths[:, None])
+        bits[:, 0] = True
+        bits[np.arange(len(hit)), lengths - 1] = True
+        errors[hit[:, None], starts[:, None] + offsets] = bits
+        return np.packbits(errors[:, :n], axis=1)
+
+
+@dataclass
+class SimulationPoint:
+    """
+    Counts for one channel parameter. A block error is a word not decoded back to the sent codeword;
+    bit errors are the wrong codeword bits left after decoding.
+    """
+    p: float
+    words: int
+    block_errors: int
+    bit_errors: int
+    uncorrectable: int # Words whose syndrome had no correctable error pattern
+    n: int
+    seconds: float
+
+    @property
+    def bler(self) -> float:
+        return self.block_errors / self.words if self.words else float("nan")
+
+    @property
+    def ber(self) -> float:
+        return self.bit_errors / (self.words * self.n) if self.words else float("nan")
+
+    @property
+    def bler_interval(self) -> tuple[float, float]:
+        return wilson_interval(self.block_errors, self.words)
+
+
+def wilson_interval(successes: int, trials: int, z: float = Z_95) -> tuple[float, float]:
+    """
+    Wilson score interval for a binomial proportion.
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    phat = successes / trials
+    denominator = 1 + z * z / trials
+    center = (phat + z * z / (2 * trials)) / denominator
+    half = z * math.sqrt(phat * (1 - phat) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+_worker_state = {}
+
+
+def _init_simulation_worker(n: int, r: int, arrays: dict, channel: Channel) -> None:
+    _worker_state["decoder"] = SyndromeDecoder._from_arrays(n, r, arrays)
+    _worker_state["channel"] = channel
+
+
+def _simulate_batch(task: tuple[float, int, np.random.SeedSequence]) -> tuple[int, int, int]:
+    # The all-zero codeword is sent: the code is linear and syndrome decoding only sees the error
+    p, words, seed = task
+    decoder, channel = _worker_state["decoder"], _worker_state["channel"]
+    errors = channel.errors(np.random.default_rng(seed), words, decoder.n, p)
+    corrected, uncorrectable = decoder.decode_batch(errors, packed=True, return_uncorrectable=True)
+    residual = np.bitwise_count(corrected).sum(axis=1)
+    return int(np.count_nonzero(residual)), int(residual.sum()), int(np.count_nonzero(uncorrectable))
+
+
+def simulate(mapper: GreedySyndromeMapper, ps: list[float], channel: Channel | str = "bsc", seed: int = 0,
+             batch_words: int = 1 << 16, max_words: int = 1 << 24, min_block_errors: int = 100,
+             relative_precision: float = 0.1, workers: int | None = None) -> list[SimulationPoint]:
+    """
+    Monte Carlo block and bit error rates of the code over a channel, one SimulationPoint per p.
+
+    Words are simulated in batches of batch_words. Batch i of point j draws its errors from the
+    i-th child of SeedSequence([seed, j]), so every batch has an independent, reproducible stream and
+    the results do not depend on the number of workers. Batches run on a process pool that holds the
+    decoder tables, and are consumed in order; a point stops after the first batch at which it has at
+    least min_block_errors block errors and the 95% Wilson interval of the block error rate is within
+    relative_precision of the estimate, or once max_words words have been simulated.
+    """
+    if isinstance(channel, str):
+        channel = Channel.parse(channel)
+    if batch_words <= 0 or max_words <= 0:
+        raise ValueError("batch_words and max_words must be positive.")
+    decoder = SyndromeDecoder(mapper)
+    arrays = {name: getattr(decoder, name) for name in SyndromeDecoder._SHARED_ARRAYS if getattr(decoder, name) is not None}
+    initargs = (decoder.n, decoder.r, arrays, channel)
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_simulation_worker, initargs=initargs) if workers > 1 else None
+    if pool is None:
+        _init_simulation_worker(*initargs)
+    points = []
+    try:
+        for j, p in enumerate(ps):
+            start = time.perf_counter()
+            seeds = np.random.SeedSequence([seed, j])
+            total_batches = -(-max_words // batch_words)
+            words = block_errors = bit_errors = uncorrectable = 0
+            batch = 0
+            while batch < total_batches:
+                # One round keeps every worker busy; batches past the stopping point are discarded
+                round_size = min(total_batches - batch, workers)
+                tasks = [(p, min(batch_words, max_words - (batch + i) * batch_words), child)
+                         for i, child in enumerate(seeds.spawn(round_size))]
+                results = pool.map(_simulate_batch, tasks) if pool else map(_simulate_batch, tasks)
+                for (_, task_words, _), (errors, bits, failed) in zip(tasks, results):
+                    words += task_words
+                    block_errors += errors
+                    bit_errors += bits
+                    uncorrectable += failed
+                    batch += 1
+                    if _converged(block_errors, words, min_block_errors, relative_precision):
+                        batch = total_batches
+                        break
+            points.append(SimulationPoint(p, words, block_errors, bit_errors, uncorrectable, decoder.n,
+                                          time.perf_counter() - start))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return points
+
+
+def _converged(block_errors: int, words: int, min_block_errors: int, relative_precision: float) -> bool:
+    if block_errors < min_block_errors:
+        return False
+    low, high = wilson_interval(block_errors, words)
+    return (high - low) / 2 <= relative_precision * block_errors / words
+
+
+def parse_ps(spec: str) -> list[float]:
+    """
+    Channel parameters from "0.001,0.01,0.1" or, log-spaced, "START:STOP:COUNT".
+    """
+    if ":" in spec:
+        start, stop, count = spec.split(":")
+        return [float(p) for p in np.geomspace(float(start), float(stop), int(count))]
+    return [float(p) for p in spec.split(",") if p.strip()]
+
+
+def as_rows(points: list[SimulationPoint]) -> list[dict]:
+    """
+    One flat dict per point, for CSV or a DataFrame.
+    """
+    return [{"p": point.p, "words": point.words, "block_errors": point.block_errors, "bler": point.bler,
+             "bler_low": point.bler_interval[0], "bler_high": point.bler_interval[1], "bit_errors": point.bit_errors,
+             "ber": point.ber, "uncorrectable": point.uncorrectable, "seconds": point.seconds} for point in points]
+
+
+def format_points(points: list[SimulationPoint]) -> str:
+    """
+    The points as an aligned text table.
+    """
+    header = f"{'p':>10} {'words':>12} {'block err':>10} {'BLER':>11} {'BLER 95% CI':>25} {'BER':>11} {'uncorr.':>9} {'s':>7}"
+    lines = [header]
+    for point in points:
+        low, high = point.bler_interval
+        lines.append(f"{point.p:>10.4g} {point.words:>12} {point.block_errors:>10} {point.bler:>11.4e} "
+                     f"{f'[{low:.3e}, {high:.3e}]':>25} {point.ber:>11.4e} {point.uncorrectable:>9} {point.seconds:>7.2f}")
+    return "\n".join(lines)
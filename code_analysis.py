@@ -0,0 +1,370 @@
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from greedy_syndrome_mapper import GreedySyndromeMapper, packed_to_matrix
+from linear_code import ParityCheckMatrix, pack_words
+
+MAX_ENUMERATION_BITS = 36 # Largest code or dual dimension whose codewords are enumerated
+DISTRIBUTION_BITS = 24 # Up to this dimension, minimum_distance reads the weight distribution instead of searching
+MAX_SUBSETS = 1 << 26 # Upper bound on subset sums held by the meet-in-the-middle search
+_LOW_BITS = 16 # Codewords are enumerated in blocks of 2^_LOW_BITS
+_PAIR_CHUNK_ELEMENTS = 1 << 22 # Upper bound on pattern pairs per vectorized homomorphism pass
+
+
+def _as_parity_check(code) -> ParityCheckMatrix:
+    """
+    The parity check matrix of a GreedySyndromeMapper (the linear H used by the decoder),
+    a ParityCheckMatrix, or a dense 0/1 matrix.
+    """
+    if isinstance(code, GreedySyndromeMapper):
+        return code.get_parity_check()
+    if isinstance(code, ParityCheckMatrix):
+        return code
+    return ParityCheckMatrix.from_dense(code)
+
+
+def _pool_map(function, initializer, initargs, tasks, workers: int):
+    """
+    Run function over tasks in this process (workers == 1) or on a process pool whose workers
+    receive initargs once through initializer, yielding results in task order.
+    """
+    if workers == 1 or len(tasks) <= 1:
+        initializer(*initargs)
+        yield from map(function, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        yield from pool.map(function, tasks)
+
+
+_worker_state = {}
+
+
+def _init_analysis_worker(**state) -> None:
+    _worker_state.clear()
+    _worker_state.update(state)
+
+
+def _init_pairs_worker(vectors: np.ndarray, syndromes: np.ndarray) -> None:
+    _init_analysis_worker(vectors=vectors, syndromes=syndromes)
+
+
+def _homomorphism_violations_slice(bounds: tuple[int, int]) -> tuple[int, list[tuple[int, int]]]:
+    # Pairs (u, v) with u in vectors[start:stop] and v > u such that u ^ v is in T but S(u ^ v) != S(u) ^ S(v)
+    vectors, syndromes = _worker_state["vectors"], _worker_state["syndromes"]
+    start, stop = bounds
+    count = 0
+    examples = []
+    chunk = max(1, _PAIR_CHUNK_ELEMENTS // max(1, len(vectors)))
+    for first in range(start, stop, chunk):
+        u = vectors[first:min(first + chunk, stop), None]
+        su = syndromes[first:min(first + chunk, stop), None]
+        combined = u ^ vectors[None, :]
+        positions = np.minimum(np.searchsorted(vectors, combined), len(vectors) - 1)
+        present = (vectors[positions] == combined) & (vectors[None, :] > u)
+        bad = present & (syndromes[positions] != (su ^ syndromes[None, :]))
+        rows, columns = np.nonzero(bad)
+        count += len(rows)
+        examples.extend((int(u[i, 0]), int(vectors[j])) for i, j in zip(rows[:10], columns[:10]))
+    return count, examples
+
+
+def _packed_map(mapper: GreedySyndromeMapper) -> tuple[list[int], list[int]]:
+    vectors = sorted(mapper.packed_syndrome_map)
+    return vectors, [mapper.packed_syndrome_map[v] for v in vectors]
+
+
+def find_collisions(mapper: GreedySyndromeMapper, limit: int = 10) -> tuple[int, list[tuple[int, int]]]:
+    """
+    Check that the syndrome map is injective on T. Return the number of error patterns whose syndrome
+    is already used by a smaller pattern, and up to limit such (smaller, larger) packed pattern pairs.
+    """
+    vectors, syndromes = _packed_map(mapper)
+    if mapper.redundancy <= 64:
+        syndrome_array = np.asarray(syndromes, dtype=np.uint64)
+        order = np.argsort(syndrome_array, kind="stable")
+        repeated = np.flatnonzero(syndrome_array[order][1:] == syndrome_array[order][:-1]) + 1
+        pairs = [(vectors[order[i - 1]], vectors[order[i]]) for i in repeated[:limit]]
+        return len(repeated), pairs
+    seen = {}
+    pairs = []
+    count = 0
+    for vector, syndrome in zip(vectors, syndromes):
+        if syndrome in seen:
+            count += 1
+            if len(pairs) < limit:
+                pairs.append((seen[syndrome], vector))
+        else:
+            seen[syndrome] = vector
+    return count, pairs
+
+
+def find_linearity_violations(mapper: GreedySyndromeMapper, limit: int = 10) -> tuple[int, list[int]]:
+    """
+    Check that every syndrome in the map equals H·v for the parity check matrix the decoder uses
+    (get_parity_check). Return the number of mismatching patterns and up to limit of them.
+    """
+    vectors, syndromes = _packed_map(mapper)
+    H = mapper.get_parity_check()
+    bits = H.syndrome_bits(packed_to_matrix(vectors, mapper.n))
+    expected = np.packbits(bits, axis=1, bitorder="big")
+    width = len(H.rows)
+    computed = [int.from_bytes(row.tobytes(), "big") >> (8 * expected.shape[1] - width) for row in expected]
+    mismatches = [v for v, s, c in zip(vectors, syndromes, computed) if s != c]
+    return len(mismatches), mismatches[:limit]
+
+
+def find_homomorphism_violations(mapper: GreedySyndromeMapper, workers: int | None = None,
+                                 limit: int = 10) -> tuple[int, list[tuple[int, int]]]:
+    """
+    Check the partial homomorphism property S(u ^ v) = S(u) ^ S(v) for every pair u < v of T with
+    u ^ v in T. Return the number of violating pairs and up to limit of them as packed (u, v).
+
+    When every syndrome equals H·v (find_linearity_violations), the property follows at once:
+    S(u ^ v) = H·u ^ H·v = S(u) ^ S(v). Otherwise all pairs are checked; for n and r of at most 64 bits,
+    each pass XORs a block of patterns against all of T and looks the results up in the sorted
+    pattern array, and blocks are split across worker processes.
+    """
+    if not find_linearity_violations(mapper, limit=0)[0]:
+        return 0, []
+    vectors, syndromes = _packed_map(mapper)
+    if mapper.n > 64 or mapper.redundancy > 64:
+        lookup = dict(zip(vectors, syndromes))
+        count = 0
+        examples = []
+        for u, v in itertools.product(vectors, vectors):
+            if v > u and (u ^ v) in lookup and lookup[u ^ v] != lookup[u] ^ lookup[v]:
+                count += 1
+                if len(examples) < limit:
+                    examples.append((u, v))
+        return count, examples
+    vector_array = np.asarray(vectors, dtype=np.uint64)
+    syndrome_array = np.asarray(syndromes, dtype=np.uint64)
+    workers = workers or os.cpu_count() or 1
+    # Small slices keep the load even: later rows have fewer partners v > u
+    step = max(1, len(vectors) // (8 * workers))
+    tasks = [(start, min(start + step, len(vectors))) for start in range(0, len(vectors), step)]
+    count = 0
+    examples = []
+    for slice_count, slice_examples in _pool_map(_homomorphism_violations_slice, _init_pairs_worker,
+                                                 (vector_array, syndrome_array), tasks, workers):
+        count += slice_count
+        examples.extend(slice_examples[:limit - len(examples)])
+    return count, examples
+
+
+def _basis_words(rows: np.ndarray) -> np.ndarray:
+    """
+    XOR of every subset of rows, indexed by the subset mask (bit t selects rows[t]), as packed words.
+    """
+    table = np.zeros((1 << len(rows), rows.shape[1]), dtype=np.uint64)
+    for t, row in enumerate(rows):
+        table[1 << t:2 << t] = table[:1 << t] ^ row
+    return table
+
+
+def _init_enumeration_worker(rows: np.ndarray, n: int) -> None:
+    low = min(_LOW_BITS, len(rows))
+    _init_analysis_worker(low_table=_basis_words(rows[:low]), high_rows=rows[low:], n=n)
+
+
+def _weight_counts_slice(bounds: tuple[int, int]) -> np.ndarray:
+    # Codewords whose high part is a Gray code index in [start, stop), each combined with all low parts
+    low_table, high_rows, n = _worker_state["low_table"], _worker_state["high_rows"], _worker_state["n"]
+    start, stop = bounds
+    counts = np.zeros(n + 1, dtype=np.int64)
+    gray = start ^ (start >> 1)
+    high = np.zeros(low_table.shape[1], dtype=np.uint64)
+    for t in range(len(high_rows)):
+        if (gray >> t) & 1:
+            high ^= high_rows[t]
+    for index in range(start, stop):
+        if index > start:
+            # Gray code order: consecutive high parts differ in exactly one row
+            high ^= high_rows[(index & -index).bit_length() - 1]
+        weights = np.bitwise_count(low_table ^ high).sum(axis=1, dtype=np.int64)
+        counts += np.bincount(weights, minlength=n + 1)
+    return counts
+
+
+def _enumerate_weights(rows: np.ndarray, n: int, workers: int | None) -> list[int]:
+    """
+    Weight distribution of the row space of linearly independent packed rows.
+    """
+    dimension = len(rows)
+    if dimension > MAX_ENUMERATION_BITS:
+        raise ValueError(f"Enumerating 2^{dimension} codewords is infeasible; the limit is 2^{MAX_ENUMERATION_BITS}.")
+    high_count = 1 << max(0, dimension - _LOW_BITS)
+    workers = min(workers or os.cpu_count() or 1, high_count)
+    step = max(1, high_count // (4 * workers))
+    tasks = [(start, min(start + step, high_count)) for start in range(0, high_count, step)]
+    counts = np.zeros(n + 1, dtype=np.int64)
+    for slice_counts in _pool_map(_weight_counts_slice, _init_enumeration_worker, (rows, n), tasks, workers):
+        counts += slice_counts
+    return [int(c) for c in counts]
+
+
+def _macwilliams(dual_distribution: list[int], n: int, dual_dimension: int) -> list[int]:
+    """
+    Weight distribution of a code from that of its dual (MacWilliams identity):
+    sum_i A_i z^i = 2^-dual_dimension * sum_j B_j (1 + z)^(n - j) (1 - z)^j, in exact integers.
+    """
+    total = [0] * (n + 1)
+    # P_j = (1 + z)^(n - j) (1 - z)^j, from P_n = (1 - z)^n and P_(j-1) = P_j (1 + z) / (1 - z)
+    poly = [(-1) ** i * c for i, c in enumerate(_binomials(n))]
+    for j in range(n, -1, -1):
+        if dual_distribution[j]:
+            total = [t + dual_distribution[j] * p for t, p in zip(total, poly)]
+        if j:
+            times = [poly[i] + (poly[i - 1] if i else 0) for i in range(n + 1)] # (1 + z) P_j, degree stays n
+            quotient = [0] * (n + 1)
+            for i in range(n + 1): # Exact division by (1 - z): q_i = c_i + q_(i-1)
+                quotient[i] = times[i] + (quotient[i - 1] if i else 0)
+            poly = quotient
+    return [t >> dual_dimension for t in total]
+
+
+def _binomials(n: int) -> list[int]:
+    row = [1]
+    for k in range(n):
+        row.append(row[-1] * (n - k) // (k + 1))
+    return row
+
+
+def weight_distribution(code, workers: int | None = None) -> list[int]:
+    """
+    A[w] = number of codewords of weight w in {x : H·x = 0}, for w = 0..n.
+
+    The smaller of the code (dimension k) and its dual (the row space of H, dimension rank) is
+    enumerated: its generator rows are split into a low half, whose 2^16 combinations form one
+    table, and a high half walked in Gray code order, so each step is a single row XOR followed by
+    a vectorized popcount over the table. Slices of the walk run on worker processes. The dual's
+    distribution is turned into the code's with the MacWilliams identity.
+    """
+    H = _as_parity_check(code)
+    reduced, pivots = H._reduce()
+    k = H.n - len(pivots)
+    if k <= len(pivots):
+        return _enumerate_weights(pack_words(H.generator_matrix()), H.n, workers)
+    return _macwilliams(_enumerate_weights(reduced, H.n, workers), H.n, len(pivots))
+
+
+def _subset_sums(columns: np.ndarray, size: int) -> np.ndarray:
+    """
+    XOR of every size-subset of the packed columns. Subsets are extended in increasing column
+    order (tracking the last column used), so each one appears exactly once.
+    """
+    sums = np.zeros(1, dtype=np.uint64)
+    last = np.full(1, -1, dtype=np.intp)
+    for _ in range(size):
+        next_sums, next_last = [], []
+        for j, column in enumerate(columns):
+            keep = last < j
+            next_sums.append(sums[keep] ^ column)
+            next_last.append(np.full(int(np.count_nonzero(keep)), j, dtype=np.intp))
+        sums, last = np.concatenate(next_sums), np.concatenate(next_last)
+    return sums
+
+
+def minimum_distance(code, max_weight: int | None = None, workers: int | None = None,
+                     max_subsets: int = MAX_SUBSETS) -> int | None:
+    """
+    Minimum weight of a nonzero codeword of {x : H·x = 0}, or None if there is none of weight
+    <= max_weight (always the case for k = 0).
+
+    When the code or its dual is small enough, this reads the weight distribution. Otherwise a
+    meet-in-the-middle search over the packed columns (r <= 64) tries w = 1, 2, ...: a codeword of
+    weight w is a ceil(w/2)-subset and a disjoint floor(w/2)-subset of columns with equal XOR, so it
+    suffices to intersect the two sets of subset sums; since no lighter codeword exists at that point,
+    any equal pair of distinct subsets is such a codeword.
+    """
+    H = _as_parity_check(code)
+    rank = H.rank()
+    k = H.n - rank
+    max_weight = H.n if max_weight is None else min(max_weight, H.n)
+    if k == 0:
+        return None
+    if min(k, rank) <= DISTRIBUTION_BITS:
+        distribution = weight_distribution(H, workers)
+        return next((w for w in range(1, max_weight + 1) if distribution[w]), None)
+    if len(H.rows) > 64:
+        raise ValueError("The meet-in-the-middle search needs r <= 64 rows.")
+    columns = H.syndromes(np.eye(H.n, dtype=np.uint8))
+    for w in range(1, max_weight + 1):
+        a, b = (w + 1) // 2, w // 2
+        if math.comb(H.n, a) > max_subsets:
+            raise ValueError(f"Weight {w} needs {math.comb(H.n, a)} subset sums, more than max_subsets={max_subsets}.")
+        left = np.sort(_subset_sums(columns, a))
+        if a == b:
+            found = bool((left[1:] == left[:-1]).any())
+        else:
+            right = _subset_sums(columns, b)
+            positions = np.minimum(np.searchsorted(left, right), len(left) - 1)
+            found = bool((left[positions] == right).any())
+        if found:
+            return w
+    return None
+
+
+@dataclass
+class CodeReport:
+    """
+    Result of verify_code. Example lists hold packed patterns (leftmost position = most significant bit).
+    """
+    n: int
+    rows: int # Rows of the parity check matrix used by the decoder
+    rank: int
+    k: int
+    collisions: int
+    homomorphism_violations: int
+    linearity_violations: int
+    minimum_distance: int | None = None
+    weight_distribution: list[int] | None = None
+    examples: dict[str, list] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.collisions or self.homomorphism_violations or self.linearity_violations)
+
+    def format(self) -> str:
+        lines = [f"n = {self.n}, r = {self.rows} (rank {self.rank}), k = {self.k}",
+                 f"Injective on T: {'yes' if not self.collisions else f'no, {self.collisions} collisions'}",
+                 f"Partial homomorphism: {'yes' if not self.homomorphism_violations else f'no, {self.homomorphism_violations} violating pairs'}",
+                 f"Syndromes match H·v: {'yes' if not self.linearity_violations else f'no, {self.linearity_violations} patterns differ'}"]
+        if self.minimum_distance is not None or self.weight_distribution is not None:
+            lines.append(f"Minimum distance: {self.minimum_distance if self.minimum_distance is not None else 'none (k = 0)'}")
+        if self.weight_distribution is not None:
+            nonzero = ", ".join(f"A{w}={count}" for w, count in enumerate(self.weight_distribution) if count)
+            lines.append(f"Weight distribution: {nonzero}")
+        for name, examples in self.examples.items():
+            if examples:
+                lines.append(f"First {name}: {examples}")
+        return "\n".join(lines)
+
+
+def verify_code(mapper: GreedySyndromeMapper, workers: int | None = None, distance: bool = True,
+                max_weight: int | None = None) -> CodeReport:
+    """
+    Check that the mapper's syndrome map corrects every pattern in T (injective, partial homomorphism,
+    consistent with the decoder's H) and, with distance, compute the minimum distance, plus the weight
+    distribution when the code or its dual is small enough to enumerate.
+    """
+    collisions, collision_examples = find_collisions(mapper)
+    mismatches, mismatch_examples = find_linearity_violations(mapper)
+    violations, violation_examples = find_homomorphism_violations(mapper, workers) if mismatches else (0, [])
+    H = mapper.get_parity_check()
+    rank = H.rank()
+    report = CodeReport(mapper.n, len(H.rows), rank, mapper.n - rank, collisions, violations, mismatches,
+                        examples={"collisions": collision_examples, "homomorphism violations": violation_examples,
+                                  "H·v mismatches": mismatch_examples})
+    if distance:
+        if min(report.k, rank) <= DISTRIBUTION_BITS:
+            report.weight_distribution = weight_distribution(H, workers)
+            report.minimum_distance = next((w for w in range(1, mapper.n + 1) if report.weight_distribution[w]), None)
+        else:
+            report.minimum_distance = minimum_distance(H, max_weight, workers)
+    return report
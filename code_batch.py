@@ -0,0 +1,180 @@
+import ast
+import os
+import time
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from math import comb
+
+from greedy_syndrome_mapper import GreedySyndromeMapper, _check_packed, pack_patterns
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of one job of construct_many. On failure, error holds the message and the map is None.
+    error_patterns is the job's packed pattern set, which the code is rebuilt from.
+    """
+    name: str
+    n: int | None
+    patterns: int
+    redundancy: int | None
+    packed_syndrome_map: dict[int, int] | None
+    seconds: float
+    error: str | None = None
+    error_patterns: frozenset[int] | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def mapper(self) -> GreedySyndromeMapper:
+        """
+        Rebuild the constructed code (without rerunning the construction).
+        """
+        if self.error is not None:
+            raise RuntimeError(f"{self.name}: {self.error}")
+        return GreedySyndromeMapper.from_syndrome_map(self.error_patterns, self.n, self.packed_syndrome_map)
+
+
+def _family_n(spec: str) -> int:
+    return int(spec.split(":")[1])
+
+
+def estimated_size(patterns) -> int:
+    """
+    Number of error patterns of a job (an upper bound for burst families), used to schedule the largest jobs first.
+    """
+    if not isinstance(patterns, str):
+        return len(patterns)
+    try:
+        name, n, parameter = patterns.split(":")
+        n, parameter = int(n), int(parameter)
+    except ValueError:
+        return 0 # Invalid specs fail quickly in the worker
+    if name == "weight":
+        return sum(comb(n, w) for w in range(1, min(parameter, n) + 1))
+    if name in ("burst", "cyclic-burst"):
+        # A burst of length l has free interior bits: 2^(l-2) patterns per window
+        return sum((1 << max(0, length - 2)) * n for length in range(1, min(parameter, n) + 1))
+    return 0
+
+
+@lru_cache(maxsize=8)
+def _family(spec: str) -> tuple[frozenset[int], int]:
+    # Jobs that share a family spec (e.g. several max_redundancy values) generate its patterns once per worker
+    from pattern_generators import family_patterns
+    return frozenset(family_patterns(spec, packed=True)), _family_n(spec)
+
+
+def _run_job(name: str, patterns, n: int | None, max_redundancy: int | None, cache: bool) -> BatchResult:
+    start = time.perf_counter()
+    count = 0
+    try:
+        if isinstance(patterns, str):
+            unique_patterns, n = _family(patterns)
+        elif n is None:
+            unique_patterns, n = pack_patterns(patterns)
+        else:
+            unique_patterns = _check_packed(patterns, n)
+        count = len(unique_patterns)
+        if cache:
+            from code_cache import CodeCache
+            mapper = CodeCache().get_or_build_packed(unique_patterns, n, max_redundancy)
+        else:
+            mapper = GreedySyndromeMapper.from_packed(unique_patterns, n, max_redundancy=max_redundancy)
+    except (ValueError, TypeError, RuntimeError) as e:
+        # One malformed set must not abort the whole batch
+        return BatchResult(name, n, count, None, None, time.perf_counter() - start, str(e))
+    return BatchResult(name, n, count, mapper.redundancy, mapper.packed_syndrome_map, time.perf_counter() - start,
+                       error_patterns=frozenset(unique_patterns))
+
+
+def construct_many(pattern_sets: Mapping[str, object] | Iterable, workers: int | None = None, n: int | None = None,
+                   max_redundancy: int | None = None, cache: bool = False) -> Iterator[BatchResult]:
+    """
+    Construct a code for every pattern set and yield a BatchResult for each as soon as it finishes.
+
+    pattern_sets maps job names to patterns (or is a sequence, named by index). A set is a list of
+    0/1 vectors, an (N, n) matrix, packed ints (with n given), or a family spec such as "weight:32:2",
+    which workers generate themselves instead of receiving the patterns. Jobs run on a process pool
+    (in this process when workers is 1), largest first so that one big job does not start last and
+    hold up the end of the batch. A job that fails yields a result with its error and the others go on.
+    """
+    if not isinstance(pattern_sets, Mapping):
+        pattern_sets = {str(i): patterns for i, patterns in enumerate(pattern_sets)}
+    jobs = sorted(pattern_sets.items(), key=lambda item: -estimated_size(item[1]))
+    workers = min(workers or os.cpu_count() or 1, max(1, len(jobs)))
+    if workers == 1:
+        for name, patterns in jobs:
+            yield _run_job(name, patterns, n, max_redundancy, cache)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Submitted in size order, so the pool starts the largest jobs first
+        futures = [pool.submit(_run_job, name, patterns, n, max_redundancy, cache) for name, patterns in jobs]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def read_pattern_sets(path: str) -> dict[str, object]:
+    """
+    Read pattern sets from a directory or a multi-set file.
+
+    A directory holds one set per file: .npy files with an (N, n) 0/1 matrix, or text files with one
+    pattern per line (like --file). The set is named after the file. In a multi-set text file, sets
+    are separated by blank lines; a line "# name" names the set that follows (default: its index),
+    and a set may be a single family spec line such as "weight:32:2" instead of patterns.
+    """
+    if os.path.isdir(path):
+        sets = {}
+        for entry in sorted(os.listdir(path)):
+            file_path = os.path.join(path, entry)
+            if not os.path.isfile(file_path):
+                continue
+            name, extension = os.path.splitext(entry)
+            if extension == ".npy":
+                import numpy as np
+                sets[name] = np.load(file_path)
+            else:
+                parsed = _parse_sets(file_path)
+                if len(parsed) != 1:
+                    raise ValueError(f"{file_path} holds {len(parsed)} pattern sets; use one file per set in a directory.")
+                (sets[name],) = parsed.values()
+        return sets
+    return _parse_sets(path)
+
+
+def _parse_sets(path: str) -> dict[str, object]:
+    sets = {}
+    name = None
+    current = []
+
+    def finish():
+        nonlocal name, current
+        if current:
+            key = name if name is not None else str(len(sets))
+            if key in sets:
+                raise ValueError(f"{path}: duplicate set name {key!r}.")
+            is_family = len(current) == 1 and not current[0].startswith(("[", "("))
+            sets[key] = current[0] if is_family else [ast.literal_eval(line) for line in current]
+        name, current = None, []
+
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                finish()
+            elif line.startswith("#"):
+                finish()
+                name = line[1:].strip() or None
+            else:
+                current.append(line)
+    finish()
+    if not sets:
+        raise ValueError(f"{path} holds no pattern sets.")
+    return sets
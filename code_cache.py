@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import zipfile
+import zlib
+from typing import TYPE_CHECKING
+
+from greedy_syndrome_mapper import ALGORITHM_VERSION, GreedySyndromeMapper, pack_patterns
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "loop-transversal-code")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _ints_to_rows(values, n_bytes: int) -> np.ndarray:
+    """
+    Pack ints into an (m, n_bytes) uint8 array, one big-endian row per int.
+    """
+    import numpy as np
+
+    values = list(values)
+    data = b"".join(v.to_bytes(n_bytes, "big") for v in values)
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(values), n_bytes)
+
+
+def _rows_to_ints(rows: np.ndarray) -> list[int]:
+    return [int.from_bytes(row.tobytes(), "big") for row in rows]
+
+
+class CodeCache:
+    """
+    Content-addressed on-disk cache of constructed codes.
+
+    Entries are keyed by a hash of the sorted, deduplicated packed pattern set and ALGORITHM_VERSION,
+    and stored as .npz files holding the syndrome map, the basis map and the parity check matrix.
+    Reading an entry refreshes its modification time; when the directory grows past max_bytes,
+    the least recently used entries are deleted.
+    """
+    def __init__(self, directory: str | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory or os.environ.get("LTC_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(unique_patterns: set[int], n: int) -> str:
+        n_bytes = (n + 7) // 8
+        digest = hashlib.sha256(f"ltc-v{ALGORITHM_VERSION}:{n}:".encode())
+        for v in sorted(unique_patterns):
+            digest.update(v.to_bytes(n_bytes, "big"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get_or_build(self, error_patterns: list[tuple[int]] | list[list[int]],
+                     max_redundancy: int | None = None) -> GreedySyndromeMapper:
+        """
+        Return the mapper for error_patterns, reading it from the cache or constructing and storing it.
+        With max_redundancy, raise the same RuntimeError as GreedySyndromeMapper if the code needs more check bits.
+        """
+        unique_patterns, n = pack_patterns(error_patterns)
+        return self.get_or_build_packed(unique_patterns, n, max_redundancy)
+
+    def get_or_build_packed(self, error_patterns, n: int, max_redundancy: int | None = None) -> GreedySyndromeMapper:
+        unique_patterns = {int(v) for v in error_patterns}
+        key = self.key(unique_patterns, n)
+        mapper = self.load(key, unique_patterns, n)
+        if mapper is None:
+            mapper = GreedySyndromeMapper.from_packed(unique_patterns, n, max_redundancy=max_redundancy)
+            self.store(key, mapper)
+        elif max_redundancy is not None:
+            # A limited construction yields the same code or fails, so check the cached one against the limit
+            mapper.check_redundancy(max_redundancy)
+        return mapper
+
+    def load(self, key: str, unique_patterns: set[int], n: int) -> GreedySyndromeMapper | None:
+        import numpy as np # Entries are .npz files; NumPy is only loaded once the cache is used
+
+        path = self._path(key)
+        try:
+            with np.load(path) as entry:
+                vectors = _rows_to_ints(entry["vectors"])
+                syndromes = _rows_to_ints(entry["syndromes"])
+            os.utime(path) # Mark as recently used
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile, zlib.error):
+            # A truncated or damaged entry is a miss; drop it so that the rebuilt code replaces it
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            return None
+        return GreedySyndromeMapper.from_syndrome_map(unique_patterns, n, dict(zip(vectors, syndromes)))
+
+    def store(self, key: str, mapper: GreedySyndromeMapper) -> None:
+        import numpy as np
+
+        os.makedirs(self.directory, exist_ok=True)
+        n_bytes = (mapper.n + 7) // 8
+        packed_map = mapper.packed_syndrome_map
+        basis_map = mapper.get_basis_map_list()
+        # Write to a temporary file first so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(
+                    f,
+                    n=np.array(mapper.n),
+                    vectors=_ints_to_rows(packed_map.keys(), n_bytes),
+                    syndromes=_ints_to_rows(packed_map.values(), n_bytes),
+                    basis_vectors=np.array([b for b, _ in basis_map], dtype=np.uint8).reshape(len(basis_map), mapper.n),
+                    basis_syndromes=np.array([s for _, s in basis_map], dtype=np.uint8).reshape(len(basis_map), mapper.n),
+                    parity_check_matrix=mapper.get_parity_check_matrix().astype(np.uint8),
+                )
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Delete least recently used entries until the cache fits in max_bytes.
+        """
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".npz"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue # Deleted by another process sharing the cache
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".npz"):
+                    os.unlink(os.path.join(self.directory, name))
@@ -0,0 +1,215 @@
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from greedy_syndrome_mapper import GreedySyndromeMapper, pack_patterns
+
+BASIS_CHOICES = ("first", "last", "random")
+CANDIDATE_ORDERS = ("ascending", "descending", "random")
+RANDOM_CANDIDATES = 8 # "random" candidate order picks among this many smallest fitting syndromes
+
+
+@dataclass(frozen=True)
+class SearchVariant:
+    """
+    One way of running the greedy construction.
+
+    basis: which vector of each highest-dimension group becomes its basis ("first" is the default).
+    candidates: "ascending" takes the smallest fitting syndrome (the default), "descending" the largest
+    one within the current syndrome width, and "random" one of the RANDOM_CANDIDATES smallest.
+    permutation: column order applied to T before the construction; position j takes position permutation[j].
+    """
+    basis: str = "first"
+    candidates: str = "ascending"
+    permutation: tuple[int, ...] | None = None
+    seed: int = 0
+
+    def describe(self) -> str:
+        parts = [f"basis={self.basis}", f"candidates={self.candidates}"]
+        if self.permutation is not None:
+            parts.append(f"permutation={list(self.permutation)}")
+        if "random" in (self.basis, self.candidates):
+            parts.append(f"seed={self.seed}")
+        return ", ".join(parts)
+
+
+@dataclass
+class SearchResult:
+    mapper: GreedySyndromeMapper
+    variant: SearchVariant
+    redundancy: int
+    default_redundancy: int | None # Redundancy of the default construction, if it finished
+    tried: int
+    failed: int
+    seconds: float
+
+
+def generate_variants(n: int, count: int, seed: int = 0) -> list[SearchVariant]:
+    """
+    The default construction first, then the deterministic alternatives, then random combinations.
+    """
+    rng = random.Random(seed)
+    variants = [SearchVariant(basis, order) for basis in ("first", "last") for order in ("ascending", "descending")]
+    variants.append(SearchVariant(permutation=tuple(reversed(range(n)))))
+    while len(variants) < count:
+        permutation = tuple(rng.sample(range(n), n)) if rng.random() < 0.5 else None
+        variants.append(SearchVariant(rng.choice(BASIS_CHOICES), rng.choice(CANDIDATE_ORDERS), permutation,
+                                      rng.getrandbits(32)))
+    return variants[:count]
+
+
+def _permute(vector: int, permutation: tuple[int, ...], n: int) -> int:
+    permuted = 0
+    for position in permutation:
+        permuted = (permuted << 1) | ((vector >> (n - 1 - position)) & 1)
+    return permuted
+
+
+class _VariantMapper(GreedySyndromeMapper):
+    """
+    GreedySyndromeMapper with the basis and syndrome choices of a SearchVariant.
+    Stops with TimeoutError at the first dimension that starts after the deadline (a time.time() value).
+    """
+    _native_construction = False
+
+    def __init__(self, unique_patterns: set[int], n: int, variant: SearchVariant, deadline: float | None = None) -> None:
+        self.variant = variant
+        self._rng = random.Random(variant.seed)
+        self._deadline = deadline
+        self._init_state(unique_patterns, n)
+        self._construct_map()
+
+    def _choose_basis(self, group: list[int]) -> int:
+        if self.variant.basis == "last":
+            return group[-1]
+        if self.variant.basis == "random":
+            return self._rng.choice(group)
+        return group[0]
+
+    def _select_syndrome(self, residual_syndromes: list[int]) -> int | None:
+        if self._deadline is not None and time.time() >= self._deadline:
+            raise TimeoutError
+        if self.variant.candidates == "ascending":
+            return super()._select_syndrome(residual_syndromes)
+        pool = self.available_syndromes
+        while True:
+            if self.variant.candidates == "descending":
+                candidates = range(pool.size - 1, 0, -1)
+                limit = 1
+            else:
+                candidates = pool
+                limit = RANDOM_CANDIDATES
+            fits = []
+            for candidate in candidates:
+                if candidate in pool and all((candidate ^ r) in pool for r in residual_syndromes):
+                    fits.append(candidate)
+                    if len(fits) == limit:
+                        break
+            if fits:
+                return self._rng.choice(fits)
+            if pool.width >= pool.max_width:
+                return None
+            pool.grow(pool.width + 1)
+
+
+def run_variant(unique_patterns: set[int], n: int, variant: SearchVariant,
+                deadline: float | None = None) -> tuple[int, dict[int, int]] | None:
+    """
+    Construct the code for one variant. Return its redundancy and packed syndrome map (in the
+    original column order), or None if the construction fails; raise TimeoutError past the deadline.
+    """
+    if deadline is not None and time.time() >= deadline:
+        raise TimeoutError
+    permutation = variant.permutation
+    patterns = unique_patterns if permutation is None else {_permute(v, permutation, n) for v in unique_patterns}
+    try:
+        mapper = _VariantMapper(patterns, n, variant, deadline)
+    except RuntimeError:
+        return None
+    syndromes = mapper.packed_syndrome_map
+    if permutation is not None:
+        syndromes = {v: syndromes[_permute(v, permutation, n)] for v in unique_patterns if v}
+    return mapper.redundancy, syndromes
+
+
+_worker_state = {}
+
+def _init_search_worker(unique_patterns: set[int], n: int, deadline: float | None) -> None:
+    _worker_state.update(unique_patterns=unique_patterns, n=n, deadline=deadline)
+
+def _run_variant_in_worker(variant: SearchVariant):
+    return run_variant(_worker_state["unique_patterns"], _worker_state["n"], variant, _worker_state["deadline"])
+
+
+def search_codes(error_patterns, variants: int | list[SearchVariant] = 64, workers: int | None = None,
+                 time_budget: float | None = None, seed: int = 0) -> SearchResult:
+    """
+    Run many variants of the greedy construction and return the code with the fewest check bits.
+    """
+    unique_patterns, n = pack_patterns(error_patterns)
+    return search_codes_packed(unique_patterns, n, variants, workers, time_budget, seed)
+
+
+def search_codes_packed(error_patterns, n: int, variants: int | list[SearchVariant] = 64, workers: int | None = None,
+                        time_budget: float | None = None, seed: int = 0) -> SearchResult:
+    """
+    search_codes for packed int error patterns.
+
+    Variants run on a process pool (in this process when workers is 1). Once time_budget seconds
+    have passed, running variants stop at their next dimension and the rest are skipped. Ties go
+    to the earlier variant, so without a time budget the result does not depend on scheduling,
+    and the default construction (always the first generated variant) is never beaten by an equal code.
+    """
+    unique_patterns = {int(v) for v in error_patterns}
+    if isinstance(variants, int):
+        variants = generate_variants(n, variants, seed)
+    start = time.perf_counter()
+    deadline = None if time_budget is None else time.time() + time_budget
+    workers = min(workers or os.cpu_count() or 1, max(1, len(variants)))
+    best = None # (redundancy, index, syndromes)
+    default_redundancy = None
+    tried = failed = 0
+
+    def outcomes():
+        if workers == 1:
+            for index, variant in enumerate(variants):
+                try:
+                    yield index, run_variant(unique_patterns, n, variant, deadline)
+                except TimeoutError:
+                    return
+            return
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_search_worker,
+                                 initargs=(unique_patterns, n, deadline)) as pool:
+            futures = {pool.submit(_run_variant_in_worker, variant): index for index, variant in enumerate(variants)}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except TimeoutError:
+                    pass
+
+    for index, outcome in outcomes():
+        tried += 1
+        if outcome is None:
+            failed += 1
+            continue
+        redundancy, syndromes = outcome
+        if variants[index] == SearchVariant():
+            default_redundancy = redundancy
+        if best is None or (redundancy, index) < best[:2]:
+            best = (redundancy, index, syndromes)
+
+    if best is None:
+        reason = "within the time budget" if deadline is not None and time.time() >= deadline else "for these error patterns"
+        raise RuntimeError(f"None of the {tried} finished variants produced a code {reason}.")
+    redundancy, index, syndromes = best
+    return SearchResult(
+        mapper=GreedySyndromeMapper.from_syndrome_map(unique_patterns, n, syndromes),
+        variant=variants[index],
+        redundancy=redundancy,
+        default_redundancy=default_redundancy,
+        tried=tried,
+        failed=failed,
+        seconds=time.perf_counter() - start,
+    )
@@ -0,0 +1,272 @@
+import asyncio
+import base64
+import json
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+
+import numpy as np
+
+from code_cache import CodeCache
+from greedy_syndrome_mapper import GreedySyndromeMapper, _check_packed, pack_patterns
+from pattern_generators import family_patterns
+from syndrome_decoder import SyndromeDecoder
+
+DEFAULT_HOST = "127.0.0.1" # Also the defaults of `main.py serve`
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+def _construct_syndrome_map(patterns: list[int], n: int, disk_cache: bool) -> dict[int, int]:
+    # Runs on the executor; only the packed map crosses the process boundary
+    if disk_cache:
+        return CodeCache().get_or_build_packed(patterns, n).packed_syndrome_map
+    return GreedySyndromeMapper.from_packed(patterns, n).packed_syndrome_map
+
+
+class RequestError(Exception):
+    """
+    A request the service rejects, with the HTTP status to answer with.
+    """
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class _Code:
+    key: str
+    mapper: GreedySyndromeMapper
+    decoder: SyndromeDecoder | None = field(default=None, repr=False)
+
+    def get_decoder(self) -> SyndromeDecoder:
+        if self.decoder is None:
+            self.decoder = SyndromeDecoder(self.mapper)
+        return self.decoder
+
+
+class CodeService:
+    """
+    Asyncio HTTP/JSON service for code construction and decoding.
+
+    Constructions run on an executor (a process pool by default). Built codes are kept in an
+    in-memory LRU of max_codes entries, keyed like CodeCache, and concurrent requests for a code
+    that is still being built wait for that one construction instead of starting their own.
+
+    Every endpoint takes a JSON object naming the code by "error_patterns" (a list of 0/1 lists),
+    "family" (e.g. "weight:32:2") or the "key" returned by an earlier request:
+      POST /construct            -> key, n, redundancy and the full syndrome map
+      POST /basis-map            -> key and the basis map
+      POST /parity-check-matrix  -> key and the parity check matrix
+      POST /decode-batch         -> corrected words and uncorrectable flags for "words" (0/1 lists)
+                                    or "packed_words" (base64 of np.packbits rows)
+      GET  /health               -> status and counters
+    """
+    def __init__(self, executor: Executor | None = None, workers: int | None = None, max_codes: int = 128,
+                 disk_cache: bool = True) -> None:
+        self._own_executor = executor is None
+        self.executor = executor or ProcessPoolExecutor(max_workers=workers)
+        self.max_codes = max_codes
+        self.disk_cache = disk_cache
+        self._codes = OrderedDict() # {key: _Code}, least recently used first
+        self._pending = {} # {key: task building that code}
+        self.counters = {"requests": 0, "constructions": 0, "cache_hits": 0, "coalesced": 0}
+
+    def close(self) -> None:
+        if self._own_executor:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def get_code(self, unique_patterns: set[int], n: int) -> _Code:
+        """
+        Return the code for packed patterns, from memory, by joining a pending construction, or by building it.
+        """
+        key = CodeCache.key(unique_patterns, n)
+        code = self._codes.get(key)
+        if code is not None:
+            self._codes.move_to_end(key)
+            self.counters["cache_hits"] += 1
+            return code
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._build(key, unique_patterns, n))
+            self._pending[key] = task
+        else:
+            self.counters["coalesced"] += 1
+        # Shielded, so a client that disconnects does not cancel the construction for the others
+        return await asyncio.shield(task)
+
+    async def _build(self, key: str, unique_patterns: set[int], n: int) -> _Code:
+        try:
+            self.counters["constructions"] += 1
+            loop = asyncio.get_running_loop()
+            packed_map = await loop.run_in_executor(self.executor, _construct_syndrome_map,
+                                                    sorted(unique_patterns), n, self.disk_cache)
+            code = _Code(key, GreedySyndromeMapper.from_syndrome_map(unique_patterns, n, packed_map))
+            self._codes[key] = code
+            while len(self._codes) > self.max_codes:
+                self._codes.popitem(last=False)
+            return code
+        finally:
+            del self._pending[key]
+
+    async def _code_for(self, request: dict) -> _Code:
+        try:
+            if "key" in request:
+                code = self._codes.get(request["key"])
+                if code is None:
+                    raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown code key {request['key']!r}; send the error patterns again.")
+                self._codes.move_to_end(code.key)
+                self.counters["cache_hits"] += 1
+                return code
+            if "family" in request:
+                if not isinstance(request["family"], str):
+                    raise ValueError("family must be a string such as weight:32:2.")
+                patterns = family_patterns(request["family"], packed=True)
+                n = int(request["family"].split(":")[1])
+                return await self.get_code(_check_packed(patterns, n), n)
+            if "error_patterns" in request:
+                return await self.get_code(*pack_patterns(request["error_patterns"]))
+        except (ValueError, TypeError) as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e)) from None
+        except RuntimeError as e:
+            raise RequestError(HTTPStatus.UNPROCESSABLE_ENTITY, str(e)) from None
+        raise RequestError(HTTPStatus.BAD_REQUEST, "Provide error_patterns, family or key.")
+
+    async def construct(self, request: dict) -> dict:
+        code = await self._code_for(request)
+        return {
+            "key": code.key,
+            "n": code.mapper.n,
+            "redundancy": code.mapper.redundancy,
+            "syndrome_map": sorted(code.mapper.syndrome_map.items()),
+        }
+
+    async def basis_map(self, request: dict) -> dict:
+        code = await self._code_for(request)
+        return {"key": code.key, "basis_map": code.mapper.get_basis_map_list()}
+
+    async def parity_check_matrix(self, request: dict) -> dict:
+        code = await self._code_for(request)
+        return {"key": code.key, "parity_check_matrix": code.mapper.get_parity_check_matrix().tolist()}
+
+    async def decode_batch(self, request: dict) -> dict:
+        code = await self._code_for(request)
+        try:
+            decoder = code.get_decoder()
+            if "packed_words" in request:
+                received = base64.b64decode(request["packed_words"], validate=True)
+                packed = True
+            elif "words" in request:
+                words = np.asarray(request["words"])
+                if not np.isin(words, (0, 1)).all():
+                    raise ValueError("words must only hold 0/1 entries.")
+                received = words.astype(np.uint8).reshape(-1, code.mapper.n)
+                packed = False
+            else:
+                raise ValueError("Provide words or packed_words.")
+            # NumPy releases the GIL for most of the decoding, so a thread keeps the event loop responsive
+            loop = asyncio.get_running_loop()
+            corrected, uncorrectable = await loop.run_in_executor(
+                None, lambda: decoder.decode_batch(received, packed=packed, return_uncorrectable=True))
+        except (ValueError, TypeError) as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e)) from None
+        response = {"key": code.key, "uncorrectable": uncorrectable.tolist()}
+        if packed:
+            response["packed_corrected"] = base64.b64encode(corrected.tobytes()).decode("ascii")
+        else:
+            response["corrected"] = corrected.tolist()
+        return response
+
+    async def health(self, request: dict) -> dict:
+        return {"status": "ok", "codes": len(self._codes), "pending": len(self._pending), **self.counters}
+
+    _ROUTES = {
+        ("POST", "/construct"): construct,
+        ("POST", "/basis-map"): basis_map,
+        ("POST", "/parity-check-matrix"): parity_check_matrix,
+        ("POST", "/decode-batch"): decode_batch,
+        ("GET", "/health"): health,
+    }
+
+    async def handle(self, method: str, path: str, body: bytes) -> tuple[HTTPStatus, dict]:
+        """
+        Answer one request; returns the status and the JSON payload.
+        """
+        self.counters["requests"] += 1
+        route = self._ROUTES.get((method, path.split("?", 1)[0]))
+        if route is None:
+            known_path = any(p == path.split("?", 1)[0] for _, p in self._ROUTES)
+            status = HTTPStatus.METHOD_NOT_ALLOWED if known_path else HTTPStatus.NOT_FOUND
+            return status, {"error": status.phrase}
+        try:
+            request = json.loads(body) if body else {}
+            if not isinstance(request, dict):
+                raise ValueError("The request body must be a JSON object.")
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON: {e}"}
+        try:
+            return HTTPStatus.OK, await route(self, request)
+        except RequestError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            # A request must never drop the connection without an answer
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Internal error: {type(e).__name__}: {e}"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Minimal HTTP/1.1 connection handler with keep-alive, for asyncio.start_server.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length", 0))
+                    if length < 0:
+                        raise ValueError
+                except ValueError:
+                    # The body (if any) cannot be delimited, so answer and close
+                    status, payload = HTTPStatus.BAD_REQUEST, {"error": "Malformed request line or Content-Length."}
+                    keep_alive = False
+                else:
+                    if length > MAX_BODY_BYTES:
+                        status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request body too large."}
+                        keep_alive = False
+                    else:
+                        body = await reader.readexactly(length) if length else b""
+                        status, payload = await self.handle(method, target, body)
+                        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                data = json.dumps(payload, separators=(",", ":")).encode()
+                writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                             f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass # Interrupted request, or a line past the stream limit that cannot be resynchronised
+        finally:
+            writer.close()
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int | None = None,
+                max_codes: int = 128, disk_cache: bool = True) -> None:
+    """
+    Run the service until cancelled.
+    """
+    service = CodeService(workers=workers, max_codes=max_codes, disk_cache=disk_cache)
+    try:
+        server = await asyncio.start_server(service.handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
@@ -1,115 +1,844 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
 import itertools
+import os
+import struct
+import sys
+import tempfile
+import time
 from collections import defaultdict
-import numpy as np
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import native_backend
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from linear_code import GeneratorMatrix, ParityCheckMatrix
+
+# NumPy and linear_code are imported inside the functions that build arrays or matrices, so that
+# constructing a small code (and the CLI commands that only print mappings) never pays for loading NumPy.
+
+# Bump whenever a change could alter the syndromes chosen for some error pattern set,
+# so that cached constructions from older versions are not reused.
+ALGORITHM_VERSION = 1
+
+# Checkpoint files of resumable constructions: a fixed header (magic, format version, ALGORITHM_VERSION,
+# n, max_width, pool width, number of assigned patterns, SHA-256 of the pattern set) followed by the
+# syndromes of the first assigned nonzero patterns in sorted order, big-endian, ceil(max_width / 8) bytes each.
+CHECKPOINT_MAGIC = b"GSMC"
+CHECKPOINT_VERSION = 1
+_CHECKPOINT_HEADER = struct.Struct(">4sHHIIIQ32s")
+
+
+def _pack(vector) -> int:
+    """
+    Pack a 0/1 vector into an int, with the leftmost entry as the most significant bit.
+    This keeps the integer order identical to the lexicographic order of the tuples.
+    """
+    packed = 0
+    for bit in vector:
+        packed = (packed << 1) | int(bit)
+    return packed
+
+
+def _unpack(packed: int, n: int) -> tuple[int, ...]:
+    """
+    Unpack an int produced by _pack back into a length-n tuple.
+    """
+    return tuple((packed >> shift) & 1 for shift in range(n - 1, -1, -1))
+
+
+def _is_ndarray(value) -> bool:
+    numpy = sys.modules.get("numpy") # An ndarray can only exist once NumPy is loaded
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def _numpy_available() -> bool:
+    try:
+        import numpy # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def packed_to_matrix(patterns, n: int) -> np.ndarray:
+    """
+    Expand packed int patterns (leftmost position = most significant bit) into an (N, n) uint8 matrix.
+    """
+    import numpy as np
+    if n <= 64:
+        values = np.asarray(patterns, dtype=np.uint64).reshape(-1)
+        shifts = np.arange(n - 1, -1, -1, dtype=np.uint64)
+        return ((values[:, None] >> shifts) & np.uint64(1)).astype(np.uint8)
+    n_bytes = (n + 7) // 8
+    data = b"".join((int(v) << (8 * n_bytes - n)).to_bytes(n_bytes, "big") for v in patterns)
+    rows = np.frombuffer(data, dtype=np.uint8).reshape(-1, n_bytes)
+    return np.unpackbits(rows, axis=1, count=n)
+
+
+def _pack_matrix(matrix: np.ndarray) -> tuple[set[int], int]:
+    """
+    Pack the rows of an (N, n) 0/1 matrix without building a Python list per row.
+    """
+    import numpy as np
+    if matrix.ndim != 2 or matrix.shape[0] == 0:
+        raise ValueError("error_patterns must be a non-empty (N, n) matrix.")
+    if ((matrix != 0) & (matrix != 1)).any():
+        raise ValueError("Error patterns may only hold 0 and 1 entries.")
+    n = matrix.shape[1]
+    rows = np.packbits(matrix.astype(np.uint8, copy=False), axis=1)
+    width = rows.shape[1]
+    shift = 8 * width - n # np.packbits pads the last byte with zeros on the right
+    data = rows.tobytes()
+    return {int.from_bytes(data[i:i + width], "big") >> shift for i in range(0, len(data), width)}, n
+
+
+def pack_patterns(error_patterns: list[tuple[int]] | list[list[int]] | np.ndarray) -> tuple[set[int], int]:
+    """
+    Validate a list of 0/1 vectors (or an (N, n) matrix) and return
+    (set of packed, deduplicated patterns, vector length).
+    """
+    if _is_ndarray(error_patterns):
+        return _pack_matrix(error_patterns)
+    if not error_patterns:
+        raise ValueError("error_patterns cannot be an empty set.")
+    for v in error_patterns:
+        if not isinstance(v, (list, tuple)) and not _is_ndarray(v):
+            raise ValueError(f"Every error pattern must be a 0/1 vector, got {v!r}.")
+    n = len(error_patterns[0])
+    if not all(len(v) == n for v in error_patterns):
+        raise ValueError("All vectors in error_patterns must have the same length.")
+    # One set of all entries checks every bit at C speed (True/False and NumPy integers hash like 0/1)
+    try:
+        binary = set(itertools.chain.from_iterable(error_patterns)) <= {0, 1}
+    except TypeError: # Unhashable entries such as nested lists
+        binary = False
+    if not binary:
+        raise ValueError("Error patterns may only hold 0 and 1 entries.")
+    return {_pack(v) for v in error_patterns}, n
+
+
+def _check_packed(error_patterns, n: int) -> set[int]:
+    unique_patterns = {int(v) for v in error_patterns}
+    if not unique_patterns:
+        raise ValueError("error_patterns cannot be an empty set.")
+    if any(v < 0 or v.bit_length() > n for v in unique_patterns):
+        raise ValueError(f"All packed error_patterns must fit in {n} bits.")
+    return unique_patterns
+
+
+EXPORT_FORMATS = ("packbits", "npy", "npz", "lines")
+
+
+def _bit_lines(*matrices: np.ndarray) -> bytes:
+    """
+    Render 0/1 matrices side by side as newline-delimited bit strings, separated by spaces, in one pass.
+    """
+    import numpy as np
+    rows = matrices[0].shape[0]
+    columns = []
+    for k, matrix in enumerate(matrices):
+        if k:
+            columns.append(np.full((rows, 1), ord(" "), dtype=np.uint8))
+        columns.append(matrix.astype(np.uint8) + np.uint8(ord("0")))
+    columns.append(np.full((rows, 1), ord("\n"), dtype=np.uint8))
+    return np.concatenate(columns, axis=1).tobytes()
+
+
+def _write_bytes(file, data: bytes) -> None:
+    if isinstance(file, str):
+        with open(file, "wb") as f:
+            f.write(data)
+    else:
+        file.write(data)
+
+
+def export_arrays(file, fmt: str, **arrays: np.ndarray) -> None:
+    """
+    Write named 0/1 matrices to a path or binary file object in one of EXPORT_FORMATS:
+
+    - packbits: np.packbits rows of all matrices concatenated into fixed-width binary records
+    - npy: a single matrix (several matrices are stacked along a new second axis)
+    - npz: a compressed archive with one entry per name
+    - lines: one line per row, the matrices' bit strings separated by spaces
+    """
+    import numpy as np
+    matrices = [np.asarray(m, dtype=np.uint8) for m in arrays.values()]
+    if fmt == "packbits":
+        _write_bytes(file, np.concatenate([np.packbits(m, axis=1) for m in matrices], axis=1).tobytes())
+    elif fmt == "npy":
+        np.save(file, matrices[0] if len(matrices) == 1 else np.stack(matrices, axis=1))
+    elif fmt == "npz":
+        np.savez_compressed(file, **{name: m for name, m in zip(arrays, matrices)})
+    elif fmt == "lines":
+        _write_bytes(file, _bit_lines(*matrices))
+    else:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(EXPORT_FORMATS)}.")
+
+
+class _PackedMapView(Mapping):
+    """
+    Read-only {tuple: tuple} view over a {packed int: packed int} dictionary.
+    """
+    def __init__(self, packed_map: dict[int, int], n: int) -> None:
+        self._packed_map = packed_map
+        self._n = n
+
+    def __getitem__(self, vector):
+        try:
+            return _unpack(self._packed_map[_pack(vector)], self._n)
+        except (KeyError, TypeError, ValueError):
+            raise KeyError(vector) from None
+
+    def __iter__(self):
+        n = self._n
+        return (_unpack(v, n) for v in self._packed_map)
+
+    def __len__(self) -> int:
+        return len(self._packed_map)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class _SyndromePool:
+    """
+    Pool of available (nonzero, not yet assigned) syndromes of a fixed bit width.
+    Only the taken syndromes are stored, so memory grows with |T| instead of 2^width.
+
+    Each taken syndrome points at a later syndrome such that everything in between is taken.
+    Following those pointers with path compression (a union-find successor index) finds the
+    smallest free syndrome >= x in near-constant amortized time, without sorting the pool.
+
+    The pool starts at `width` bits and first_fit widens it one bit at a time, up to max_width,
+    only when no candidate fits. Since candidates are tried in increasing order, the result is
+    the same as searching the max_width-bit space directly.
+    """
+    def __init__(self, width: int, max_width: int | None = None) -> None:
+        self.max_width = width if max_width is None else max_width
+        self.width = min(width, self.max_width)
+        self.size = 1 << self.width
+        self._successor = {} # {taken syndrome: candidate next free syndrome}
+
+    _SCALAR_PROBES = 32 # Candidates checked in pure Python before switching to NumPy blocks
+    _BLOCK_ELEMENTS = 1 << 20 # Upper bound on candidates x offsets per NumPy block
+    _BITMAP_BITS = 24 # Largest syndrome range checked with a dense taken-bitmap instead of a sorted array
+    _PURE_INT_BITS = 12 # Widest pool searched without NumPy blocks
+
+    @property
+    def taken(self):
+        return self._successor.keys()
+
+    def __contains__(self, syndrome: int) -> bool:
+        return 0 < syndrome < self.size and syndrome not in self._successor
+
+    def __len__(self) -> int:
+        return self.size - 1 - len(self._successor)
+
+    def __iter__(self):
+        syndrome = self.next_free(1)
+        while syndrome is not None:
+            yield syndrome
+            syndrome = self.next_free(syndrome + 1)
+
+    def next_free(self, start: int) -> int | None:
+        """
+        Return the smallest available syndrome >= start, or None if there is none.
+        """
+        successor = self._successor
+        syndrome = max(start, 1)
+        path = []
+        while syndrome in successor:
+            path.append(syndrome)
+            syndrome = successor[syndrome]
+        for visited in path: # Path compression: jump straight to the free syndrome next time
+            successor[visited] = syndrome
+        return syndrome if syndrome < self.size else None
+
+    def grow(self, width: int) -> None:
+        """
+        Widen the pool to width bits; taken syndromes and successor pointers stay valid.
+        """
+        if width > self.width:
+            self.width = width
+            self.size = 1 << width
+
+    def first_fit(self, offsets: list[int]) -> int | None:
+        """
+        Return the smallest available syndrome s such that s ^ r is also available for every r in offsets,
+        widening the pool up to max_width bits if the current width has no such syndrome.
+        """
+        start = 1
+        while True:
+            syndrome = self._first_fit_from(start, offsets)
+            if syndrome is not None or self.width >= self.max_width:
+                return syndrome
+            # Every candidate below the old size was rejected, so the search resumes at the new bits
+            start = self.size
+            self.grow(self.width + 1)
+
+    def _first_fit_from(self, start: int, offsets: list[int]) -> int | None:
+        """
+        first_fit restricted to candidates >= start within the current width.
+
+        The first few candidates are checked one by one; if they are all rejected, the remaining
+        candidates are tested in blocks with NumPy against a sorted array of the taken syndromes.
+        Pools of at most _PURE_INT_BITS bits (or any pool when NumPy is not installed) stay on the
+        pure-int scan, which is cheaper than importing NumPy for them.
+        """
+        candidate = self.next_free(start)
+        for _ in range(self._SCALAR_PROBES):
+            if candidate is None:
+                return None
+            if all((candidate ^ r) in self for r in offsets):
+                return candidate
+            candidate = self.next_free(candidate + 1)
+        if (candidate is None or not offsets or self.width > 64 or self.width <= self._PURE_INT_BITS
+                or not _numpy_available()):
+            while candidate is not None and not all((candidate ^ r) in self for r in offsets):
+                candidate = self.next_free(candidate + 1)
+            return candidate
+        return self._first_fit_blocks(candidate, offsets)
+
+    def _first_fit_blocks(self, candidate: int, offsets: list[int]) -> int | None:
+        import numpy as np
+
+        taken = np.fromiter(self._successor, dtype=np.uint64, count=len(self._successor))
+        taken_max = int(taken.max())
+        taken_bitmap = None
+        taken_sorted = None
+        # Offset 0 checks the candidate itself; s ^ r is never 0 for a free s since every r is taken
+        offsets_arr = np.array([0, *offsets], dtype=np.uint64)
+        max_block = max(64, self._BLOCK_ELEMENTS // len(offsets_arr))
+        block = 64
+        while candidate is not None:
+            stop = min(candidate + block, self.size)
+            candidates = np.arange(candidate, stop, dtype=np.uint64)
+            derived = candidates[:, None] ^ offsets_arr[None, :]
+            # Every derived syndrome is below 2^bits, so a bitmap of that size covers them all
+            bits = max(stop - 1, taken_max).bit_length()
+            if bits <= self._BITMAP_BITS:
+                if taken_bitmap is None or len(taken_bitmap) < (1 << bits):
+                    taken_bitmap = np.zeros(1 << bits, dtype=bool)
+                    taken_bitmap[taken] = True
+                collides = taken_bitmap[derived]
+            else:
+                if taken_sorted is None:
+                    taken_sorted = np.sort(taken)
+                positions = np.minimum(np.searchsorted(taken_sorted, derived), len(taken_sorted) - 1)
+                collides = taken_sorted[positions] == derived
+            hits = np.flatnonzero(~collides.any(axis=1))
+            if hits.size:
+                return int(candidates[hits[0]])
+            candidate = self.next_free(stop)
+            block = min(block * 2, max_block)
+        return None
+
+    def take(self, syndromes) -> None:
+        successor = self._successor
+        for syndrome in syndromes:
+            successor.setdefault(syndrome, syndrome + 1)
+
+    def release(self, syndromes) -> None:
+        """
+        Return syndromes to the pool.
+        """
+        successor = self._successor
+        for syndrome in syndromes:
+            successor.pop(syndrome, None)
+        # Compressed pointers may jump over a released syndrome, so reset them all
+        for syndrome in successor:
+            successor[syndrome] = syndrome + 1
+
+
+@dataclass
+class DimensionStats:
+    """
+    What the greedy search did for one dimension group.
+    """
+    dimension: int
+    group_size: int
+    syndrome: int | None = None # Packed syndrome chosen for the basis vector
+    candidates: int = 0 # Candidate syndromes considered, in increasing order
+    rejected_unavailable: int = 0 # Candidates that were already taken
+    rejected_collision: int = 0 # Free candidates where some derived syndrome s ^ r was taken
+    seconds: float = 0.0
+    pool_taken: int = 0 # Taken syndromes after this dimension
+    syndrome_bits: int = 0 # Width of the syndrome search space after this dimension
+    failure: str | None = None # "missing residual" or "pool exhausted" when no syndrome was found
+
+
+class ConstructionStats:
+    """
+    Optional instrumentation for GreedySyndromeMapper. Pass an instance as `stats` to collect one
+    DimensionStats per processed dimension; `callback`, if given, is called with each record as it
+    is produced. Without a stats object the construction runs uninstrumented.
+    """
+    def __init__(self, callback: Callable[[DimensionStats], None] | None = None) -> None:
+        self.dimensions: list[DimensionStats] = []
+        self.callback = callback
+
+    def record(self, dimension_stats: DimensionStats) -> None:
+        self.dimensions.append(dimension_stats)
+        if self.callback is not None:
+            self.callback(dimension_stats)
+
+    def totals(self) -> dict:
+        return {
+            "dimensions": len(self.dimensions),
+            "candidates": sum(d.candidates for d in self.dimensions),
+            "rejected_unavailable": sum(d.rejected_unavailable for d in self.dimensions),
+            "rejected_collision": sum(d.rejected_collision for d in self.dimensions),
+            "seconds": sum(d.seconds for d in self.dimensions),
+            "pool_taken": self.dimensions[-1].pool_taken if self.dimensions else 0,
+        }
+
+    def as_rows(self) -> list[dict]:
+        return [dict(vars(d)) for d in self.dimensions]
+
+    def format_table(self) -> str:
+        lines = [f"{'dim':>4} {'group':>6} {'candidates':>11} {'taken':>9} {'collision':>10} {'ms':>9} {'pool':>8} {'bits':>5}  result"]
+        for d in self.dimensions:
+            result = d.failure if d.failure else f"syndrome {d.syndrome}"
+            lines.append(f"{d.dimension:>4} {d.group_size:>6} {d.candidates:>11} {d.rejected_unavailable:>9} "
+                         f"{d.rejected_collision:>10} {d.seconds * 1e3:>9.3f} {d.pool_taken:>8} {d.syndrome_bits:>5}  {result}")
+        return "\n".join(lines)
+
 
 class GreedySyndromeMapper:
     """
     GreedySyndromeMapper constructs a syndrome mapping for a given set of error patterns using a greedy algorithm.
     This class encapsulates the algorithm's state and logic for better efficiency, readability, and maintainability.
     Corresponds to "Greedy construction" (Section 3.3) in the referenced paper.
+
+    Internally every error pattern and syndrome is a packed int (leftmost entry = most significant bit),
+    so XOR is a single `^` and the highest dimension of a vector is `bit_length() - 1`.
+    The tuple-based outputs are views over that packed state.
+
+    Syndromes are searched in the r-bit space, starting from r = ceil(log2(|T| + 1)) and growing r
+    only when no candidate fits, so the work tracks the redundancy of the code rather than n.
+    The result is the same as searching all n-bit syndromes. With max_redundancy, construction
+    fails once more than that many check bits would be needed.
+
+    Subclasses can vary the greedy choices by overriding _choose_basis and _select_syndrome
+    (see code_search.py); such subclasses must set _native_construction to False.
     """
-    def __init__(self, error_patterns: list[tuple[int]] | list[list[int]]) -> None:
-        if not error_patterns:
-            raise ValueError("error_patterns cannot be an empty set.")
-        n = len(error_patterns[0])
+    _native_construction = True # The native backend implements the default choices only
+
+    def __init__(self, error_patterns: list[tuple[int]] | list[list[int]] | np.ndarray,
+                 stats: ConstructionStats | None = None, max_redundancy: int | None = None) -> None:
+        unique_patterns, n = pack_patterns(error_patterns)
+        self._init_state(unique_patterns, n, max_redundancy)
+        self.stats = stats
+        self._construct_map()
+
+    @classmethod
+    def from_packed(cls, error_patterns, n: int, stats: ConstructionStats | None = None,
+                    max_redundancy: int | None = None) -> "GreedySyndromeMapper":
+        """
+        Build a mapper directly from packed int error patterns of length n, skipping tuple conversion.
+        """
+        mapper = cls.__new__(cls)
+        mapper._init_state(_check_packed(error_patterns, n), n, max_redundancy)
+        mapper.stats = stats
+        mapper._construct_map()
+        return mapper
+
+    @classmethod
+    def from_syndrome_map(cls, error_patterns, n: int, packed_syndrome_map: dict[int, int]) -> "GreedySyndromeMapper":
+        """
+        Rebuild a mapper from packed error patterns and a previously computed packed syndrome map,
+        without rerunning the greedy construction.
+        """
+        mapper = cls.__new__(cls)
+        mapper._init_state(_check_packed(error_patterns, n), n)
+        missing = [v for v in mapper._sorted_patterns if v and v not in packed_syndrome_map]
+        if missing:
+            raise ValueError(f"The syndrome map has no syndrome for error pattern {_unpack(missing[0], n)}.")
+        mapper._syndromes.update(packed_syndrome_map)
+        mapper.available_syndromes.take(packed_syndrome_map.values())
+        mapper.available_syndromes.grow(max(packed_syndrome_map.values(), default=0).bit_length())
+        return mapper
+
+    @classmethod
+    def resumable(cls, error_patterns, checkpoint: str | None = None, time_budget: float | None = None,
+                  checkpoint_interval: float = 60.0, n: int | None = None, stats: ConstructionStats | None = None,
+                  max_redundancy: int | None = None) -> "GreedySyndromeMapper":
+        """
+        Construct the mapping dimension by dimension, saving the state to the checkpoint file every
+        checkpoint_interval seconds and resuming from it if it already exists. error_patterns are
+        0/1 vectors, or packed ints when n is given.
+
+        With time_budget, no new dimension is started once that many seconds have passed: the
+        returned mapper is then partial (see complete and pending_dimensions), its state is saved to
+        the checkpoint, and calling resumable again with the same arguments continues from there.
+        Once the construction completes the checkpoint is deleted. The result is identical to an
+        uninterrupted construction, which this always runs in Python rather than in the native backend.
+        """
+        unique_patterns, n = pack_patterns(error_patterns) if n is None else (_check_packed(error_patterns, n), n)
+        mapper = cls.__new__(cls)
+        mapper._init_state(unique_patterns, n, max_redundancy)
+        mapper.stats = stats
+        if checkpoint is not None and os.path.exists(checkpoint):
+            mapper._restore_checkpoint(checkpoint)
+        mapper._construct_dimensions(checkpoint, time_budget, checkpoint_interval)
+        return mapper
+
+    def _init_state(self, unique_patterns: set[int], n: int, max_redundancy: int | None = None) -> None:
+        if max_redundancy is not None and max_redundancy < 1:
+            raise ValueError("max_redundancy must be positive.")
         self.n = n  # Store the dimension for later use
-        if not all(len(v) == n for v in error_patterns):
-            raise ValueError("All vectors in error_patterns must have the same length.")
 
-        # Convert to a set of tuples to remove duplicates, then sort.
-        # This ensures each error pattern is unique and processed only once.
-        unique_patterns = set(tuple(v) for v in error_patterns)
-        self.sorted_error_patterns = sorted(list(unique_patterns)) # Use sorted error_patterns as dictionary keys
+        # Duplicates are already removed by the set; sorting packed ints matches sorting the tuples.
+        self._sorted_patterns = sorted(unique_patterns)
         self._basis_vectors = {}  # Store the basis vector for each dimension
         self._highest_dim_groups = defaultdict(list) # Group error_patterns's vectors by their highest dimension
 
-        # Use set for O(1) lookup and removal, greatly improving efficiency
-        all_vectors = (tuple(v) for v in itertools.product([0, 1], repeat=self.n))
-        self.available_syndromes = set(all_vectors)
-        self.available_syndromes.remove(tuple([0] * self.n)) # Remove zero vector
+        # Only taken syndromes are stored; free ones are produced on demand in increasing order.
+        # |T| distinct nonzero syndromes need at least ceil(log2(|T| + 1)) bits, so the search starts there.
+        max_width = self.n if max_redundancy is None else min(max_redundancy, self.n)
+        nonzero_patterns = len(self._sorted_patterns) - (0 in unique_patterns)
+        self.available_syndromes = _SyndromePool(max(1, nonzero_patterns.bit_length()), max_width)
 
-        self.syndrome_map = {} # Final mapping result: {vector: syndrome}
+        self._syndromes = {} # Final mapping result: {packed vector: packed syndrome}
+        self.syndrome_map = _PackedMapView(self._syndromes, self.n)
+        self.stats = None # Optional ConstructionStats
 
         self._prepare_basis()
-        self._construct_map()
+
+    @property
+    def packed_syndrome_map(self) -> dict[int, int]:
+        """
+        The packed {vector: syndrome} state that syndrome_map is a view of. Treat as read-only.
+        """
+        return self._syndromes
+
+    @property
+    def redundancy(self) -> int:
+        """
+        Number of check bits the code uses; for greedy codes, the number of rows of the parity check matrix.
+        """
+        return max(self._syndromes.values(), default=0).bit_length()
+
+    def check_redundancy(self, max_redundancy: int) -> None:
+        """
+        Raise the RuntimeError a construction with this max_redundancy would have raised, if any.
+        """
+        for i in sorted(self._basis_vectors.keys()):
+            syndrome = self._syndromes.get(self._basis_vectors[i])
+            if syndrome is not None and syndrome.bit_length() > max_redundancy:
+                raise RuntimeError(f"Could not find a valid syndrome for basis vector {_unpack(self._basis_vectors[i], self.n)} "
+                                   f"with at most {max_redundancy} check bits.")
+
+    @property
+    def pending_dimensions(self) -> list[int]:
+        """
+        Dimensions whose patterns have no syndrome yet; empty unless a resumable construction ran out of time.
+        """
+        return [i for i in sorted(self._basis_vectors.keys()) if self._basis_vectors[i] not in self._syndromes]
+
+    @property
+    def complete(self) -> bool:
+        return not self.pending_dimensions
+
+    @property
+    def sorted_error_patterns(self) -> list[tuple[int, ...]]:
+        return [_unpack(v, self.n) for v in self._sorted_patterns]
 
     def _prepare_basis(self):
         """
         Determine basis vectors and group by highest dimension in T.
         """
-        for v in self.sorted_error_patterns:
-            try:
-                # Find the leftmost '1', which is the highest dimension
-                highest_dim_index = self.n - 1 - v.index(1) # Counting from right to left
-                self._highest_dim_groups[highest_dim_index].append(v)
-            except ValueError: # Skip zero vector
-                continue
+        for v in self._sorted_patterns:
+            if v: # Skip zero vector
+                # The highest set bit is the leftmost '1', counting dimensions from right to left
+                self._highest_dim_groups[v.bit_length() - 1].append(v)
 
         # Select the first vector from each dimension as the basis
         for i in range(self.n):
             if i in self._highest_dim_groups:
-                self._basis_vectors[i] = self._highest_dim_groups[i][0]
+                self._basis_vectors[i] = self._choose_basis(self._highest_dim_groups[i])
+
+    def _choose_basis(self, group: list[int]) -> int:
+        """
+        Pick the basis vector of a highest-dimension group (sorted in increasing order).
+        """
+        return group[0]
 
-    @staticmethod
-    def _xor_sum(vectors) -> tuple[int, ...] | None:
-        if not vectors:
-            return None
-        arr = np.array(vectors, dtype=np.uint8)
-        return tuple(int(x) for x in np.bitwise_xor.reduce(arr))
+    def add_patterns(self, error_patterns: list[tuple[int]] | list[list[int]]) -> None:
+        """
+        Add error patterns to T and update the mapping in place.
+        """
+        new_patterns, n = pack_patterns(error_patterns)
+        if n != self.n:
+            raise ValueError("All vectors in error_patterns must have the same length.")
+        self.add_packed_patterns(new_patterns)
+
+    def add_packed_patterns(self, error_patterns) -> None:
+        """
+        Add packed error patterns to T and update the mapping in place.
+
+        The greedy choice for dimension i only depends on the groups of dimensions <= i, so the
+        assignments below the lowest dimension touched by a new pattern are kept and only the
+        suffix of dimensions from there upward is recomputed. The result is identical to building
+        a new mapper from the combined patterns. If that fails, the mapper is left unchanged.
+        """
+        added = _check_packed(error_patterns, self.n).difference(self._sorted_patterns)
+        if not added:
+            return
+        previous_patterns = self._sorted_patterns
+        previous_syndromes = dict(self._syndromes)
+        self._sorted_patterns = sorted(added.union(previous_patterns))
+        self._basis_vectors = {}
+        self._highest_dim_groups = defaultdict(list)
+        self._prepare_basis()
+
+        affected_dims = [v.bit_length() - 1 for v in added if v]
+        if not affected_dims: # Only the zero vector was added
+            return
+        first_dim = min(affected_dims)
+        dropped = {v: s for v, s in self._syndromes.items() if v.bit_length() - 1 >= first_dim}
+        for v in dropped:
+            del self._syndromes[v]
+        self.available_syndromes.release(dropped.values())
+        try:
+            for i in sorted(self._basis_vectors.keys()):
+                if i >= first_dim:
+                    self._run_dimension(i)
+        except RuntimeError:
+            # Restore the previous code before reporting the failure
+            self.available_syndromes.release(self._syndromes.values())
+            self._syndromes.clear()
+            self._syndromes.update(previous_syndromes)
+            self.available_syndromes.take(previous_syndromes.values())
+            self._sorted_patterns = previous_patterns
+            self._basis_vectors = {}
+            self._highest_dim_groups = defaultdict(list)
+            self._prepare_basis()
+            raise
+
+    @classmethod
+    def construction_backend(cls, n: int, stats: ConstructionStats | None = None) -> str:
+        """
+        "native" if a construction of length n (with these stats) runs in the native library, otherwise "python".
+        """
+        if cls._native_construction and stats is None and n <= native_backend.MAX_WIDTH and native_backend.available():
+            return "native"
+        return "python"
 
     def _construct_map(self):
         """
         Execute the greedy algorithm to construct the syndrome mapping.
         """
+        if self.construction_backend(self.n, self.stats) == "native":
+            self._construct_map_native()
+            return
         # Process basis vectors in order of their dimensions
         for i in sorted(self._basis_vectors.keys()):
-            basis_vector = self._basis_vectors[i]
+            self._run_dimension(i)
 
-            # Start with the smallest available syndrome
-            # sorted() ensures the greedy choice strategy
-            for potential_syndrome in sorted(list(self.available_syndromes)):
-                
-                # Initialize a dictionary to hold the syndromes to assign
-                syndromes_to_assign = {}
-                is_valid_choice = True
-                
-                # 1. Basis vector's syndrome
-                syndromes_to_assign[basis_vector] = potential_syndrome
-
-                # 2. Other vectors in the same group (calculated via homomorphic properties)
-                other_vectors_in_group = [v for v in self._highest_dim_groups[i] if v != basis_vector]
-                
-                for other_v in other_vectors_in_group:
-                    # s(v) = s(basis) + s(v - basis)
-                    # In GF(2) ，v - basis = v + basis (XOR)
-                    residual_vector = self._xor_sum([other_v, basis_vector])
-                    # self-subordinate is required here.
-                    # The syndrome of the residual vector should have been assigned in previous steps
-
-                    if residual_vector not in self.syndrome_map:
-                        # This situation should not occur in theory, since we process in dimension order
-                        is_valid_choice = False
-                        break
-                    
-                    residual_syndrome = self.syndrome_map[residual_vector]
-                    derived_syndrome = self._xor_sum([potential_syndrome, residual_syndrome])
-                    
-                    syndromes_to_assign[other_v] = derived_syndrome
-                
-                if not is_valid_choice:
-                    continue
-
-                # Check if all syndromes to be assigned are available and non-conflicting
-                needed_syndromes = set(syndromes_to_assign.values())
-                if len(needed_syndromes) == len(syndromes_to_assign) and needed_syndromes.issubset(self.available_syndromes):
-                    # Selection successful! Update the mapping and remove from the available pool
-                    self.syndrome_map.update(syndromes_to_assign)
-                    self.available_syndromes -= needed_syndromes
-                    break # Success, break out of potential_syndrome loop and process next basis
-            else:
-                # If the for loop ends normally (not broken), it means no suitable syndrome was found
-                raise RuntimeError(f"Could not find a valid syndrome for basis vector {basis_vector}.")
+    def _construct_map_native(self):
+        """
+        Run the same greedy construction in the native library (see native_backend.py).
+        """
+        pool = self.available_syndromes
+        syndromes, failed_dim = native_backend.construct_packed(self._sorted_patterns, self.n, pool.max_width)
+        self._syndromes.update((v, s) for v, s in zip(self._sorted_patterns, syndromes) if s)
+        pool.take(self._syndromes.values())
+        pool.grow(max(self._syndromes.values(), default=0).bit_length())
+        if failed_dim is not None:
+            raise self._assignment_error(failed_dim)
+
+    def _construct_dimensions(self, checkpoint: str | None, time_budget: float | None, checkpoint_interval: float) -> None:
+        """
+        The Python construction loop of resumable, skipping dimensions restored from a checkpoint.
+        """
+        start = last_saved = time.monotonic()
+        for i in self.pending_dimensions:
+            if time_budget is not None and time.monotonic() - start >= time_budget:
+                break
+            self._run_dimension(i)
+            if checkpoint is not None and time.monotonic() - last_saved >= checkpoint_interval:
+                self.save_checkpoint(checkpoint)
+                last_saved = time.monotonic()
+        if checkpoint is None:
+            return
+        if self.complete:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(checkpoint)
+        else:
+            self.save_checkpoint(checkpoint)
+
+    def _checkpoint_digest(self) -> bytes:
+        # Subclasses make different choices, so their checkpoints are not interchangeable
+        digest = hashlib.sha256(f"{type(self).__qualname__}:{self.n}:".encode())
+        n_bytes = (self.n + 7) // 8
+        for v in self._sorted_patterns:
+            digest.update(v.to_bytes(n_bytes, "big"))
+        return digest.digest()
+
+    def save_checkpoint(self, path: str) -> None:
+        """
+        Write the construction state to path (replaced atomically) in the format described above CHECKPOINT_MAGIC.
+
+        Dimensions are processed in increasing order and a pattern's dimension grows with its value,
+        so the assigned patterns are always a prefix of the sorted patterns and only their syndromes
+        are stored; the taken syndromes are exactly those values.
+        """
+        pool = self.available_syndromes
+        syndrome_bytes = (pool.max_width + 7) // 8
+        syndromes = [self._syndromes[v] for v in self._sorted_patterns if v in self._syndromes]
+        header = _CHECKPOINT_HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, ALGORITHM_VERSION, self.n,
+                                         pool.max_width, pool.width, len(syndromes), self._checkpoint_digest())
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(b"".join(s.to_bytes(syndrome_bytes, "big") for s in syndromes))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _restore_checkpoint(self, path: str) -> None:
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < _CHECKPOINT_HEADER.size:
+            raise ValueError(f"{path} is not a construction checkpoint.")
+        magic, version, algorithm, n, max_width, width, count, digest = _CHECKPOINT_HEADER.unpack_from(data)
+        if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_VERSION:
+            raise ValueError(f"{path} is not a construction checkpoint.")
+        pool = self.available_syndromes
+        if (algorithm, n, max_width, digest) != (ALGORITHM_VERSION, self.n, pool.max_width, self._checkpoint_digest()):
+            raise ValueError(f"{path} was saved for other error patterns, another max_redundancy or an older version.")
+        syndrome_bytes = (max_width + 7) // 8
+        body = data[_CHECKPOINT_HEADER.size:]
+        if len(body) != count * syndrome_bytes:
+            raise ValueError(f"{path} is truncated.")
+        syndromes = [int.from_bytes(body[k:k + syndrome_bytes], "big") for k in range(0, len(body), syndrome_bytes)]
+        nonzero_patterns = (v for v in self._sorted_patterns if v)
+        self._syndromes.update(zip(nonzero_patterns, syndromes))
+        pool.take(syndromes)
+        pool.grow(width)
 
+    def _run_dimension(self, i: int) -> None:
+        if self.stats is None:
+            self._assign_dimension(i)
+            return
+        # Instrumented path: counts are derived from the chosen syndrome, so the search itself is untouched
+        pool = self.available_syndromes
+        record = DimensionStats(dimension=i, group_size=len(self._highest_dim_groups[i]))
+        start = time.perf_counter()
+        try:
+            syndrome = self._assign_dimension(i)
+        except RuntimeError:
+            record.seconds = time.perf_counter() - start
+            record.failure = self._failure_reason(i)
+            if record.failure == "pool exhausted":
+                record.candidates = pool.size - 1
+                record.rejected_unavailable = len(pool.taken)
+                record.rejected_collision = record.candidates - record.rejected_unavailable
+            record.pool_taken = len(pool.taken)
+            record.syndrome_bits = pool.width
+            self.stats.record(record)
+            raise
+        record.seconds = time.perf_counter() - start
+        # Every syndrome below the chosen one was either taken before this step or collided
+        assigned_below = sum(1 for v in self._highest_dim_groups[i] if self._syndromes[v] < syndrome)
+        taken_below = sum(1 for s in pool.taken if s < syndrome) - assigned_below
+        record.syndrome = syndrome
+        record.candidates = syndrome
+        record.rejected_unavailable = taken_below
+        record.rejected_collision = syndrome - 1 - taken_below
+        record.pool_taken = len(pool.taken)
+        record.syndrome_bits = pool.width
+        self.stats.record(record)
+
+    def _failure_reason(self, i: int) -> str:
+        basis_vector = self._basis_vectors[i]
+        if any((v ^ basis_vector) not in self._syndromes for v in self._highest_dim_groups[i] if v != basis_vector):
+            return "missing residual"
+        return "pool exhausted"
+
+    def _assignment_error(self, i: int) -> RuntimeError:
+        message = f"Could not find a valid syndrome for basis vector {_unpack(self._basis_vectors[i], self.n)}"
+        max_width = self.available_syndromes.max_width
+        if max_width < self.n and self._failure_reason(i) == "pool exhausted":
+            message += f" with at most {max_width} check bits"
+        return RuntimeError(message + ".")
+
+    def _assign_dimension(self, i: int) -> int:
+        """
+        Assign syndromes to every vector whose highest dimension is i; return the basis vector's syndrome.
+        """
+        basis_vector = self._basis_vectors[i]
+        other_vectors_in_group = [v for v in self._highest_dim_groups[i] if v != basis_vector]
+
+        # Other vectors in the same group are calculated via homomorphic properties:
+        # s(v) = s(basis) + s(v - basis), and in GF(2) v - basis = v + basis (XOR).
+        # The residual syndromes R do not depend on the candidate, so collect them once.
+        residual_syndromes = []
+        for other_v in other_vectors_in_group:
+            residual_vector = other_v ^ basis_vector
+            # self-subordinate is required here.
+            # The syndrome of the residual vector should have been assigned in previous steps
+            if residual_vector not in self._syndromes:
+                raise self._assignment_error(i)
+            residual_syndromes.append(self._syndromes[residual_vector])
+
+        # A candidate s works iff s and every s ^ r are available. They are automatically distinct,
+        # because R holds distinct nonzero syndromes of distinct residual vectors.
+        potential_syndrome = self._select_syndrome(residual_syndromes)
+        if potential_syndrome is None:
+            raise self._assignment_error(i)
+
+        # Selection successful! Update the mapping and remove from the available pool
+        syndromes_to_assign = {basis_vector: potential_syndrome}
+        for other_v, residual_syndrome in zip(other_vectors_in_group, residual_syndromes):
+            syndromes_to_assign[other_v] = potential_syndrome ^ residual_syndrome
+        self._syndromes.update(syndromes_to_assign)
+        self.available_syndromes.take(syndromes_to_assign.values())
+        return potential_syndrome
+
+    def _select_syndrome(self, residual_syndromes: list[int]) -> int | None:
+        """
+        Pick the syndrome of a basis vector: the smallest s such that s and every s ^ r are available.
+        """
+        return self.available_syndromes.first_fit(residual_syndromes)
+
+    def _basis_syndromes(self) -> list[int]:
+        """
+        Packed syndromes of the basis vectors, in order of their dimensions.
+        """
+        return [self._syndromes[self._basis_vectors[i]] for i in sorted(self._basis_vectors.keys())
+                if self._basis_vectors[i] in self._syndromes]
+
+    def get_column_syndromes(self) -> list[int]:
+        """
+        Return the packed syndrome of each unit vector, for positions from left to right.
+        The syndrome map extends linearly from the basis vectors: s(e_i) = s(b_i) + s(b_i + e_i),
+        where b_i + e_i only involves lower dimensions.
+        A dimension that is no pattern's highest dimension is free: whatever its column, the syndromes
+        of the patterns in T stay as assigned, so it gets the zero column.
+        """
+        unit_syndromes = [0] * self.n # Indexed by dimension (right to left)
+        for i in range(self.n):
+            if i not in self._basis_vectors:
+                continue
+            basis_vector = self._basis_vectors[i]
+            syndrome = self._syndromes[basis_vector]
+            lower = basis_vector ^ (1 << i)
+            while lower:
+                lowest_bit = lower & -lower
+                syndrome ^= unit_syndromes[lowest_bit.bit_length() - 1]
+                lower ^= lowest_bit
+            unit_syndromes[i] = syndrome
+        return unit_syndromes[::-1]
 
     def get_basis_map_list(self) -> list[list[list[int]]]:
         """
@@ -118,30 +847,76 @@ class GreedySyndromeMapper:
         output = []
         for i in sorted(self._basis_vectors.keys()):
             basis_v = self._basis_vectors[i]
-            syndrome = self.syndrome_map.get(basis_v, None) # Use .get to avoid errors
+            syndrome = self._syndromes.get(basis_v, None) # Use .get to avoid errors
             if syndrome is not None:
-                output.append([list(basis_v), list(syndrome)])
+                output.append([list(_unpack(basis_v, self.n)), list(_unpack(syndrome, self.n))])
         return output
 
+    def get_syndrome_arrays(self, basis_only: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return (vectors, syndromes) as (m, n) uint8 matrices sorted by vector, for the full mapping
+        or only the basis vectors. Built straight from the packed state, without tuples.
+        """
+        if basis_only:
+            vectors = [self._basis_vectors[i] for i in sorted(self._basis_vectors.keys())
+                       if self._basis_vectors[i] in self._syndromes]
+        else:
+            vectors = sorted(self._syndromes)
+        syndromes = [self._syndromes[v] for v in vectors]
+        return packed_to_matrix(vectors, self.n), packed_to_matrix(syndromes, self.n)
+
+    def export(self, file, content: str = "full", fmt: str = "npz") -> None:
+        """
+        Write the full mapping ("full"), the basis mapping ("basis"), the parity check matrix ("parity")
+        or all of them ("all", npz only) to a path or binary file object in one of EXPORT_FORMATS.
+        """
+        if content == "all":
+            if fmt != "npz":
+                raise ValueError("Exporting all results at once requires the npz format.")
+            vectors, syndromes = self.get_syndrome_arrays()
+            basis_vectors, basis_syndromes = self.get_syndrome_arrays(basis_only=True)
+            export_arrays(file, fmt, vectors=vectors, syndromes=syndromes, basis_vectors=basis_vectors,
+                          basis_syndromes=basis_syndromes, parity_check_matrix=self.get_parity_check_matrix())
+        elif content in ("full", "basis"):
+            vectors, syndromes = self.get_syndrome_arrays(basis_only=content == "basis")
+            export_arrays(file, fmt, vectors=vectors, syndromes=syndromes)
+        elif content == "parity":
+            matrix = self.get_parity_check_matrix()
+            export_arrays(file, fmt, parity_check_matrix=matrix if matrix.ndim == 2 else matrix.reshape(0, 0))
+        else:
+            raise ValueError(f"Unknown export content {content!r}; expected full, basis, parity or all.")
+
     def get_parity_check_matrix(self) -> np.ndarray:
         """
         Generates the parity check matrix using only the syndromes corresponding to the basis vectors.
         Returns a numpy.ndarray.
         """
-        syndromes = []
-        for i in sorted(self._basis_vectors.keys()):
-            basis_v = self._basis_vectors[i]
-            syndrome = self.syndrome_map.get(basis_v, None)
-            if syndrome is not None:
-                syndromes.append(list(syndrome))
-        syndromes = syndromes[::-1]
+        import numpy as np
+
+        from linear_code import ParityCheckMatrix
+        syndromes = self._basis_syndromes()[::-1]
         if syndromes:
-            min_idx = min((next((i for i, v in enumerate(row) if v != 0), len(row)) for row in syndromes), default=0)
-            syndromes = [row[min_idx:] for row in syndromes]
-            matrix = np.array(syndromes).T
-            return matrix
+            # from_columns trims the rows that are zero in every syndrome
+            return ParityCheckMatrix.from_columns(syndromes).to_dense()
         return np.array([])
 
+    def get_parity_check(self) -> ParityCheckMatrix:
+        """
+        Return the bit-packed parity check matrix whose columns are the syndromes of the unit vectors,
+        so that H·v is the syndrome of v for every error pattern. It has the same columns as
+        get_parity_check_matrix() when every basis vector is a unit vector.
+        """
+        from linear_code import ParityCheckMatrix
+        return ParityCheckMatrix.from_columns(self.get_column_syndromes())
+
+    def get_generator_matrix(self) -> GeneratorMatrix:
+        """
+        Return a systematic generator matrix G of the code checked by get_parity_check(), so the
+        codewords it produces have a zero syndrome and decode to themselves with SyndromeDecoder.
+        """
+        from linear_code import GeneratorMatrix
+        return GeneratorMatrix.from_parity_check(self.get_parity_check())
+
 # --- Example ---
 if __name__ == '__main__':
     # Generate all nonzero binary vectors of length n=3 as T
@@ -184,4 +959,4 @@ if __name__ == '__main__':
         parity_matrix2 = mapper2.get_parity_check_matrix()
         print(parity_matrix2)
     except (ValueError, RuntimeError) as e:
-        print(f"[Example 2] Error: {e}")
\ No newline at end of file
+        print(f"[Example 2] Error: {e}")
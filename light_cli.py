@@ -0,0 +1,157 @@
+import argparse
+import ast
+import os
+import sys
+
+from greedy_syndrome_mapper import ConstructionStats, GreedySyndromeMapper
+
+# Lightweight entry point for shell pipelines that call the CLI many times on small codes.
+# It prints the same text as the mapping commands of main.py but loads neither Typer nor, unless
+# a parity check matrix or a pattern family is requested, NumPy:
+#   python light_cli.py basis-mapping --standard-basis 8
+
+# Codes with at most this many error patterns are rebuilt instead of read from the cache:
+# their construction takes a few milliseconds, less than loading NumPy to read a cache entry.
+SMALL_CODE_PATTERNS = 1024
+
+COMMANDS = {"full-syndrome-mapping": "full", "basis-mapping": "basis", "parity-check-matrix": "parity", "all-mapping": "all"}
+
+
+def read_patterns(error_patterns: str | None = None, file: str | None = None, standard_basis: int | None = None, family: str | None = None):
+    """
+    Error patterns from a literal list, a file with one pattern per line, the standard basis of
+    length standard_basis, or a generated family. Raises ValueError if none is given.
+    """
+    if error_patterns:
+        # Directly parse string to list[list[int]]
+        return ast.literal_eval(error_patterns)
+    elif file:
+        return read_pattern_file(file)
+    elif standard_basis is not None:
+        # Generate standard basis vectors
+        n = standard_basis
+        return [[int(i == j) for i in range(n)] for j in range(n)]
+    elif family:
+        # Generate a structured family directly as an (N, n) uint8 matrix
+        from pattern_generators import family_patterns
+        return family_patterns(family)
+    raise ValueError("Please provide --error-patterns, --file, --standard-basis, or --family.")
+
+
+# Binary and line formats written by --format, recognized by extension (see read_pattern_file)
+PATTERN_FILE_FORMATS = {".npy": "npy", ".npz": "npz", ".lines": "lines", ".bin": "packbits", ".packbits": "packbits"}
+
+
+def read_pattern_file(path: str):
+    """
+    Error patterns from a file, in the format given by its extension:
+
+    - .npy: an (N, n) 0/1 matrix (or the (N, 2, n) full mapping export, whose vectors are used)
+    - .npz: the "vectors" entry of a mapping export, or the archive's only matrix
+    - .lines: one bit string per line (the first column of a lines export)
+    - .bin / .packbits: np.packbits rows of ceil(n / 8) bytes; n is given as a suffix, e.g. patterns.bin:20
+    - anything else: one Python literal per line, e.g. [1, 0, 0]
+
+    The binary and line formats are read in bulk with NumPy and returned as an (N, n) uint8 matrix.
+    """
+    file, _, width = path.rpartition(":")
+    if not (file and width.isdigit()):
+        file, width = path, None
+    fmt = PATTERN_FILE_FORMATS.get(os.path.splitext(file)[1].lower())
+    if fmt is None:
+        if width is not None:
+            raise ValueError(f"Only packbits files (.bin, .packbits) take a :n suffix: {path}")
+        # Read patterns from file, one pattern per line
+        with open(file, 'r') as f:
+            lines = f.readlines()
+            return [ast.literal_eval(line.strip()) for line in lines if line.strip()]
+    import numpy as np
+    if fmt == "packbits":
+        if width is None or int(width) == 0:
+            raise ValueError(f"Packbits rows do not record the vector length; give it as {file}:n.")
+        n = int(width)
+        data = np.fromfile(file, dtype=np.uint8)
+        if data.size % ((n + 7) // 8):
+            raise ValueError(f"{file} is not a whole number of {(n + 7) // 8}-byte rows.")
+        return np.unpackbits(data.reshape(-1, (n + 7) // 8), axis=1, count=n)
+    if width is not None:
+        raise ValueError(f"Only packbits files (.bin, .packbits) take a :n suffix: {path}")
+    if fmt == "lines":
+        with open(file, "rb") as f:
+            tokens = [line.split()[0] for line in f if line.strip()]
+        if not tokens or any(len(token) != len(tokens[0]) for token in tokens):
+            raise ValueError(f"{file} must hold bit strings of one length, one per line.")
+        matrix = np.frombuffer(b"".join(tokens), dtype=np.uint8).reshape(len(tokens), -1) - np.uint8(ord("0"))
+    elif fmt == "npz":
+        with np.load(file) as archive:
+            if "vectors" in archive:
+                matrix = archive["vectors"]
+            elif len(archive.files) == 1:
+                matrix = archive[archive.files[0]]
+            else:
+                raise ValueError(f"{file} has no 'vectors' entry and more than one array.")
+    else:
+        matrix = np.load(file)
+        if matrix.ndim == 3: # Full mapping export: vectors and syndromes stacked along axis 1
+            matrix = matrix[:, 0]
+    if matrix.ndim != 2 or ((matrix != 0) & (matrix != 1)).any():
+        raise ValueError(f"{file} must hold an (N, n) matrix of 0/1 entries.")
+    return matrix.astype(np.uint8, copy=False)
+
+
+def build_mapper(error_patterns, cache: bool = True, stats: bool = False, max_redundancy: int | None = None) -> GreedySyndromeMapper:
+    if stats:
+        # Statistics describe a fresh construction, so the cache is skipped
+        construction_stats = ConstructionStats()
+        try:
+            return GreedySyndromeMapper(error_patterns, stats=construction_stats, max_redundancy=max_redundancy)
+        finally:
+            print(construction_stats.format_table(), file=sys.stderr)
+    # Reuse a previously constructed code from the on-disk cache when possible
+    if cache and len(error_patterns) > SMALL_CODE_PATTERNS:
+        from code_cache import CodeCache
+        return CodeCache().get_or_build(error_patterns, max_redundancy)
+    return GreedySyndromeMapper(error_patterns, max_redundancy=max_redundancy)
+
+
+def print_mappings(mapper: GreedySyndromeMapper, content: str) -> None:
+    """
+    Print the text output of a mapping command: "full", "basis", "parity" or "all".
+    """
+    sections = []
+    if content in ("full", "all"):
+        sections.append(("Full syndrome mapping (vector -> syndrome):",
+                         [f"  {vector} -> {syndrome}" for vector, syndrome in sorted(mapper.syndrome_map.items())]))
+    if content in ("basis", "all"):
+        sections.append(("Basis mapping in original format:",
+                         [f"  {basis_v} -> {syndrome_v}" for basis_v, syndrome_v in mapper.get_basis_map_list()]))
+    if content in ("parity", "all"):
+        sections.append(("Parity check matrix:", [str(mapper.get_parity_check_matrix())]))
+    for k, (title, lines) in enumerate(sections):
+        print(("\n" if k else "") + title)
+        for line in lines:
+            print(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="light_cli.py", description="Print the mappings of a code without loading Typer.")
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("--error-patterns")
+    parser.add_argument("--file", help="Pattern file: one literal per line, or .npy, .npz, .lines, or .bin:n packbits.")
+    parser.add_argument("--standard-basis", type=int)
+    parser.add_argument("--family", help="Generated pattern family as name:n:parameter (loads NumPy).")
+    parser.add_argument("--max-redundancy", type=int, help="Fail if the code needs more than this many check bits.")
+    parser.add_argument("--no-cache", dest="cache", action="store_false", help="Always rebuild large codes.")
+    args = parser.parse_args(argv)
+    try:
+        patterns = read_patterns(args.error_patterns, args.file, args.standard_basis, args.family)
+        mapper = build_mapper(patterns, args.cache, max_redundancy=args.max_redundancy)
+    except (ValueError, SyntaxError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print_mappings(mapper, COMMANDS[args.command])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+_CHUNK_ELEMENTS = 1 << 22 # Upper bound on words x rows per XOR kernel pass
+
+
+def _n_words(n: int) -> int:
+    return (n + 63) // 64
+
+
+def pack_words(bits: np.ndarray) -> np.ndarray:
+    """
+    Pack an (N, n) 0/1 matrix into an (N, ceil(n/64)) uint64 matrix. Position j is bit 63 - j % 64
+    of word j // 64, so each row reads left to right like np.packbits output.
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    return packbits_to_words(np.packbits(bits, axis=1), bits.shape[1])
+
+
+def packbits_to_words(packed: np.ndarray, n: int) -> np.ndarray:
+    """
+    Convert np.packbits rows (N, ceil(n/8)) into the uint64 word layout of pack_words.
+    """
+    packed = np.asarray(packed, dtype=np.uint8).reshape(-1, (n + 7) // 8)
+    padded = np.zeros((len(packed), _n_words(n) * 8), dtype=np.uint8)
+    padded[:, :packed.shape[1]] = packed
+    return padded.view(">u8").astype(np.uint64)
+
+
+def words_to_packbits(words: np.ndarray, n: int) -> np.ndarray:
+    """
+    Inverse of packbits_to_words.
+    """
+    as_bytes = np.ascontiguousarray(words, dtype=np.uint64).astype(">u8").view(np.uint8)
+    return as_bytes.reshape(len(words), -1)[:, :(n + 7) // 8]
+
+
+def unpack_words(words: np.ndarray, n: int) -> np.ndarray:
+    """
+    Inverse of pack_words: an (N, n) uint8 matrix.
+    """
+    return np.unpackbits(words_to_packbits(words, n), axis=1, count=n)
+
+
+@dataclass
+class StreamStats:
+    """
+    Counters reported by SyndromeDecoder.decode_file and GeneratorMatrix.encode_file.
+    """
+    words: int
+    uncorrectable: int
+    n_bytes: int
+    seconds: float
+
+    @property
+    def words_per_second(self) -> float:
+        return self.words / self.seconds if self.seconds > 0 else float("inf")
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.words * self.n_bytes / 1e6 / self.seconds if self.seconds > 0 else float("inf")
+
+
+class ParityCheckMatrix:
+    """
+    Parity check matrix H over GF(2), stored as rows of packed uint64 words (see pack_words).
+
+    Syndromes of whole batches are computed by ANDing each received word with every row, XOR-folding
+    the words of a row together and taking the parity of the popcount. Rank and systematic form use
+    Gaussian elimination on the packed rows.
+    """
+    def __init__(self, rows: np.ndarray, n: int) -> None:
+        self.rows = np.ascontiguousarray(rows, dtype=np.uint64).reshape(-1, _n_words(n))
+        self.n = n
+
+    @classmethod
+    def from_dense(cls, matrix) -> "ParityCheckMatrix":
+        matrix = np.asarray(matrix)
+        if matrix.ndim != 2:
+            raise ValueError("A parity check matrix must be two-dimensional.")
+        return cls(pack_words(matrix & 1), matrix.shape[1])
+
+    @classmethod
+    def from_columns(cls, column_syndromes: list[int], r: int | None = None) -> "ParityCheckMatrix":
+        """
+        Build H from packed column syndromes, whose most significant of r bits is row 0.
+        r defaults to the widest syndrome, which trims rows that are zero in every column.
+        """
+        if r is None:
+            r = max((int(s).bit_length() for s in column_syndromes), default=0)
+        if r <= 64:
+            columns = np.asarray(column_syndromes, dtype=np.uint64).reshape(-1)
+            shifts = np.arange(r - 1, -1, -1, dtype=np.uint64)
+            dense = ((columns[None, :] >> shifts[:, None]) & np.uint64(1)).astype(np.uint8)
+        else:
+            dense = np.array([[(int(s) >> (r - 1 - i)) & 1 for s in column_syndromes] for i in range(r)],
+                             dtype=np.uint8).reshape(r, len(column_syndromes))
+        return cls.from_dense(dense)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.rows), self.n
+
+    def to_dense(self) -> np.ndarray:
+        """
+        The matrix as a dense (r, n) int64 array, as returned by get_parity_check_matrix.
+        """
+        return unpack_words(self.rows, self.n).astype(np.int_)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ParityCheckMatrix):
+            return NotImplemented
+        return self.n == other.n and self.rows.shape == other.rows.shape and bool((self.rows == other.rows).all())
+
+    def __repr__(self) -> str:
+        return f"ParityCheckMatrix(shape={self.shape})"
+
+    def _as_words(self, words, packed: bool) -> np.ndarray:
+        if packed:
+            if isinstance(words, (bytes, bytearray, memoryview)):
+                words = np.frombuffer(words, dtype=np.uint8)
+            return packbits_to_words(words, self.n)
+        words = np.asarray(words, dtype=np.uint8)
+        if words.ndim != 2 or words.shape[1] != self.n:
+            raise ValueError(f"Expected an (N, {self.n}) array of words, got shape {words.shape}.")
+        return pack_words(words)
+
+    def syndrome_bits(self, words, packed: bool = False) -> np.ndarray:
+        """
+        H·x over GF(2) for every word, as an (N, r) uint8 matrix.
+        Words are an (N, n) 0/1 array, or np.packbits rows (or bytes) when packed.
+        """
+        words = self._as_words(words, packed)
+        r = len(self.rows)
+        out = np.empty((len(words), r), dtype=np.uint8)
+        chunk = max(1, _CHUNK_ELEMENTS // max(1, r))
+        for first in range(0, len(words), chunk):
+            block = words[first:first + chunk]
+            folded = np.zeros((len(block), r), dtype=np.uint64)
+            for w in range(self.rows.shape[1]):
+                folded ^= block[:, w, None] & self.rows[None, :, w]
+            out[first:first + chunk] = np.bitwise_count(folded) & 1
+        return out
+
+    def syndromes(self, words, packed: bool = False) -> np.ndarray:
+        """
+        H·x for every word as a uint64 packed syndrome, row 0 being the most significant bit (r <= 64).
+        """
+        r = len(self.rows)
+        if r > 64:
+            raise ValueError("Packed syndromes need r <= 64; use syndrome_bits.")
+        bits = self.syndrome_bits(words, packed).astype(np.uint64)
+        return (bits << np.arange(r - 1, -1, -1, dtype=np.uint64)).sum(axis=1, dtype=np.uint64)
+
+    def __matmul__(self, x) -> np.ndarray:
+        """
+        (H @ x) % 2 for a 0/1 vector of length n or an (n, N) matrix.
+        """
+        x = np.asarray(x)
+        if x.ndim == 1:
+            return self.syndrome_bits(x[None, :])[0]
+        return self.syndrome_bits(x.T).T
+
+    def _reduce(self) -> tuple[np.ndarray, list[int]]:
+        """
+        Reduced row echelon form of the packed rows with pivots chosen from the rightmost columns.
+        Returns the nonzero reduced rows and their pivot columns.
+        """
+        rows = self.rows.copy()
+        pivots = []
+        rank = 0
+        for column in range(self.n - 1, -1, -1):
+            if rank == len(rows):
+                break
+            word, shift = column // 64, np.uint64(63 - column % 64)
+            has_bit = ((rows[rank:, word] >> shift) & np.uint64(1)).astype(bool)
+            candidates = np.flatnonzero(has_bit)
+            if candidates.size == 0:
+                continue
+            pivot = rank + int(candidates[0])
+            rows[[rank, pivot]] = rows[[pivot, rank]]
+            eliminate = ((rows[:, word] >> shift) & np.uint64(1)).astype(bool)
+            eliminate[rank] = False
+            rows[eliminate] ^= rows[rank]
+            pivots.append(column)
+            rank += 1
+        return rows[:rank], pivots
+
+    def rank(self) -> int:
+        return len(self._reduce()[1])
+
+    def systematic_form(self) -> tuple["ParityCheckMatrix", np.ndarray]:
+        """
+        Return (Hs, permutation): Hs = [A | I] has one row per independent row of H, and column j of Hs
+        is column permutation[j] of H. Row operations do not change the code, so Hs·x[permutation] = 0
+        exactly when H·x = 0.
+        """
+        reduced, pivots = self._reduce()
+        pivot_set = set(pivots)
+        # Information columns keep their order; pivot i of the reduced rows goes to position k + i
+        permutation = np.array([c for c in range(self.n) if c not in pivot_set] + pivots, dtype=np.intp)
+        dense = unpack_words(reduced, self.n)[:, permutation]
+        return ParityCheckMatrix.from_dense(dense), permutation
+
+    def generator_matrix(self) -> np.ndarray:
+        """
+        A systematic generator matrix G (k x n, dense uint8) of the code {x : H·x = 0}, with k = n - rank.
+        The message bits appear unchanged at the information columns (those not used as pivots),
+        and G·H^T = 0.
+        """
+        return self._generator_from_systematic(*self.systematic_form())
+
+    def _generator_from_systematic(self, systematic: "ParityCheckMatrix", permutation: np.ndarray) -> np.ndarray:
+        k = self.n - len(systematic.rows)
+        parity_part = unpack_words(systematic.rows, self.n)[:, :k] # A in Hs = [A | I]
+        generator = np.zeros((k, self.n), dtype=np.uint8)
+        generator[:, permutation[:k]] = np.eye(k, dtype=np.uint8)
+        generator[:, permutation[k:]] = parity_part.T
+        return generator
+
+
+class GeneratorMatrix:
+    """
+    Systematic generator matrix G (k x n) over GF(2), stored as rows of packed uint64 words.
+    Message bit i appears unchanged at codeword position information_positions[i].
+
+    Batches are encoded like SyndromeDecoder decodes: for every byte of the packed messages a
+    256-entry table holds the XOR of the rows selected by that byte, so a codeword costs
+    ceil(k / 8) table lookups and word XORs instead of k row additions.
+    """
+    def __init__(self, rows: np.ndarray, n: int, information_positions) -> None:
+        self.rows = np.ascontiguousarray(rows, dtype=np.uint64).reshape(-1, _n_words(n))
+        self.n = n
+        self.k = len(self.rows)
+        self.information_positions = np.asarray(information_positions, dtype=np.intp)
+        self.n_bytes = (n + 7) // 8
+        self.k_bytes = (self.k + 7) // 8
+        self._tables = self._build_tables()
+
+    @classmethod
+    def from_parity_check(cls, parity_check: ParityCheckMatrix) -> "GeneratorMatrix":
+        """
+        The systematic generator matrix of the code {x : H·x = 0}.
+        """
+        systematic, permutation = parity_check.systematic_form()
+        k = parity_check.n - len(systematic.rows)
+        # One elimination serves both G and its information positions
+        generator = parity_check._generator_from_systematic(systematic, permutation)
+        return cls(pack_words(generator), parity_check.n, np.sort(permutation[:k]))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.k, self.n
+
+    def to_dense(self) -> np.ndarray:
+        return unpack_words(self.rows, self.n)
+
+    def __repr__(self) -> str:
+        return f"GeneratorMatrix(shape={self.shape})"
+
+    def _build_tables(self) -> np.ndarray:
+        # tables[b, v] = XOR of rows 8b + t for every bit t of v that is set (bit 7 is t = 0)
+        tables = np.zeros((self.k_bytes, 256, self.rows.shape[1]), dtype=np.uint64)
+        values = np.arange(256)
+        for b in range(self.k_bytes):
+            for t in range(min(8, self.k - 8 * b)):
+                selected = ((values >> (7 - t)) & 1).astype(bool)
+                tables[b, selected] ^= self.rows[8 * b + t]
+        return tables
+
+    def _as_packed_messages(self, messages, packed: bool) -> np.ndarray:
+        if packed:
+            if isinstance(messages, (bytes, bytearray, memoryview)):
+                messages = np.frombuffer(messages, dtype=np.uint8)
+            return np.asarray(messages, dtype=np.uint8).reshape(-1, self.k_bytes)
+        messages = np.asarray(messages, dtype=np.uint8)
+        if messages.ndim != 2 or messages.shape[1] != self.k:
+            raise ValueError(f"Expected an (N, {self.k}) array of messages, got shape {messages.shape}.")
+        return np.packbits(messages, axis=1)
+
+    def _encode_packed(self, messages: np.ndarray) -> np.ndarray:
+        codewords = np.zeros((len(messages), self.rows.shape[1]), dtype=np.uint64)
+        for b in range(self.k_bytes):
+            codewords ^= self._tables[b, messages[:, b]]
+        return words_to_packbits(codewords, self.n)
+
+    def encode_batch(self, messages, packed: bool = False) -> np.ndarray:
+        """
+        Encode an (N, k) 0/1 message array into an (N, n) uint8 codeword array.
+        With packed, messages are np.packbits rows (N, ceil(k/8)) or their bytes, and the
+        codewords come back as np.packbits rows (N, ceil(n/8)).
+        """
+        codewords = self._encode_packed(self._as_packed_messages(messages, packed))
+        return codewords if packed else np.unpackbits(codewords, axis=1, count=self.n)
+
+    def extract_messages(self, codewords) -> np.ndarray:
+        """
+        The message bits of (N, n) 0/1 codewords, read from the information positions.
+        """
+        return np.asarray(codewords, dtype=np.uint8)[:, self.information_positions]
+
+    def encode_file(self, input_path: str, output_path: str, chunk_words: int = 1 << 20) -> StreamStats:
+        """
+        Encode a binary file of packed messages (ceil(k / 8) bytes per message, np.packbits layout)
+        into output_path as packed codewords (ceil(n / 8) bytes each). The input is memory-mapped
+        and processed chunk_words messages at a time.
+        """
+        if chunk_words <= 0:
+            raise ValueError("chunk_words must be positive.")
+        if self.k == 0:
+            raise ValueError("The code has no information bits to encode.")
+        size = os.path.getsize(input_path)
+        if size % self.k_bytes:
+            raise ValueError(f"{input_path} holds {size} bytes, which is not a whole number of {self.k_bytes}-byte messages.")
+        total_words = size // self.k_bytes
+        start = time.perf_counter()
+        with open(output_path, "wb") as out:
+            if total_words:
+                messages = np.memmap(input_path, dtype=np.uint8, mode="r", shape=(total_words, self.k_bytes))
+                for first in range(0, total_words, chunk_words):
+                    out.write(self._encode_packed(messages[first:first + chunk_words]).tobytes())
+                del messages
+        return StreamStats(total_words, 0, self.n_bytes, time.perf_counter() - start)
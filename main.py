@@ -1,87 +1,346 @@
-import ast
+import contextlib
 import sys
 import shlex
 
 import typer
 
-from greedy_syndrome_mapper import GreedySyndromeMapper
+from greedy_syndrome_mapper import EXPORT_FORMATS, GreedySyndromeMapper
+from light_cli import build_mapper, print_mappings, read_patterns
+
+# NumPy and the cache, search, decoder and service modules are imported by the commands that use them,
+# so printing the mappings of a small code starts without loading NumPy. light_cli.py is a lighter
+# entry point still, for the mapping commands, that does not load Typer either.
 
 app = typer.Typer()
 
-def load_patterns(error_patterns: str = None, file: str = None, standard_basis: int = None):
-    if error_patterns:
-        # Directly parse string to list[list[int]]
-        return ast.literal_eval(error_patterns)
-    elif file:
-        # Read patterns from file, one pattern per line
-        with open(file, 'r') as f:
-            lines = f.readlines()
-            return [ast.literal_eval(line.strip()) for line in lines if line.strip()]
-    elif standard_basis is not None:
-        # Generate standard basis vectors
-        n = standard_basis
-        return [[int(i == j) for i in range(n)] for j in range(n)]
-    else:
-        raise typer.BadParameter("Please provide --error-patterns, --file, or --standard-basis.")
+# Same defaults as code_service, which is only imported by the serve command
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+FAMILY_HELP = "Generated pattern family as name:n:parameter, e.g. weight:64:3, burst:32:4 or cyclic-burst:32:4."
+FILE_HELP = ("Pattern file: one literal per line, or by extension .npy, .npz, .lines, or .bin/.packbits "
+             "with the vector length as a suffix (patterns.bin:20).")
+CACHE_OPTION = typer.Option(True, help="Reuse constructed codes from the on-disk cache.")
+FORMAT_OPTION = typer.Option("text", "--format", help=f"Output format: text, {', '.join(EXPORT_FORMATS)}.")
+OUTPUT_OPTION = typer.Option(None, help="Write the result to this file instead of stdout.")
+STATS_OPTION = typer.Option(False, "--stats", help="Print per-dimension construction statistics to stderr (bypasses the cache).")
+MAX_REDUNDANCY_OPTION = typer.Option(None, help="Fail if the code needs more than this many check bits.")
+
+def load_patterns(error_patterns: str | None = None, file: str | None = None, standard_basis: int | None = None, family: str | None = None):
+    try:
+        return read_patterns(error_patterns, file, standard_basis, family)
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from None
+
+
+@contextlib.contextmanager
+def text_output(output: str | None = None):
+    # Send printed text to output when given, otherwise leave it on stdout
+    if output is None:
+        yield
+        return
+    with open(output, "w") as f, contextlib.redirect_stdout(f):
+        yield
+
+
+def export_result(mapper: GreedySyndromeMapper, content: str, fmt: str, output: str | None = None):
+    # Binary formats are written in bulk, to output or to the raw stdout buffer
+    try:
+        if output is None:
+            mapper.export(sys.stdout.buffer, content, fmt)
+            sys.stdout.buffer.flush()
+        else:
+            mapper.export(output, content, fmt)
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from None
 
 
 @app.command()
-def full_syndrome_mapping(error_patterns: str = typer.Option(None), file: str = typer.Option(None), standard_basis: int = typer.Option(None)):
+def full_syndrome_mapping(error_patterns: str = typer.Option(None), file: str = typer.Option(None, help=FILE_HELP), standard_basis: int = typer.Option(None),
+                          family: str = typer.Option(None, help=FAMILY_HELP), cache: bool = CACHE_OPTION,
+                          fmt: str = FORMAT_OPTION, output: str = OUTPUT_OPTION, stats: bool = STATS_OPTION,
+                          max_redundancy: int = MAX_REDUNDANCY_OPTION):
     """
     Print full syndrome mapping for error patterns (from error_patterns, file, or standard_basis).
     """
-    loaded_error_patterns = load_patterns(error_patterns, file, standard_basis)
-    mapper = GreedySyndromeMapper(loaded_error_patterns)
-    print("Full syndrome mapping (vector -> syndrome):")
-    for vector, syndrome in sorted(mapper.syndrome_map.items()):
-        print(f"  {vector} -> {syndrome}")
+    loaded_error_patterns = load_patterns(error_patterns, file, standard_basis, family)
+    mapper = build_mapper(loaded_error_patterns, cache, stats, max_redundancy)
+    if fmt != "text":
+        export_result(mapper, "full", fmt, output)
+        return
+    with text_output(output):
+        print_mappings(mapper, "full")
 
 @app.command()
-def basis_mapping(error_patterns: str = typer.Option(None), file: str = typer.Option(None), standard_basis: int = typer.Option(None)):
+def basis_mapping(error_patterns: str = typer.Option(None), file: str = typer.Option(None, help=FILE_HELP), standard_basis: int = typer.Option(None),
+                  family: str = typer.Option(None, help=FAMILY_HELP), cache: bool = CACHE_OPTION,
+                  fmt: str = FORMAT_OPTION, output: str = OUTPUT_OPTION, stats: bool = STATS_OPTION,
+                  max_redundancy: int = MAX_REDUNDANCY_OPTION):
     """
     Print basis mapping for error patterns (from error_patterns, file, or standard_basis).
     """
-    loaded_error_patterns = load_patterns(error_patterns, file, standard_basis)
-    mapper = GreedySyndromeMapper(loaded_error_patterns)
-    print("Basis mapping in original format:")
-    basis_map = mapper.get_basis_map_list()
-    for basis_v, syndrome_v in basis_map:
-        print(f"  {basis_v} -> {syndrome_v}")
+    loaded_error_patterns = load_patterns(error_patterns, file, standard_basis, family)
+    mapper = build_mapper(loaded_error_patterns, cache, stats, max_redundancy)
+    if fmt != "text":
+        export_result(mapper, "basis", fmt, output)
+        return
+    with text_output(output):
+        print_mappings(mapper, "basis")
 
 @app.command()
-def parity_check_matrix(error_patterns: str = typer.Option(None), file: str = typer.Option(None), standard_basis: int = typer.Option(None)):
+def parity_check_matrix(error_patterns: str = typer.Option(None), file: str = typer.Option(None, help=FILE_HELP), standard_basis: int = typer.Option(None),
+                        family: str = typer.Option(None, help=FAMILY_HELP), cache: bool = CACHE_OPTION,
+                        fmt: str = FORMAT_OPTION, output: str = OUTPUT_OPTION, stats: bool = STATS_OPTION,
+                        max_redundancy: int = MAX_REDUNDANCY_OPTION):
     """
     Print parity check matrix for error patterns (from error_patterns, file, or standard_basis).
     """
-    loaded_error_patterns = load_patterns(error_patterns, file, standard_basis)
-    mapper = GreedySyndromeMapper(loaded_error_patterns)
-    print("Parity check matrix:")
-    matrix = mapper.get_parity_check_matrix()
-    print(matrix)
+    loaded_error_patterns = load_patterns(error_patterns, file, standard_basis, family)
+    mapper = build_mapper(loaded_error_patterns, cache, stats, max_redundancy)
+    if fmt != "text":
+        export_result(mapper, "parity", fmt, output)
+        return
+    with text_output(output):
+        print_mappings(mapper, "parity")
 
 
 # Create a command that combines all three functionalities
 @app.command()
-def all_mapping(error_patterns: str = typer.Option(None), file: str = typer.Option(None), standard_basis: int = typer.Option(None)):
+def all_mapping(error_patterns: str = typer.Option(None), file: str = typer.Option(None, help=FILE_HELP), standard_basis: int = typer.Option(None),
+                family: str = typer.Option(None, help=FAMILY_HELP), cache: bool = CACHE_OPTION,
+                fmt: str = FORMAT_OPTION, output: str = OUTPUT_OPTION, stats: bool = STATS_OPTION,
+                max_redundancy: int = MAX_REDUNDANCY_OPTION):
     """
     Print all mappings: full syndrome mapping, basis mapping, and parity check matrix.
     """
-    loaded_error_patterns = load_patterns(error_patterns, file, standard_basis)
-    mapper = GreedySyndromeMapper(loaded_error_patterns)
-    print("Full syndrome mapping (vector -> syndrome):")
-    for vector, syndrome in sorted(mapper.syndrome_map.items()):
-        print(f"  {vector} -> {syndrome}")
-    print("\nBasis mapping in original format:")
-    basis_map = mapper.get_basis_map_list()
-    for basis_v, syndrome_v in basis_map:
-        print(f"  {basis_v} -> {syndrome_v}")
-    print("\nParity check matrix:")
-    matrix = mapper.get_parity_check_matrix()
-    print(matrix)
+    loaded_error_patterns = load_patterns(error_patterns, file, standard_basis, family)
+    mapper = build_mapper(loaded_error_patterns, cache, stats, max_redundancy)
+    if fmt != "text":
+        export_result(mapper, "all", fmt, output)
+        return
+    with text_output(output):
+        print_mappings(mapper, "all")
+
+
+@app.command()
+def search_code(error_patterns: str = typer.Option(None), file: str = typer.Option(None, help=FILE_HELP), standard_basis: int = typer.Option(None),
+                family: str = typer.Option(None, help=FAMILY_HELP), variants: int = typer.Option(64, help="Number of construction variants to try."),
+                workers: int = typer.Option(None, help="Worker processes (default: all cores)."),
+                time_budget: float = typer.Option(None, help="Stop starting new work after this many seconds."),
+                seed: int = typer.Option(0), fmt: str = FORMAT_OPTION, output: str = OUTPUT_OPTION):
+    """
+    Search basis choices, syndrome tie-breaking and column permutations for the code with the fewest check rows.
+    """
+    from code_search import search_codes
+
+    loaded_error_patterns = load_patterns(error_patterns, file, standard_basis, family)
+    result = search_codes(loaded_error_patterns, variants, workers, time_budget, seed)
+    default = "failed" if result.default_redundancy is None else f"{result.default_redundancy} check bits"
+    print(f"Best variant: {result.variant.describe()}", file=sys.stderr)
+    print(f"{result.redundancy} check bits (default construction: {default}); "
+          f"{result.tried} variants finished, {result.failed} failed, in {result.seconds:.2f} s.", file=sys.stderr)
+    if fmt != "text":
+        export_result(result.mapper, "parity", fmt, output)
+        return
+    with text_output(output):
+        print("Parity check matrix:")
+        print(result.mapper.get_parity_check_matrix())
+
+
+@app.command()
+def construct(error_patterns: str = typer.Option(None), file: str = typer.Option(None, help=FILE_HELP), standard_basis: int = typer.Option(None),
+              family: str = typer.Option(None, help=FAMILY_HELP), max_redundancy: int = MAX_REDUNDANCY_OPTION,
+              checkpoint: str = typer.Option(None, help="Save the construction state to this file and resume from it if it exists."),
+              checkpoint_interval: float = typer.Option(60.0, help="Seconds between checkpoint saves."),
+              time_budget: float = typer.Option(None, help="Stop starting new dimensions after this many seconds (requires --checkpoint)."),
+              progress: bool = typer.Option(True, help="Print a line to stderr as each dimension finishes."),
+              cache: bool = typer.Option(True, help="Store the finished code in the on-disk cache for the other commands."),
+              output: str = typer.Option(None, help="Also write the finished code to this .npz file.")):
+    """
+    Run a long construction with checkpoints; exits with status 3 if the time budget ran out before it finished.
+    """
+    import time
+
+    from greedy_syndrome_mapper import ConstructionStats, pack_patterns
+
+    if time_budget is not None and checkpoint is None:
+        raise typer.BadParameter("--time-budget needs --checkpoint to keep the partial construction.")
+    loaded_error_patterns = load_patterns(error_patterns, file, standard_basis, family)
+    start = time.perf_counter()
+
+    def report(d):
+        result = d.failure if d.failure else f"syndrome {d.syndrome}"
+        print(f"dimension {d.dimension}/{n - 1}: {d.group_size} patterns, {result}, {d.pool_taken} syndromes taken "
+              f"({d.syndrome_bits} bits), {time.perf_counter() - start:.1f} s", file=sys.stderr, flush=True)
+
+    try:
+        unique_patterns, n = pack_patterns(loaded_error_patterns)
+        mapper = GreedySyndromeMapper.resumable(unique_patterns, checkpoint, time_budget, checkpoint_interval, n=n,
+                                                stats=ConstructionStats(report) if progress else None,
+                                                max_redundancy=max_redundancy)
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from None
+    pending = mapper.pending_dimensions
+    if pending:
+        print(f"Time budget reached with {len(pending)} dimensions left (next: {pending[0]}); "
+              f"rerun with --checkpoint {shlex.quote(checkpoint)} to resume.", file=sys.stderr)
+        raise typer.Exit(3)
+    print(f"n = {mapper.n}, |T| = {len(unique_patterns)}, r = {mapper.redundancy}, {time.perf_counter() - start:.2f} s")
+    if cache:
+        from code_cache import CodeCache
+        code_cache = CodeCache()
+        code_cache.store(code_cache.key(unique_patterns, n), mapper)
+    if output is not None:
+        mapper.export(output, "all", "npz")
+
+
+@app.command()
+def construct_many(path: str = typer.Argument(..., help="A directory with one pattern file (.txt or .npy) per set, or a multi-set file."),
+                   workers: int = typer.Option(None, help="Worker processes (default: all cores)."),
+                   max_redundancy: int = MAX_REDUNDANCY_OPTION, cache: bool = typer.Option(False, help="Read and store codes in the on-disk cache."),
+                   output_dir: str = typer.Option(None, help="Write each code to <name>.npz in this directory.")):
+    """
+    Construct codes for many error-pattern sets on a process pool, printing each result as it finishes.
+    """
+    import os
+
+    from code_batch import construct_many as run_batch, read_pattern_sets
+
+    try:
+        pattern_sets = read_pattern_sets(path)
+    except (OSError, ValueError, SyntaxError) as e:
+        raise typer.BadParameter(str(e)) from None
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    failed = 0
+    for result in run_batch(pattern_sets, workers, max_redundancy=max_redundancy, cache=cache):
+        if not result.ok:
+            failed += 1
+            print(f"{result.name}: failed after {result.seconds:.2f} s: {result.error}", flush=True)
+            continue
+        print(f"{result.name}: n = {result.n}, |T| = {result.patterns}, r = {result.redundancy}, {result.seconds:.2f} s", flush=True)
+        if output_dir is not None:
+            result.mapper().export(os.path.join(output_dir, f"{result.name}.npz"), "all", "npz")
+    print(f"{len(pattern_sets) - failed} of {len(pattern_sets)} codes constructed.", file=sys.stderr)
+    if failed:
+        raise typer.Exit(1)
+
+
+@app.command()
+def verify_code(error_patterns: str = typer.Option(None), file: str = typer.Option(None, help=FILE_HELP), standard_basis: int = typer.Option(None),
+                family: str = typer.Option(None, help=FAMILY_HELP), cache: bool = CACHE_OPTION,
+                distance: bool = typer.Option(True, help="Also compute the minimum distance (and weight distribution when feasible)."),
+                max_weight: int = typer.Option(None, help="Give up the minimum distance search above this weight."),
+                workers: int = typer.Option(None, help="Worker processes (default: all cores).")):
+    """
+    Check that the code corrects every error pattern and report its minimum distance; exits with status 1 on failure.
+    """
+    from code_analysis import verify_code as run_verification
+
+    loaded_error_patterns = load_patterns(error_patterns, file, standard_basis, family)
+    try:
+        report = run_verification(build_mapper(loaded_error_patterns, cache), workers, distance, max_weight)
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from None
+    print(report.format())
+    if not report.ok:
+        raise typer.Exit(1)
+
+
+@app.command()
+def simulate(error_patterns: str = typer.Option(None), file: str = typer.Option(None, help=FILE_HELP), standard_basis: int = typer.Option(None),
+             family: str = typer.Option(None, help=FAMILY_HELP), cache: bool = CACHE_OPTION,
+             channel: str = typer.Option("bsc", help="bsc, or burst:L for single bursts of length at most L."),
+             p: str = typer.Option("1e-3:1e-1:9", help="Channel parameters: a comma-separated list or log-spaced START:STOP:COUNT."),
+             seed: int = typer.Option(0), batch_words: int = typer.Option(1 << 16), max_words: int = typer.Option(1 << 24),
+             min_block_errors: int = typer.Option(100, help="Block errors needed before a point may stop."),
+             precision: float = typer.Option(0.1, help="Stop a point once the 95% CI half-width is within this fraction of the BLER."),
+             workers: int = typer.Option(None, help="Worker processes (default: all cores)."),
+             output: str = typer.Option(None, help="Also write the BER/BLER curve to this CSV file.")):
+    """
+    Estimate block and bit error rates of the code by Monte Carlo simulation over a range of channel parameters.
+    """
+    import csv
+
+    from channel_simulator import as_rows, format_points, parse_ps, simulate as run_simulation
+
+    loaded_error_patterns = load_patterns(error_patterns, file, standard_basis, family)
+    try:
+        ps = parse_ps(p)
+        points = run_simulation(build_mapper(loaded_error_patterns, cache), ps, channel, seed, batch_words,
+                                max_words, min_block_errors, precision, workers)
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from None
+    print(format_points(points))
+    if output is not None:
+        rows = as_rows(points)
+        with open(output, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["p"])
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+@app.command()
+def decode_stream(input_file: str = typer.Option(...), output_file: str = typer.Option(...),
+                  error_patterns: str = typer.Option(None), file: str = typer.Option(None, help=FILE_HELP), standard_basis: int = typer.Option(None),
+                  family: str = typer.Option(None, help=FAMILY_HELP), chunk_words: int = typer.Option(1 << 20), cache: bool = CACHE_OPTION):
+    """
+    Decode a binary file of packed received words (np.packbits layout, ceil(n/8) bytes per word) into output_file.
+    """
+    from syndrome_decoder import SyndromeDecoder
+
+    loaded_error_patterns = load_patterns(error_patterns, file, standard_basis, family)
+    decoder = SyndromeDecoder(build_mapper(loaded_error_patterns, cache))
+    try:
+        stats = decoder.decode_file(input_file, output_file, chunk_words=chunk_words)
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from None
+    print(f"Decoded {stats.words} words in {stats.seconds:.3f} s "
+          f"({stats.words_per_second:,.0f} words/s, {stats.mb_per_second:,.1f} MB/s).")
+    print(f"Uncorrectable syndromes: {stats.uncorrectable}")
+
+
+@app.command()
+def encode_stream(input_file: str = typer.Option(...), output_file: str = typer.Option(...),
+                  error_patterns: str = typer.Option(None), file: str = typer.Option(None, help=FILE_HELP), standard_basis: int = typer.Option(None),
+                  family: str = typer.Option(None, help=FAMILY_HELP), chunk_words: int = typer.Option(1 << 20), cache: bool = CACHE_OPTION):
+    """
+    Encode a binary file of packed messages (np.packbits layout, ceil(k/8) bytes per message) into packed codewords.
+    """
+    loaded_error_patterns = load_patterns(error_patterns, file, standard_basis, family)
+    generator = build_mapper(loaded_error_patterns, cache).get_generator_matrix()
+    print(f"Code: n = {generator.n}, k = {generator.k} ({generator.k_bytes} bytes per message, "
+          f"{generator.n_bytes} bytes per codeword)")
+    try:
+        stats = generator.encode_file(input_file, output_file, chunk_words=chunk_words)
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from None
+    print(f"Encoded {stats.words} messages in {stats.seconds:.3f} s "
+          f"({stats.words_per_second:,.0f} words/s, {stats.mb_per_second:,.1f} MB/s).")
+
+
+@app.command()
+def serve(host: str = typer.Option(DEFAULT_HOST), port: int = typer.Option(DEFAULT_PORT),
+          workers: int = typer.Option(None, help="Construction worker processes (default: all cores)."),
+          max_codes: int = typer.Option(128, help="Codes kept in memory."), cache: bool = CACHE_OPTION):
+    """
+    Run the HTTP/JSON service (construct, basis-map, parity-check-matrix, decode-batch) until interrupted.
+    """
+    import asyncio
+
+    import code_service
 
+    print(f"Serving on http://{host}:{port}", file=sys.stderr)
+    try:
+        asyncio.run(code_service.serve(host, port, workers, max_codes, cache))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # With arguments, run the command once and exit with its status, so the CLI can be used in shell pipelines
+        app()
     while True:
         if len(sys.argv) == 1:
             print("No command-line arguments detected.")
@@ -0,0 +1,121 @@
+import array
+import ctypes
+import os
+import sys
+
+ABI_VERSION = 2
+MAX_WIDTH = 64 # The native construction works on uint64 words
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(ROOT_DIR, "src_cpp")
+BUILD_DIR = os.path.join(SOURCE_DIR, "build")
+
+if sys.platform == "win32":
+    LIBRARY_NAME = "ltc_native.dll"
+elif sys.platform == "darwin":
+    LIBRARY_NAME = "libltc_native.dylib"
+else:
+    LIBRARY_NAME = "libltc_native.so"
+
+_library = None
+_load_attempted = False
+
+
+def _open(path: str) -> ctypes.CDLL | None:
+    try:
+        library = ctypes.CDLL(path)
+        if library.ltc_abi_version() != ABI_VERSION:
+            return None
+    except (OSError, AttributeError):
+        return None
+    library.ltc_construct.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p]
+    library.ltc_construct.restype = ctypes.c_int
+    return library
+
+
+def load(path: str | None = None) -> ctypes.CDLL | None:
+    """
+    Load the native library and make it the active backend; return None if it cannot be loaded.
+
+    Without a path, LTC_NATIVE_LIB is tried first, then the src_cpp/build directory. Only the
+    first automatic attempt touches the filesystem; pass a path to load a specific build.
+    """
+    global _library, _load_attempted
+    if path is None:
+        if _load_attempted:
+            return _library
+        _load_attempted = True
+        candidates = [os.environ.get("LTC_NATIVE_LIB"), os.path.join(BUILD_DIR, LIBRARY_NAME),
+                      os.path.join(BUILD_DIR, "Release", LIBRARY_NAME)]
+        for candidate in candidates:
+            if candidate and os.path.exists(candidate):
+                _library = _open(candidate)
+                if _library is not None:
+                    break
+        return _library
+    library = _open(path)
+    if library is not None:
+        _library = library
+        _load_attempted = True
+    return library
+
+
+def available() -> bool:
+    """
+    Whether constructions should use the native backend.
+
+    LTC_BACKEND selects it: "auto" (default) uses the library when it loads, "python" never does,
+    and "native" raises RuntimeError if the library is missing instead of silently falling back.
+    """
+    backend = os.environ.get("LTC_BACKEND", "auto")
+    if backend == "python":
+        return False
+    if load() is not None:
+        return True
+    if backend == "native":
+        raise RuntimeError(f"LTC_BACKEND=native, but {LIBRARY_NAME} could not be loaded; "
+                           f"build it with `python native_backend.py` or set LTC_NATIVE_LIB.")
+    return False
+
+
+def construct_packed(sorted_patterns: list[int], n: int, max_redundancy: int | None = None) -> tuple[list[int], int | None]:
+    """
+    Run the greedy construction natively on sorted, deduplicated packed patterns of length n <= 64,
+    with syndromes of at most max_redundancy bits (default n).
+    Return the syndrome of each pattern (0 for the zero vector and unassigned patterns) and
+    the dimension whose basis vector could not be assigned, or None on success.
+    """
+    library = load()
+    if library is None:
+        raise RuntimeError(f"{LIBRARY_NAME} is not loaded.")
+    # array.array buffers keep this path free of NumPy, which small CLI runs never need to import
+    patterns = array.array("Q", sorted_patterns)
+    syndromes = array.array("Q", bytes(8 * len(patterns)))
+    max_bits = n if max_redundancy is None else max_redundancy
+    status = library.ltc_construct(n, max_bits, patterns.buffer_info()[0], len(patterns), syndromes.buffer_info()[0])
+    if status < 0:
+        raise ValueError("The native backend rejected the error patterns.")
+    return syndromes.tolist(), (status - 1 if status else None)
+
+
+def build(output_dir: str = BUILD_DIR, compiler: str | None = None) -> str:
+    """
+    Compile the native library with a C++17 compiler and return its path.
+    Equivalent to `cmake --build build --target ltc_native` in src_cpp, without needing CMake.
+    """
+    import shutil
+    import subprocess
+
+    compiler = compiler or os.environ.get("CXX") or shutil.which("c++") or shutil.which("g++") or shutil.which("clang++")
+    if compiler is None:
+        raise RuntimeError("No C++ compiler found; set CXX or build with CMake.")
+    os.makedirs(output_dir, exist_ok=True)
+    output = os.path.join(output_dir, LIBRARY_NAME)
+    flags = ["-O3", "-std=c++17", "-shared", "-fPIC", "-fvisibility=hidden"]
+    subprocess.run([compiler, *flags, "-I", os.path.join(SOURCE_DIR, "include"),
+                    os.path.join(SOURCE_DIR, "src", "ltc_native.cpp"), "-o", output], check=True)
+    return output
+
+
+if __name__ == "__main__":
+    print(f"Built {build()}")
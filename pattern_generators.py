@@ -0,0 +1,102 @@
+import itertools
+from math import comb
+
+import numpy as np
+
+from greedy_syndrome_mapper import packed_to_matrix
+
+
+def _finish(values: list[int] | np.ndarray, n: int, packed: bool):
+    if isinstance(values, np.ndarray):
+        values = np.unique(values)
+        return [int(v) for v in values] if packed else packed_to_matrix(values, n)
+    values = sorted(set(values))
+    return values if packed else packed_to_matrix(values, n)
+
+
+def weight_patterns(n: int, max_weight: int, packed: bool = False):
+    """
+    All nonzero error patterns of length n with at most max_weight ones.
+    Returns a sorted list of packed ints if packed, otherwise an (N, n) uint8 matrix in the same order.
+    """
+    if n < 1 or max_weight < 1:
+        raise ValueError("n and max_weight must be positive.")
+    max_weight = min(max_weight, n)
+    if n <= 64:
+        bits = np.uint64(1) << np.arange(n, dtype=np.uint64)
+        chunks = []
+        for w in range(1, max_weight + 1):
+            positions = np.fromiter(itertools.chain.from_iterable(itertools.combinations(range(n), w)),
+                                    dtype=np.intp, count=comb(n, w) * w).reshape(-1, w)
+            chunks.append(np.bitwise_or.reduce(bits[positions], axis=1))
+        return _finish(np.concatenate(chunks), n, packed)
+    values = [sum(1 << p for p in positions)
+              for w in range(1, max_weight + 1) for positions in itertools.combinations(range(n), w)]
+    return _finish(values, n, packed)
+
+
+def _burst_seeds(max_length: int) -> list[int]:
+    # A burst of length l has ones at both ends of an l-bit window: odd values with bit_length <= max_length
+    return list(range(1, 1 << max_length, 2))
+
+
+def burst_patterns(n: int, max_length: int, packed: bool = False):
+    """
+    All nonzero error patterns of length n whose ones fit in a window of at most max_length positions.
+    Returns a sorted list of packed ints if packed, otherwise an (N, n) uint8 matrix in the same order.
+    """
+    if n < 1 or max_length < 1:
+        raise ValueError("n and max_length must be positive.")
+    max_length = min(max_length, n)
+    if n <= 64:
+        chunks = []
+        for length in range(1, max_length + 1):
+            seeds = np.arange((1 << (length - 1)) | 1, 1 << length, 2, dtype=np.uint64)
+            shifts = np.arange(n - length + 1, dtype=np.uint64)
+            chunks.append((seeds[:, None] << shifts[None, :]).reshape(-1))
+        return _finish(np.concatenate(chunks), n, packed)
+    values = [seed << shift for seed in _burst_seeds(max_length) for shift in range(n - seed.bit_length() + 1)]
+    return _finish(values, n, packed)
+
+
+def cyclic_burst_patterns(n: int, max_length: int, packed: bool = False):
+    """
+    All nonzero error patterns of length n whose ones fit in a cyclic (wrap-around) window of at most
+    max_length positions.
+    Returns a sorted list of packed ints if packed, otherwise an (N, n) uint8 matrix in the same order.
+    """
+    if n < 1 or max_length < 1:
+        raise ValueError("n and max_length must be positive.")
+    max_length = min(max_length, n)
+    mask = (1 << n) - 1
+    if n <= 64:
+        seeds = np.arange(1, 1 << max_length, 2, dtype=np.uint64)
+        full = np.uint64(mask)
+        chunks = [seeds]
+        for shift in range(1, n):
+            left = (seeds << np.uint64(shift)) & full
+            right = seeds >> np.uint64(n - shift)
+            chunks.append(left | right)
+        return _finish(np.concatenate(chunks), n, packed)
+    values = [((seed << shift) | (seed >> (n - shift))) & mask for seed in _burst_seeds(max_length) for shift in range(n)]
+    return _finish(values, n, packed)
+
+
+FAMILIES = {
+    "weight": weight_patterns,
+    "burst": burst_patterns,
+    "cyclic-burst": cyclic_burst_patterns,
+}
+
+
+def family_patterns(spec: str, packed: bool = False):
+    """
+    Generate a family from a "name:n:parameter" spec, e.g. "weight:64:3", "burst:32:4" or "cyclic-burst:32:4".
+    """
+    try:
+        name, n, parameter = spec.split(":")
+        generator = FAMILIES[name]
+        n, parameter = int(n), int(parameter)
+    except (KeyError, ValueError):
+        raise ValueError(f"Invalid pattern family {spec!r}; expected one of {', '.join(FAMILIES)} as name:n:parameter.") from None
+    return generator(n, parameter, packed=packed)
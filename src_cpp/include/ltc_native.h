@@ -0,0 +1,49 @@
+#ifndef LTC_NATIVE_H
+#define LTC_NATIVE_H
+
+#include <stddef.h>
+#include <stdint.h>
+
+/*
+ * C ABI of the packed greedy construction, loaded from Python with ctypes (see native_backend.py).
+ *
+ * Vectors and syndromes are packed into uint64 words with the leftmost entry as the most
+ * significant bit, exactly like the packed ints of greedy_syndrome_mapper.py, so n <= 64.
+ */
+
+#ifdef _WIN32
+#define LTC_API __declspec(dllexport)
+#else
+#define LTC_API __attribute__((visibility("default")))
+#endif
+
+#define LTC_ABI_VERSION 2
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/**
+ * @brief Version of this ABI, checked by the Python loader before using the library.
+ */
+LTC_API int ltc_abi_version(void);
+
+/**
+ * @brief Run the greedy construction on strictly increasing packed error patterns of length n.
+ * @param n Vector length, 1 <= n <= 64.
+ * @param max_bits Largest syndrome width to search, 1 <= max_bits <= n. Greedy syndromes are the
+ *        smallest that fit, so this only decides when to give up; the search itself tracks the
+ *        width actually in use.
+ * @param patterns Sorted, deduplicated packed error patterns (may start with the zero vector).
+ * @param count Number of patterns.
+ * @param syndromes Output array of count syndromes; 0 for the zero vector and for unassigned patterns.
+ * @return 0 on success, i + 1 if no syndrome could be found for the basis vector of dimension i,
+ *         or -1 if the arguments are invalid.
+ */
+LTC_API int ltc_construct(int n, int max_bits, const uint64_t* patterns, size_t count, uint64_t* syndromes);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif // LTC_NATIVE_H
@@ -0,0 +1,191 @@
+#include "ltc_native.h"
+
+#include <algorithm>
+#include <unordered_set>
+#include <vector>
+
+#ifdef _MSC_VER
+#include <intrin.h>
+#endif
+
+namespace {
+
+inline int count_trailing_zeros(uint64_t word) {
+#ifdef _MSC_VER
+    unsigned long index;
+    _BitScanForward64(&index, word);
+    return static_cast<int>(index);
+#else
+    return __builtin_ctzll(word);
+#endif
+}
+
+inline int highest_dim(uint64_t vector) {
+#ifdef _MSC_VER
+    unsigned long index;
+    _BitScanReverse64(&index, vector);
+    return static_cast<int>(index);
+#else
+    return 63 - __builtin_clzll(vector);
+#endif
+}
+
+/**
+ * @brief Set of taken syndromes of a fixed bit width.
+ *        Corresponds to Python's _SyndromePool: free syndromes are never stored.
+ *
+ * Greedy syndromes stay far below 2^n, so taken syndromes below 2^kMaxBitmapBits live in a
+ * dense bitmap that grows with the largest one seen; anything above goes to a hash set.
+ */
+class TakenSet {
+public:
+    explicit TakenSet(int width)
+        : limit_(width == 64 ? ~uint64_t(0) : (uint64_t(1) << width) - 1), words_(1, 0) {}
+
+    uint64_t limit() const { return limit_; }
+
+    bool available(uint64_t syndrome) const {
+        return syndrome != 0 && syndrome <= limit_ && !contains(syndrome);
+    }
+
+    void take(uint64_t syndrome) {
+        if (syndrome >= capacity() && syndrome < (uint64_t(1) << kMaxBitmapBits)) {
+            size_t words = words_.size();
+            while (uint64_t(words) * 64 <= syndrome) {
+                words *= 2;
+            }
+            words_.resize(words, 0);
+        }
+        if (syndrome < capacity()) {
+            words_[syndrome >> 6] |= uint64_t(1) << (syndrome & 63);
+        } else {
+            overflow_.insert(syndrome);
+        }
+    }
+
+    /**
+     * @brief Smallest available syndrome >= start, or 0 if there is none.
+     */
+    uint64_t next_free(uint64_t start) const {
+        uint64_t syndrome = std::max<uint64_t>(start, 1);
+        while (syndrome <= limit_) {
+            if (syndrome < capacity()) {
+                size_t word = syndrome >> 6;
+                uint64_t free_bits = ~words_[word] & (~uint64_t(0) << (syndrome & 63));
+                while (free_bits == 0 && ++word < words_.size()) {
+                    free_bits = ~words_[word];
+                }
+                if (free_bits != 0) {
+                    uint64_t found = (uint64_t(word) << 6) + count_trailing_zeros(free_bits);
+                    return found <= limit_ ? found : 0;
+                }
+                syndrome = capacity();
+                continue;
+            }
+            if (overflow_.count(syndrome) == 0) {
+                return syndrome;
+            }
+            if (syndrome == limit_) {
+                break;
+            }
+            ++syndrome;
+        }
+        return 0;
+    }
+
+private:
+    static constexpr int kMaxBitmapBits = 26;
+
+    uint64_t capacity() const { return uint64_t(words_.size()) * 64; }
+
+    bool contains(uint64_t syndrome) const {
+        if (syndrome < capacity()) {
+            return (words_[syndrome >> 6] >> (syndrome & 63)) & 1;
+        }
+        return overflow_.count(syndrome) != 0;
+    }
+
+    uint64_t limit_;
+    std::vector<uint64_t> words_;
+    std::unordered_set<uint64_t> overflow_;
+};
+
+/**
+ * @brief Smallest available syndrome s such that s ^ r is also available for every r in offsets, or 0.
+ *        Corresponds to Python's _SyndromePool.first_fit.
+ */
+uint64_t first_fit(const TakenSet& pool, const std::vector<uint64_t>& offsets) {
+    uint64_t candidate = pool.next_free(1);
+    while (candidate != 0) {
+        bool fits = true;
+        for (uint64_t offset : offsets) {
+            if (!pool.available(candidate ^ offset)) {
+                fits = false;
+                break;
+            }
+        }
+        if (fits) {
+            return candidate;
+        }
+        if (candidate == pool.limit()) {
+            break;
+        }
+        candidate = pool.next_free(candidate + 1);
+    }
+    return 0;
+}
+
+} // namespace
+
+int ltc_abi_version(void) {
+    return LTC_ABI_VERSION;
+}
+
+int ltc_construct(int n, int max_bits, const uint64_t* patterns, size_t count, uint64_t* syndromes) {
+    if (n < 1 || n > 64 || max_bits < 1 || max_bits > n || (count > 0 && (patterns == nullptr || syndromes == nullptr))) {
+        return -1;
+    }
+    for (size_t i = 0; i < count; ++i) {
+        if ((i > 0 && patterns[i] <= patterns[i - 1]) || (n < 64 && (patterns[i] >> n) != 0)) {
+            return -1;
+        }
+        syndromes[i] = 0;
+    }
+
+    TakenSet pool(max_bits);
+    std::vector<uint64_t> residual_syndromes;
+    // Sorted patterns are grouped by highest dimension, in increasing order; the first of each group is its basis
+    size_t start = (count > 0 && patterns[0] == 0) ? 1 : 0;
+    while (start < count) {
+        const uint64_t basis_vector = patterns[start];
+        const int dim = highest_dim(basis_vector);
+        size_t end = start + 1;
+        while (end < count && highest_dim(patterns[end]) == dim) {
+            ++end;
+        }
+
+        // s(v) = s(basis) ^ s(v ^ basis), where v ^ basis lies in an earlier group
+        residual_syndromes.clear();
+        for (size_t i = start + 1; i < end; ++i) {
+            const uint64_t residual_vector = patterns[i] ^ basis_vector;
+            const uint64_t* found = std::lower_bound(patterns, patterns + start, residual_vector);
+            if (found == patterns + start || *found != residual_vector) {
+                return dim + 1;
+            }
+            residual_syndromes.push_back(syndromes[found - patterns]);
+        }
+
+        const uint64_t syndrome = first_fit(pool, residual_syndromes);
+        if (syndrome == 0) {
+            return dim + 1;
+        }
+        syndromes[start] = syndrome;
+        pool.take(syndrome);
+        for (size_t i = start + 1; i < end; ++i) {
+            syndromes[i] = syndrome ^ residual_syndromes[i - start - 1];
+            pool.take(syndromes[i]);
+        }
+        start = end;
+    }
+    return 0;
+}
@@ -0,0 +1,233 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from greedy_syndrome_mapper import GreedySyndromeMapper
+from linear_code import StreamStats
+
+
+def _share_array(array: np.ndarray) -> tuple[shared_memory.SharedMemory, tuple]:
+    """
+    Copy array into a new shared memory block; return the block and a picklable (name, shape, dtype) spec.
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def _attach_shared(spec: tuple) -> tuple[shared_memory.SharedMemory, np.ndarray]:
+    name, shape, dtype = spec
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError: # Python < 3.13; pool workers share the parent's resource tracker, so registering again is harmless
+        shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+_worker_state = {} # Per-process decoder and buffers attached by _init_decode_worker
+
+
+def _init_decode_worker(n: int, r: int, specs: dict[str, tuple]) -> None:
+    arrays = {}
+    blocks = []
+    for key, spec in specs.items():
+        shm, arrays[key] = _attach_shared(spec)
+        blocks.append(shm)
+    _worker_state["blocks"] = blocks # Keep the mappings alive for the life of the worker
+    _worker_state["decoder"] = SyndromeDecoder._from_arrays(n, r, arrays)
+    _worker_state["arrays"] = arrays
+
+
+def _decode_shared_slice(start: int, stop: int) -> int:
+    arrays = _worker_state["arrays"]
+    corrected, uncorrectable = _worker_state["decoder"]._decode_packed(arrays["received"][start:stop])
+    arrays["corrected"][start:stop] = corrected
+    arrays["uncorrectable"][start:stop] = uncorrectable
+    return int(np.count_nonzero(uncorrectable))
+
+
+class SyndromeDecoder:
+    """
+    SyndromeDecoder corrects received words with the code built by a GreedySyndromeMapper.
+    It computes H·r for whole batches at once and looks the syndrome up in an inverse table
+    (syndrome -> error pattern), so no Python code runs per word.
+
+    Words are either an (N, n) uint8 array of 0/1 entries, or packed bytes as produced by
+    np.packbits(words, axis=1): (N, ceil(n / 8)) uint8, leftmost position in the high bit.
+    """
+    _DENSE_TABLE_BITS = 22 # Use a dense 2^r lookup table up to this many check bits
+
+    def __init__(self, mapper: GreedySyndromeMapper) -> None:
+        self.n = mapper.n
+        self.n_bytes = (self.n + 7) // 8
+        column_syndromes = mapper.get_column_syndromes()
+        # Number of check bits, i.e. rows of the parity check matrix
+        self.r = max(s.bit_length() for s in column_syndromes)
+        if self.r > 64:
+            raise ValueError(f"Syndromes with {self.r} check bits do not fit in 64-bit words.")
+
+        # _byte_tables[b][x] is the syndrome contribution of value x in packed byte b
+        bit_values = (np.arange(256, dtype=np.uint16)[:, None] >> np.arange(7, -1, -1, dtype=np.uint16)) & 1
+        self._byte_tables = np.zeros((self.n_bytes, 256), dtype=np.uint64)
+        for j, syndrome in enumerate(column_syndromes):
+            self._byte_tables[j // 8] ^= np.where(bit_values[:, j % 8] == 1, np.uint64(syndrome), np.uint64(0))
+
+        # Row 0 is the zero error, so a zero syndrome decodes to "no correction"
+        syndromes = [0]
+        errors = [0]
+        for vector, syndrome in mapper.packed_syndrome_map.items():
+            syndromes.append(syndrome)
+            errors.append(vector)
+        # Same layout as np.packbits: position 0 in the high bit of byte 0, zero padding at the end
+        shift = 8 * self.n_bytes - self.n
+        error_bytes = b"".join((e << shift).to_bytes(self.n_bytes, "big") for e in errors)
+        self._errors = np.frombuffer(error_bytes, dtype=np.uint8).reshape(len(errors), self.n_bytes)
+
+        syndromes_arr = np.array(syndromes, dtype=np.uint64)
+        if self.r <= self._DENSE_TABLE_BITS:
+            self._table = np.full(1 << self.r, -1, dtype=np.int32)
+            self._table[syndromes_arr] = np.arange(len(syndromes), dtype=np.int32)
+            self._sorted_syndromes = None
+        else:
+            order = np.argsort(syndromes_arr)
+            self._table = order.astype(np.int32)
+            self._sorted_syndromes = syndromes_arr[order]
+
+    _SHARED_ARRAYS = ("_byte_tables", "_errors", "_table", "_sorted_syndromes")
+
+    @classmethod
+    def _from_arrays(cls, n: int, r: int, arrays: dict[str, np.ndarray]) -> "SyndromeDecoder":
+        """
+        Rebuild a decoder around existing lookup arrays (e.g. views of shared memory) without a mapper.
+        """
+        decoder = cls.__new__(cls)
+        decoder.n = n
+        decoder.n_bytes = (n + 7) // 8
+        decoder.r = r
+        for name in cls._SHARED_ARRAYS:
+            setattr(decoder, name, arrays.get(name))
+        return decoder
+
+    def _as_packed(self, words, packed: bool) -> np.ndarray:
+        if packed:
+            if isinstance(words, (bytes, bytearray, memoryview)):
+                words = np.frombuffer(words, dtype=np.uint8)
+            return np.asarray(words, dtype=np.uint8).reshape(-1, self.n_bytes)
+        words = np.asarray(words, dtype=np.uint8)
+        if words.ndim != 2 or words.shape[1] != self.n:
+            raise ValueError(f"Expected an (N, {self.n}) array of received words, got shape {words.shape}.")
+        return np.packbits(words, axis=1)
+
+    def syndromes(self, words, packed: bool = False) -> np.ndarray:
+        """
+        Return the packed syndrome H·r of every received word as a uint64 array.
+        """
+        return self._packed_syndromes(self._as_packed(words, packed))
+
+    def _packed_syndromes(self, packed_words: np.ndarray) -> np.ndarray:
+        syndromes = np.zeros(len(packed_words), dtype=np.uint64)
+        for b in range(self.n_bytes):
+            syndromes ^= self._byte_tables[b][packed_words[:, b]]
+        return syndromes
+
+    def error_indices(self, syndromes: np.ndarray) -> np.ndarray:
+        """
+        Map syndromes to rows of the error table; -1 marks syndromes with no correctable error.
+        """
+        syndromes = np.asarray(syndromes, dtype=np.uint64)
+        if self._sorted_syndromes is None:
+            return self._table[syndromes].astype(np.int64)
+        positions = np.minimum(np.searchsorted(self._sorted_syndromes, syndromes), len(self._sorted_syndromes) - 1)
+        found = self._sorted_syndromes[positions] == syndromes
+        return np.where(found, self._table[positions], -1).astype(np.int64)
+
+    def _decode_packed(self, packed_words: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        indices = self.error_indices(self._packed_syndromes(packed_words))
+        uncorrectable = indices < 0
+        # Uncorrectable words are left as received (row 0 is the zero error)
+        corrected = packed_words ^ self._errors[np.where(uncorrectable, 0, indices)]
+        return corrected, uncorrectable
+
+    def decode_batch(self, words, packed: bool = False, return_uncorrectable: bool = False):
+        """
+        Correct a batch of received words and return them in the same format as the input.
+        With return_uncorrectable=True, also return a boolean mask of words whose syndrome
+        matches no error pattern; those words are returned unchanged.
+        """
+        corrected, uncorrectable = self._decode_packed(self._as_packed(words, packed))
+        if not packed:
+            corrected = np.unpackbits(corrected, axis=1, count=self.n)
+        if return_uncorrectable:
+            return corrected, uncorrectable
+        return corrected
+
+    def decode_file(self, input_path: str, output_path: str, chunk_words: int = 1 << 20) -> StreamStats:
+        """
+        Decode a binary file of packed received words (ceil(n / 8) bytes per word, np.packbits layout)
+        into output_path. The input is memory-mapped and processed chunk_words words at a time,
+        so memory stays bounded regardless of the file size.
+        """
+        if chunk_words <= 0:
+            raise ValueError("chunk_words must be positive.")
+        size = os.path.getsize(input_path)
+        if size % self.n_bytes:
+            raise ValueError(f"{input_path} holds {size} bytes, which is not a whole number of {self.n_bytes}-byte words.")
+        total_words = size // self.n_bytes
+        uncorrectable_count = 0
+        start = time.perf_counter()
+        with open(output_path, "wb") as out:
+            if total_words:
+                received = np.memmap(input_path, dtype=np.uint8, mode="r", shape=(total_words, self.n_bytes))
+                for first in range(0, total_words, chunk_words):
+                    corrected, uncorrectable = self._decode_packed(received[first:first + chunk_words])
+                    out.write(corrected.tobytes())
+                    uncorrectable_count += int(np.count_nonzero(uncorrectable))
+                del received
+        return StreamStats(total_words, uncorrectable_count, self.n_bytes, time.perf_counter() - start)
+
+    def decode_batch_parallel(self, words, packed: bool = False, return_uncorrectable: bool = False,
+                              workers: int | None = None, slice_words: int | None = None):
+        """
+        Same result as decode_batch, computed by a pool of worker processes.
+        The lookup tables, the received words and the output buffers live in shared memory,
+        so tasks only carry (start, stop) slice bounds; each worker writes its slice in place,
+        which keeps the output order identical to the input order.
+        """
+        received = np.ascontiguousarray(self._as_packed(words, packed))
+        total_words = len(received)
+        workers = workers or os.cpu_count() or 1
+        if slice_words is None:
+            slice_words = max(1, -(-total_words // (workers * 4)))
+
+        arrays = {name: getattr(self, name) for name in self._SHARED_ARRAYS if getattr(self, name) is not None}
+        arrays["received"] = received
+        arrays["corrected"] = np.empty_like(received)
+        arrays["uncorrectable"] = np.empty(total_words, dtype=bool)
+        bounds = [(first, min(first + slice_words, total_words)) for first in range(0, total_words, slice_words)]
+        blocks = []
+        shared = {}
+        try:
+            specs = {}
+            for key, array in arrays.items():
+                shm, specs[key] = _share_array(array)
+                blocks.append(shm)
+                shared[key] = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+            if bounds:
+                with ProcessPoolExecutor(max_workers=min(workers, len(bounds)), initializer=_init_decode_worker,
+                                         initargs=(self.n, self.r, specs)) as pool:
+                    list(pool.map(_decode_shared_slice, *zip(*bounds)))
+            corrected = shared["corrected"].copy()
+            uncorrectable = shared["uncorrectable"].copy()
+        finally:
+            shared.clear() # Views must be released before the blocks can be closed
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+        if not packed:
+            corrected = np.unpackbits(corrected, axis=1, count=self.n)
+        if return_uncorrectable:
+            return corrected, uncorrectable
+        return corrected
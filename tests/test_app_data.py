@@ -0,0 +1,37 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Add the parent directory to the Python path BEFORE importing the module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app_data import compact_json, csv_chunks, json_chunks, parity_rows, parse_pattern_lines, parse_pattern_list
+from greedy_syndrome_mapper import GreedySyndromeMapper
+
+
+def test_parse_pattern_lines_keeps_order_and_validates():
+    assert parse_pattern_lines("[1, 0, 0]\n\n(0,1,1)\n[1,0,0]\n") == ((0b100, 0b011, 0b100), 3)
+    assert parse_pattern_lines("[1, 0, True]\n") == ((0b101,), 3) # Through ast.literal_eval
+    for text in ("[10]\n", "[1, 2, 0]\n", "[1, 0]\n[1]\n", "101\n", ""):
+        with pytest.raises(ValueError):
+            parse_pattern_lines(text)
+    assert parse_pattern_list([[0, 1], (1, 1)]) == ((0b01, 0b11), 2)
+    with pytest.raises(ValueError):
+        parse_pattern_list([[0, 3]])
+
+def test_json_preview_and_download():
+    patterns = tuple(range(1, 8))
+    full = b"".join(json_chunks(patterns, 3, chunk_rows=2))
+    assert json.loads(full) == [[int(b) for b in format(v, "03b")] for v in patterns]
+    assert compact_json(patterns, 3) == full.decode()
+    assert compact_json(patterns, 3, limit=2) == "[[0,0,1],[0,1,0]] ... and 5 more patterns (in the download)"
+
+def test_parity_rows_of_a_code_with_free_positions():
+    # H has one column per basis vector: (2, 2) here, although n = 3
+    matrix = GreedySyndromeMapper([[0, 1, 0], [1, 0, 0]]).get_parity_check_matrix()
+    rows = parity_rows(matrix)
+    assert len(rows) == matrix.shape[0] and all(len(row) == matrix.shape[1] == 2 for row in rows)
+    csv = b"".join(csv_chunks("0,1", len(rows), lambda i: ",".join(rows[i]), chunk_rows=1)).decode()
+    assert csv.splitlines()[1:] == [",".join(str(b) for b in row) for row in matrix.tolist()]
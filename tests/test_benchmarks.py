@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+
+# Add the parent directory to the Python path BEFORE importing the module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+import run_benchmarks
+from run_benchmarks import compare, run_suite
+
+import native_backend # On the path once run_benchmarks is imported
+from greedy_syndrome_mapper import GreedySyndromeMapper
+
+
+def test_run_suite_records_every_case():
+    report = run_suite([6, 8], ["weight:{n}:1", "burst:{n}:2"], decode_words=1000, repeat=1)
+    assert [r["family"] for r in report["results"]] == ["weight:6:1", "burst:6:2", "weight:8:1", "burst:8:2"]
+    for record in report["results"]:
+        assert record["construction_s"] >= 0
+        assert record["peak_bytes"] > 0
+        assert record["pool_taken"] == record["patterns"]
+        assert record["decode_words_per_s"] > 0
+        assert record["backend"] == GreedySyndromeMapper.construction_backend(record["n"])
+
+@pytest.mark.skipif(native_backend.load() is None, reason="The native library is not built.")
+def test_native_and_python_timings_are_compared(monkeypatch):
+    monkeypatch.delenv("LTC_BACKEND", raising=False)
+    forced = []
+    real_best_time = run_benchmarks.best_construction_time
+    def best_time(patterns, n, repeat):
+        forced.append(os.environ.get("LTC_BACKEND"))
+        return real_best_time(patterns, n, repeat)
+    monkeypatch.setattr(run_benchmarks, "best_construction_time", best_time)
+    (record,) = run_suite([12], ["weight:{n}:2"], decode_words=1000, repeat=1)["results"]
+    assert forced == [None, "python", "native"]
+    assert os.environ.get("LTC_BACKEND") is None
+    assert record["backend"] == "native"
+    assert record["python_construction_s"] > 0 and record["native_construction_s"] > 0
+    assert record["native_speedup"] == pytest.approx(record["python_construction_s"] / record["native_construction_s"])
+
+def test_no_comparison_without_the_native_backend(monkeypatch):
+    monkeypatch.setenv("LTC_BACKEND", "python")
+    (record,) = run_suite([8], ["weight:{n}:1"], decode_words=1000, repeat=1)["results"]
+    assert record["backend"] == "python"
+    assert record["python_construction_s"] is record["native_construction_s"] is record["native_speedup"] is None
+
+def test_compare_flags_slowdowns_only():
+    baseline = {"results": [{"family": "weight:8:2", "construction_s": 1.0, "backend": "native"},
+                            {"family": "burst:8:2", "construction_s": 1.0, "backend": "native"}]}
+    current = {"results": [{"family": "weight:8:2", "construction_s": 2.0, "backend": "native"},
+                           {"family": "burst:8:2", "construction_s": 1.2, "backend": "native"}]}
+    regressions = compare(current, baseline, max_ratio=1.5)
+    assert len(regressions) == 1 and regressions[0].startswith("weight:8:2")
+
+def test_compare_refuses_other_backends():
+    current = {"results": [{"family": "weight:8:2", "construction_s": 1.0, "backend": "python"}]}
+    for baseline_backend in ({"backend": "native"}, {}):
+        baseline = {"results": [{"family": "weight:8:2", "construction_s": 1.0, **baseline_backend}]}
+        with pytest.raises(ValueError, match="weight:8:2"):
+            compare(current, baseline, max_ratio=1.5)
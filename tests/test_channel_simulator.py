@@ -0,0 +1,54 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the Python path BEFORE importing the module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from channel_simulator import Channel, parse_ps, simulate, wilson_interval
+from greedy_syndrome_mapper import GreedySyndromeMapper
+from pattern_generators import burst_patterns
+
+
+def single_error_code(n):
+    return GreedySyndromeMapper([[int(i == j) for i in range(n)] for j in range(n)])
+
+def test_bsc_matches_analytic_block_error_rate():
+    # A code correcting exactly the single errors fails on every word with two or more errors
+    p = 0.05
+    (point,) = simulate(single_error_code(7), [p], "bsc", max_words=1 << 18, min_block_errors=10 ** 9, workers=1)
+    expected = 1 - (1 - p) ** 7 - 7 * p * (1 - p) ** 6
+    assert point.words == 1 << 18
+    low, high = point.bler_interval
+    assert low <= expected <= high
+    assert 0 < point.ber < point.bler
+
+def test_results_do_not_depend_on_workers():
+    mapper = single_error_code(12)
+    kwargs = dict(batch_words=1000, max_words=20000, min_block_errors=50, seed=3)
+    serial = simulate(mapper, [0.01, 0.1], **kwargs, workers=1)
+    parallel = simulate(mapper, [0.01, 0.1], **kwargs, workers=3)
+    assert [(s.words, s.block_errors, s.bit_errors) for s in serial] == \
+           [(s.words, s.block_errors, s.bit_errors) for s in parallel]
+    assert serial[1].words < 20000 # Stopped early once the interval was tight
+
+def test_burst_channel_draws_burst_patterns():
+    n = 20
+    errors = Channel.parse("burst:4").errors(np.random.default_rng(0), 5000, n, 0.5)
+    values = {int.from_bytes(row.tobytes(), "big") >> (8 * errors.shape[1] - n) for row in errors}
+    assert values - {0} <= set(burst_patterns(n, 4, packed=True))
+    assert len(values) > 50
+    mapper = GreedySyndromeMapper(burst_patterns(n, 4))
+    (point,) = simulate(mapper, [0.5], "burst:4", max_words=20000, workers=1)
+    assert point.block_errors == 0
+
+def test_helpers_and_validation():
+    assert parse_ps("0.1,0.2") == [0.1, 0.2]
+    assert parse_ps("1e-3:1e-1:3") == pytest.approx([1e-3, 1e-2, 1e-1])
+    low, high = wilson_interval(0, 100)
+    assert low == pytest.approx(0) and 0 < high < 0.05
+    for spec in ("awgn", "burst", "bsc:3"):
+        with pytest.raises(ValueError):
+            Channel.parse(spec)
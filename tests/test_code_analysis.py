@@ -0,0 +1,68 @@
+import itertools
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the Python path BEFORE importing the module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import code_analysis
+from code_analysis import (find_collisions, find_homomorphism_violations, minimum_distance, verify_code,
+                           weight_distribution)
+from greedy_syndrome_mapper import GreedySyndromeMapper
+from linear_code import ParityCheckMatrix
+
+
+def brute_force_distribution(dense):
+    n = dense.shape[1]
+    counts = [0] * (n + 1)
+    for x in itertools.product([0, 1], repeat=n):
+        if not ((dense @ np.array(x)) % 2).any():
+            counts[sum(x)] += 1
+    return counts
+
+@pytest.mark.parametrize("seed", range(8))
+def test_weight_distribution_and_distance_match_brute_force(seed, monkeypatch):
+    rng = np.random.default_rng(seed)
+    r = int(rng.integers(1, 8))
+    dense = rng.integers(0, 2, size=(r, int(rng.integers(r, 13))))
+    expected = brute_force_distribution(dense)
+    distance = next((w for w in range(1, len(expected)) if expected[w]), None)
+    assert weight_distribution(dense, workers=1) == expected
+    assert minimum_distance(dense) == distance
+    # Force the meet-in-the-middle search
+    monkeypatch.setattr(code_analysis, "DISTRIBUTION_BITS", -1)
+    assert minimum_distance(ParityCheckMatrix.from_dense(dense)) == distance
+
+def test_weight_distribution_on_worker_processes(monkeypatch):
+    monkeypatch.setattr(code_analysis, "_LOW_BITS", 1) # Several Gray code slices
+    hamming = np.array([[int(b) for b in f"{c:03b}"] for c in range(1, 8)]).T
+    assert weight_distribution(hamming, workers=2) == [1, 0, 0, 7, 7, 0, 0, 1]
+
+def test_verify_constructed_code():
+    T = [list(v) for v in itertools.product([0, 1], repeat=12) if 0 < sum(v) <= 2]
+    report = verify_code(GreedySyndromeMapper(T), workers=1)
+    assert report.ok
+    assert report.minimum_distance == 5
+    assert report.weight_distribution[:5] == [1, 0, 0, 0, 0]
+    assert sum(report.weight_distribution) == 2 ** report.k
+
+def test_tampered_map_is_reported():
+    T = [list(v) for v in itertools.product([0, 1], repeat=6) if 0 < sum(v) <= 2]
+    mapper = GreedySyndromeMapper(T)
+    packed = dict(mapper.packed_syndrome_map)
+    packed[0b000011] = packed[0b000101] # Break both injectivity and S(u ^ v) = S(u) ^ S(v)
+    tampered = GreedySyndromeMapper.from_syndrome_map(packed.keys(), 6, packed)
+    assert find_collisions(tampered) == (1, [(0b000011, 0b000101)])
+    count, examples = find_homomorphism_violations(tampered, workers=2)
+    assert count > 0 and (0b000001, 0b000010) in examples
+    report = verify_code(tampered, distance=False)
+    assert not report.ok and report.minimum_distance is None
+
+def test_verify_code_with_free_positions():
+    # Position 0 is no pattern's highest dimension, so its column of H is free
+    report = verify_code(GreedySyndromeMapper([[0, 1, 0], [1, 0, 0]]), workers=1)
+    assert report.ok
+    assert report.weight_distribution == [1, 1, 0, 0] and report.minimum_distance == 1
@@ -0,0 +1,72 @@
+import os
+import sys
+
+import numpy as np
+
+# Add the parent directory to the Python path BEFORE importing the module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code_batch import construct_many, estimated_size, read_pattern_sets
+from greedy_syndrome_mapper import GreedySyndromeMapper
+from pattern_generators import family_patterns
+
+
+def test_results_match_single_constructions():
+    pattern_sets = {
+        "weight": "weight:16:2",
+        "burst": "burst:20:4",
+        "list": [[0, 0, 1], [0, 1, 0], [1, 0, 0], [1, 1, 0]],
+        "matrix": family_patterns("weight:10:1"),
+    }
+    results = {result.name: result for result in construct_many(pattern_sets, workers=2)}
+    assert set(results) == set(pattern_sets)
+    for name, patterns in pattern_sets.items():
+        expected = GreedySyndromeMapper(family_patterns(patterns) if isinstance(patterns, str) else patterns)
+        assert results[name].ok
+        assert results[name].packed_syndrome_map == expected.packed_syndrome_map
+        assert results[name].mapper().get_parity_check_matrix().tolist() == expected.get_parity_check_matrix().tolist()
+    assert results["weight"].patterns == estimated_size("weight:16:2") == 136
+
+def test_largest_first_and_failures_do_not_stop_the_batch():
+    pattern_sets = [[[1, 0], [1, 1]], "weight:12:2", [[0, 1], [1, 0]], "nope:3:1"]
+    results = list(construct_many(pattern_sets, workers=1))
+    assert [r.name for r in results] == ["1", "0", "2", "3"]
+    assert [r.ok for r in results] == [True, False, True, False]
+    assert "valid syndrome" in results[1].error
+
+def test_malformed_sets_fail_alone(tmp_path):
+    sets = tmp_path / "sets.txt"
+    sets.write_text("# mixed\n[1,0]\n5\n\n# two\n[0,2]\n[1,0]\n\n# ragged\n[1,0]\n[1,1,0]\n\n"
+                    "# nested\n[[1],0]\n\n# good\n[0,1]\n[1,0]\n")
+    pattern_sets = read_pattern_sets(str(sets))
+    pattern_sets["matrix"] = np.array([[0, 2], [1, 0]])
+    results = {r.name: r for r in construct_many(pattern_sets, workers=1)}
+    assert set(results) == {"mixed", "two", "ragged", "nested", "matrix", "good"}
+    assert [name for name, r in results.items() if r.ok] == ["good"]
+    assert results["good"].redundancy == 2
+    assert "0/1 vector" in results["mixed"].error
+    assert "0 and 1" in results["two"].error and "0 and 1" in results["matrix"].error
+
+def test_packed_patterns_with_n():
+    (result,) = construct_many({"packed": [1, 2, 4, 6]}, workers=1, n=3)
+    assert result.ok and result.redundancy == 3
+
+def test_read_pattern_sets(tmp_path):
+    multi = tmp_path / "sets.txt"
+    multi.write_text("# a\n[0,1]\n[1,0]\n\nweight:8:2\n\n# c\n(1, 1, 0)\n")
+    assert read_pattern_sets(str(multi)) == {"a": [[0, 1], [1, 0]], "1": "weight:8:2", "c": [(1, 1, 0)]}
+    directory = tmp_path / "dir"
+    directory.mkdir()
+    (directory / "x.txt").write_text("[0,0,1]\n[0,1,0]\n")
+    np.save(directory / "y.npy", np.eye(4, dtype=np.uint8))
+    sets = read_pattern_sets(str(directory))
+    assert sets["x"] == [[0, 0, 1], [0, 1, 0]] and sets["y"].shape == (4, 4)
+
+def test_mapper_keeps_the_job_patterns():
+    # The zero vector has no syndrome-map entry but belongs to T
+    (result,) = construct_many({"with-zero": [[0, 0, 0], [0, 1, 0], [1, 0, 0], [1, 1, 0]]}, workers=1)
+    expected = GreedySyndromeMapper([[0, 0, 0], [0, 1, 0], [1, 0, 0], [1, 1, 0]])
+    assert result.error_patterns == frozenset({0, 2, 4, 6})
+    mapper = result.mapper()
+    assert mapper.sorted_error_patterns == expected.sorted_error_patterns
+    assert mapper.get_basis_map_list() == expected.get_basis_map_list()
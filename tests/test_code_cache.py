@@ -0,0 +1,100 @@
+import itertools
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the Python path BEFORE importing the module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code_cache import CodeCache
+from greedy_syndrome_mapper import GreedySyndromeMapper
+
+
+def weight_two_patterns(n):
+    return [list(v) for v in itertools.product([0, 1], repeat=n) if 0 < sum(v) <= 2]
+
+def test_cache_hit_returns_identical_mapper(tmp_path, monkeypatch):
+    cache = CodeCache(str(tmp_path))
+    T = weight_two_patterns(8)
+    built = cache.get_or_build(T)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    # A second request must be served from disk without running the greedy construction
+    def fail(*args, **kwargs):
+        raise AssertionError("construction should not run on a cache hit")
+    monkeypatch.setattr(GreedySyndromeMapper, "from_packed", fail)
+    loaded = cache.get_or_build(list(reversed(T)) + T[:3])
+    assert dict(loaded.syndrome_map) == dict(built.syndrome_map)
+    assert loaded.get_basis_map_list() == built.get_basis_map_list()
+    assert (loaded.get_parity_check_matrix() == built.get_parity_check_matrix()).all()
+
+def test_cache_entry_holds_parity_check_matrix(tmp_path):
+    cache = CodeCache(str(tmp_path))
+    mapper = cache.get_or_build(weight_two_patterns(6))
+    (entry,) = tmp_path.glob("*.npz")
+    with np.load(entry) as data:
+        assert (data["parity_check_matrix"] == mapper.get_parity_check_matrix()).all()
+
+def test_key_ignores_order_and_duplicates():
+    assert CodeCache.key({1, 2, 4}, 3) == CodeCache.key({4, 2, 1}, 3)
+    assert CodeCache.key({1, 2, 4}, 3) != CodeCache.key({1, 2, 4}, 4)
+
+def test_eviction_removes_least_recently_used_entry(tmp_path):
+    cache = CodeCache(str(tmp_path))
+    cache.get_or_build([[1, 0, 0], [0, 1, 0], [0, 0, 1]])
+    (old_entry,) = tmp_path.glob("*.npz")
+    os.utime(old_entry, (1, 1)) # Pretend it was last used long ago
+    cache.max_bytes = old_entry.stat().st_size + 1
+    cache.get_or_build([[1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 0]])
+    remaining = list(tmp_path.glob("*.npz"))
+    assert len(remaining) == 1 and remaining[0] != old_entry
+
+def test_eviction_skips_entries_deleted_concurrently(tmp_path):
+    # A dangling link stats like an entry another process removed after the directory scan
+    os.symlink(tmp_path / "gone.npz", tmp_path / "vanished.npz")
+    cache = CodeCache(str(tmp_path), max_bytes=0)
+    cache.get_or_build([[1, 0], [0, 1]])
+    assert os.listdir(tmp_path) == ["vanished.npz"] # The new entry was evicted, the link skipped
+
+def test_corrupt_entry_is_rebuilt(tmp_path):
+    cache = CodeCache(str(tmp_path))
+    T = weight_two_patterns(5)
+    mapper = cache.get_or_build(T)
+    (entry,) = tmp_path.glob("*.npz")
+    entry.write_bytes(b"not an npz file")
+    assert dict(cache.get_or_build(T).syndrome_map) == dict(mapper.syndrome_map)
+
+@pytest.mark.parametrize("damage", ["truncate", "garbage"])
+def test_damaged_zip_entry_is_dropped_and_rebuilt(tmp_path, damage):
+    cache = CodeCache(str(tmp_path))
+    T = weight_two_patterns(7)
+    mapper = cache.get_or_build(T)
+    (entry,) = tmp_path.glob("*.npz")
+    data = entry.read_bytes()
+    if damage == "truncate":
+        data = data[:len(data) // 2] # Left behind by a killed writer
+    else:
+        data = data[:64] + b"\xff" * (len(data) - 128) + data[-64:] # Zip headers intact, members damaged
+    entry.write_bytes(data)
+    key = CodeCache.key({int("".join(map(str, v)), 2) for v in T}, 7)
+    assert cache.load(key, set(), 7) is None
+    assert not entry.exists()
+    assert dict(cache.get_or_build(T).syndrome_map) == dict(mapper.syndrome_map)
+    with np.load(entry) as loaded:
+        assert loaded["vectors"].shape[0] == len(mapper.packed_syndrome_map)
+
+def test_failed_construction_is_not_cached(tmp_path):
+    cache = CodeCache(str(tmp_path))
+    with pytest.raises(RuntimeError):
+        cache.get_or_build([[1, 0, 0], [1, 1, 0], [0, 0, 1]])
+    assert not list(tmp_path.glob("*.npz"))
+
+def test_cache_hit_respects_max_redundancy(tmp_path):
+    cache = CodeCache(str(tmp_path))
+    T = weight_two_patterns(8)
+    r = cache.get_or_build(T).redundancy
+    assert cache.get_or_build(T, max_redundancy=r).redundancy == r
+    with pytest.raises(RuntimeError, match=f"at most {r - 1} check bits"):
+        cache.get_or_build(T, max_redundancy=r - 1)
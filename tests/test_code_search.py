@@ -0,0 +1,68 @@
+import itertools
+import os
+import sys
+
+import pytest
+
+# Add the parent directory to the Python path BEFORE importing the module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code_search import SearchVariant, generate_variants, run_variant, search_codes, search_codes_packed
+from greedy_syndrome_mapper import GreedySyndromeMapper
+
+
+def weight_two_patterns(n):
+    return [list(v) for v in itertools.product([0, 1], repeat=n) if 0 < sum(v) <= 2]
+
+def assert_valid_code(mapper):
+    # Injective and consistent with one linear map wherever T is closed under XOR
+    syndromes = mapper.packed_syndrome_map
+    assert 0 not in syndromes.values()
+    assert len(set(syndromes.values())) == len(syndromes)
+    for a, b in itertools.combinations(syndromes, 2):
+        if a ^ b in syndromes:
+            assert syndromes[a] ^ syndromes[b] == syndromes[a ^ b]
+
+def test_default_variant_is_the_greedy_construction():
+    T = weight_two_patterns(9)
+    mapper = GreedySyndromeMapper(T)
+    redundancy, syndromes = run_variant(set(mapper.packed_syndrome_map), 9, SearchVariant())
+    assert syndromes == mapper.packed_syndrome_map
+    assert redundancy == mapper.redundancy
+
+@pytest.mark.parametrize("variant", generate_variants(8, 12, seed=1))
+def test_every_variant_yields_a_valid_code(variant):
+    outcome = run_variant(set(GreedySyndromeMapper(weight_two_patterns(8)).packed_syndrome_map), 8, variant)
+    if outcome is not None:
+        mapper = GreedySyndromeMapper.from_syndrome_map(set(outcome[1]), 8, outcome[1])
+        assert mapper.redundancy == outcome[0]
+        assert_valid_code(mapper)
+
+def test_search_never_does_worse_than_default():
+    T = weight_two_patterns(10)
+    result = search_codes(T, variants=16, workers=1)
+    assert result.default_redundancy == GreedySyndromeMapper(T).redundancy
+    assert result.redundancy <= result.default_redundancy
+    assert result.tried == 16
+    assert_valid_code(result.mapper)
+
+def test_search_finds_code_where_default_fails():
+    patterns, n = {4, 7, 18, 20, 22, 24}, 5
+    with pytest.raises(RuntimeError):
+        GreedySyndromeMapper.from_packed(patterns, n)
+    result = search_codes_packed(patterns, n, variants=40, workers=1, seed=0)
+    assert result.default_redundancy is None
+    assert result.variant != SearchVariant()
+    assert set(result.mapper.packed_syndrome_map) == patterns
+    assert_valid_code(result.mapper)
+
+def test_parallel_search_matches_serial_search():
+    T = weight_two_patterns(9)
+    serial = search_codes(T, variants=10, workers=1, seed=3)
+    parallel = search_codes(T, variants=10, workers=2, seed=3)
+    assert parallel.variant == serial.variant
+    assert parallel.mapper.packed_syndrome_map == serial.mapper.packed_syndrome_map
+
+def test_exhausted_time_budget_raises():
+    with pytest.raises(RuntimeError, match="time budget"):
+        search_codes(weight_two_patterns(6), variants=4, workers=1, time_budget=0)
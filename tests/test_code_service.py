@@ -0,0 +1,173 @@
+import asyncio
+import base64
+import itertools
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+# Add the parent directory to the Python path BEFORE importing the module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import code_service
+from code_service import CodeService
+from greedy_syndrome_mapper import GreedySyndromeMapper
+
+
+def weight_two_patterns(n):
+    return [list(v) for v in itertools.product([0, 1], repeat=n) if 0 < sum(v) <= 2]
+
+def run_with_service(coroutine_function):
+    async def main():
+        service = CodeService(executor=ThreadPoolExecutor(2), disk_cache=False)
+        try:
+            return await coroutine_function(service)
+        finally:
+            service.executor.shutdown()
+    return asyncio.run(main())
+
+async def post(service, path, request):
+    status, payload = await service.handle("POST", path, json.dumps(request).encode())
+    return status, json.loads(json.dumps(payload)) # Same round trip as over HTTP
+
+def test_construct_then_reuse_key():
+    T = weight_two_patterns(7)
+    expected = GreedySyndromeMapper(T)
+
+    async def scenario(service):
+        status, built = await post(service, "/construct", {"error_patterns": T})
+        assert status == HTTPStatus.OK
+        assert built["redundancy"] == expected.redundancy
+        assert built["syndrome_map"] == [[list(v), list(s)] for v, s in sorted(expected.syndrome_map.items())]
+        _, basis = await post(service, "/basis-map", {"key": built["key"]})
+        assert basis["basis_map"] == [[list(b), list(s)] for b, s in expected.get_basis_map_list()]
+        _, parity = await post(service, "/parity-check-matrix", {"family": "weight:7:2"})
+        assert parity["key"] == built["key"]
+        assert parity["parity_check_matrix"] == expected.get_parity_check_matrix().tolist()
+        return service.counters
+
+    counters = run_with_service(scenario)
+    assert counters["constructions"] == 1
+    assert counters["cache_hits"] == 2
+
+def test_concurrent_identical_requests_are_coalesced(monkeypatch):
+    release = threading.Event()
+    calls = []
+    construct = code_service._construct_syndrome_map
+
+    def slow_construct(*args):
+        calls.append(args)
+        release.wait(5)
+        return construct(*args)
+    monkeypatch.setattr(code_service, "_construct_syndrome_map", slow_construct)
+
+    async def scenario(service):
+        requests = [post(service, "/construct", {"family": "weight:8:2"}) for _ in range(5)]
+        gathered = asyncio.gather(*requests)
+        await asyncio.sleep(0.05)
+        release.set()
+        return await gathered, service.counters
+
+    results, counters = run_with_service(scenario)
+    assert len(calls) == 1
+    assert counters["coalesced"] == 4
+    assert len({payload["key"] for _, payload in results}) == 1
+
+def test_decode_batch_words_and_packed_words():
+    T = weight_two_patterns(10)
+    errors = np.array(T, dtype=np.uint8)
+
+    async def scenario(service):
+        _, plain = await post(service, "/decode-batch", {"error_patterns": T, "words": T[:5]})
+        packed_words = base64.b64encode(np.packbits(errors, axis=1).tobytes()).decode()
+        _, packed = await post(service, "/decode-batch", {"key": plain["key"], "packed_words": packed_words})
+        return plain, packed
+
+    plain, packed = run_with_service(scenario)
+    assert plain["corrected"] == [[0] * 10] * 5
+    assert plain["uncorrectable"] == [False] * 5
+    assert not any(base64.b64decode(packed["packed_corrected"]))
+    assert packed["uncorrectable"] == [False] * len(T)
+
+def test_errors_map_to_http_statuses():
+    async def scenario(service):
+        return [
+            (await service.handle("GET", "/nowhere", b""))[0],
+            (await service.handle("GET", "/construct", b""))[0],
+            (await service.handle("POST", "/construct", b"{not json"))[0],
+            (await post(service, "/construct", {"key": "missing"}))[0],
+            (await post(service, "/construct", {"error_patterns": [[1, 0], [1, 1]]}))[0],
+            (await post(service, "/construct", {"family": "nope:3:1"}))[0],
+            (await post(service, "/construct", {"family": 123}))[0],
+            (await post(service, "/decode-batch", {"family": "weight:6:1", "words": [[1, 0]]}))[0],
+            (await post(service, "/decode-batch", {"family": "weight:2:1", "words": [[0, 2]]}))[0],
+            (await post(service, "/decode-batch", {"family": "weight:2:1", "words": [[1, 300]]}))[0],
+        ]
+
+    assert run_with_service(scenario) == [HTTPStatus.NOT_FOUND, HTTPStatus.METHOD_NOT_ALLOWED, HTTPStatus.BAD_REQUEST,
+                                          HTTPStatus.NOT_FOUND, HTTPStatus.UNPROCESSABLE_ENTITY, HTTPStatus.BAD_REQUEST,
+                                          HTTPStatus.BAD_REQUEST, HTTPStatus.BAD_REQUEST, HTTPStatus.BAD_REQUEST,
+                                          HTTPStatus.BAD_REQUEST]
+
+def test_unexpected_errors_answer_500(monkeypatch):
+    async def broken(service, request):
+        raise AttributeError("boom")
+    monkeypatch.setitem(CodeService._ROUTES, ("GET", "/health"), broken)
+
+    async def scenario(service):
+        return await service.handle("GET", "/health", b"")
+
+    status, payload = run_with_service(scenario)
+    assert status == HTTPStatus.INTERNAL_SERVER_ERROR and "boom" in payload["error"]
+
+def test_http_keep_alive_connection():
+    async def scenario(service):
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = []
+            for path, body in [("/construct", {"error_patterns": [[1, 0, 0], [0, 1, 0], [0, 0, 1]]}),
+                               ("/health", None)]:
+                data = json.dumps(body).encode() if body is not None else b""
+                method = "POST" if body is not None else "GET"
+                writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+                status_line = await reader.readline()
+                headers = {}
+                while (line := await reader.readline()) != b"\r\n":
+                    name, _, value = line.decode().partition(":")
+                    headers[name.lower()] = value.strip()
+                payload = json.loads(await reader.readexactly(int(headers["content-length"])))
+                responses.append((status_line.split()[1], payload))
+            writer.close()
+        return responses
+
+    (construct_status, built), (health_status, health) = run_with_service(scenario)
+    assert construct_status == health_status == b"200"
+    assert built["redundancy"] == 2
+    assert health["requests"] == 2 and health["codes"] == 1
+
+def test_malformed_http_requests_answer_400():
+    async def scenario(service):
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        responses = []
+        async with server:
+            for request in [b"GET /health\r\n\r\n", b"POST /construct HTTP/1.1\r\nContent-Length: ten\r\n\r\n",
+                            b"POST /construct HTTP/1.1\r\nContent-Length: -1\r\n\r\n"]:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(request)
+                await writer.drain()
+                responses.append(await reader.read()) # The server answers, then closes the connection
+                writer.close()
+        return responses
+
+    for response in run_with_service(scenario):
+        head, _, body = response.partition(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 400 ") and b"Connection: close" in head
+        assert "error" in json.loads(body)
@@ -1,3 +1,5 @@
+import io
+import itertools
 import os
 import subprocess
 import sys
@@ -8,7 +10,7 @@ import pytest
 # Add the parent directory to the Python path BEFORE importing the module
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from greedy_syndrome_mapper import GreedySyndromeMapper
+from greedy_syndrome_mapper import ConstructionStats, GreedySyndromeMapper, _SyndromePool
 
 def test_empty_error_patterns():
     with pytest.raises(ValueError):
@@ -104,6 +106,200 @@ def test_get_parity_check_matrix_empty():
     # For a single syndrome, the matrix shape should be (1,1)
     assert matrix.shape == (1,1)
 
+def test_from_packed_matches_tuple_input():
+    T = [[0,0,1], [0,1,0], [0,1,1], [1,0,0], [1,1,0]]
+    mapper = GreedySyndromeMapper(T)
+    packed = GreedySyndromeMapper.from_packed([0b001, 0b010, 0b011, 0b100, 0b110], 3)
+    assert dict(packed.syndrome_map) == dict(mapper.syndrome_map)
+    assert packed.get_basis_map_list() == mapper.get_basis_map_list()
+    assert (packed.get_parity_check_matrix() == mapper.get_parity_check_matrix()).all()
+
+def test_syndrome_map_tuple_view():
+    T = [[1,0,0], [0,1,0], [0,0,1]]
+    mapper = GreedySyndromeMapper(T)
+    assert (0,1,0) in mapper.syndrome_map
+    assert (1,1,1) not in mapper.syndrome_map
+    assert all(isinstance(k, tuple) and isinstance(v, tuple) for k, v in mapper.syndrome_map.items())
+    assert mapper.sorted_error_patterns == [(0,0,1), (0,1,0), (1,0,0)]
+
+def test_large_n_pool_stores_only_taken_syndromes():
+    n = 32
+    T = [[int(i == j) for i in range(n)] for j in range(n)]
+    mapper = GreedySyndromeMapper(T)
+    assert len(mapper.syndrome_map) == n
+    assert len(mapper.available_syndromes.taken) == n
+    # The pool only spans the r-bit syndromes actually needed: 32 unit vectors fit in 6 bits
+    assert mapper.available_syndromes.width == mapper.redundancy == 6
+    assert len(mapper.available_syndromes) == 2**6 - 1 - n
+    assert mapper.available_syndromes.next_free(1) not in mapper.available_syndromes.taken
+
+def test_syndrome_pool_successor_order():
+    pool = _SyndromePool(3)
+    pool.take([1, 2, 3, 5])
+    assert pool.next_free(1) == 4
+    assert pool.next_free(5) == 6
+    assert list(pool) == [4, 6, 7]
+    pool.take([4, 6, 7])
+    assert pool.next_free(1) is None
+    assert len(pool) == 0
+
+@pytest.mark.parametrize("bitmap_bits", [24, 0])
+def test_block_candidate_search_matches_scalar_search(monkeypatch, bitmap_bits):
+    n = 10
+    T = [list(v) for v in itertools.product([0, 1], repeat=n) if 0 < sum(v) <= 3]
+    expected = dict(GreedySyndromeMapper(T).syndrome_map)
+    # Force every dimension through the NumPy block path (bitmap or sorted-array lookups)
+    monkeypatch.setattr(_SyndromePool, "_SCALAR_PROBES", 0)
+    monkeypatch.setattr(_SyndromePool, "_BITMAP_BITS", bitmap_bits)
+    mapper = GreedySyndromeMapper(T)
+    assert dict(mapper.syndrome_map) == expected
+    assert len(set(mapper.syndrome_map.values())) == len(T)
+
+def test_missing_residual_raises_runtime_error():
+    # (1,1,0) needs the syndrome of (0,1,0), which is not in T
+    T = [[1,0,0], [1,1,0], [0,0,1]]
+    with pytest.raises(RuntimeError):
+        GreedySyndromeMapper(T)
+
+@pytest.mark.parametrize("split", [3, 9, 20])
+def test_add_patterns_matches_construction_from_scratch(split):
+    n = 6
+    T = [list(v) for v in itertools.product([0, 1], repeat=n) if 0 < sum(v) <= 2]
+    T.sort(key=lambda v: v[::-1]) # Later patterns reach higher dimensions
+    mapper = GreedySyndromeMapper(T[:split])
+    mapper.add_patterns(T[split:])
+    expected = GreedySyndromeMapper(T)
+    assert list(mapper.syndrome_map.items()) == list(expected.syndrome_map.items())
+    assert mapper.get_basis_map_list() == expected.get_basis_map_list()
+    assert sorted(mapper.available_syndromes.taken) == sorted(expected.available_syndromes.taken)
+
+def test_add_patterns_failure_leaves_mapper_unchanged():
+    T = [[1,0,0], [0,0,1]]
+    mapper = GreedySyndromeMapper(T)
+    before = dict(mapper.syndrome_map)
+    # (1,1,0) needs the syndrome of (0,1,0), which is not in T
+    with pytest.raises(RuntimeError):
+        mapper.add_patterns([[1,1,0]])
+    assert dict(mapper.syndrome_map) == before
+    assert mapper.sorted_error_patterns == [(0,0,1), (1,0,0)]
+    assert sorted(mapper.available_syndromes.taken) == sorted(mapper.packed_syndrome_map.values())
+
+def test_export_formats_match_tuple_outputs(tmp_path):
+    T = [[0,0,1], [0,1,0], [0,1,1], [1,0,0], [1,1,0]]
+    mapper = GreedySyndromeMapper(T)
+    expected = sorted(mapper.syndrome_map.items())
+
+    lines = io.BytesIO()
+    mapper.export(lines, "full", "lines")
+    assert lines.getvalue().decode().splitlines() == [
+        "".join(map(str, v)) + " " + "".join(map(str, s)) for v, s in expected]
+
+    packed = io.BytesIO()
+    mapper.export(packed, "basis", "packbits")
+    records = np.frombuffer(packed.getvalue(), dtype=np.uint8).reshape(-1, 2)
+    basis = mapper.get_basis_map_list()
+    assert (np.unpackbits(records[:, :1], axis=1, count=3) == np.array([b for b, _ in basis])).all()
+    assert (np.unpackbits(records[:, 1:], axis=1, count=3) == np.array([s for _, s in basis])).all()
+
+    mapper.export(str(tmp_path / "all.npz"), "all", "npz")
+    with np.load(tmp_path / "all.npz") as data:
+        assert [tuple(v) for v in data["vectors"]] == [v for v, _ in expected]
+        assert (data["parity_check_matrix"] == mapper.get_parity_check_matrix()).all()
+
+def test_export_rejects_unknown_format():
+    mapper = GreedySyndromeMapper([[1,0], [0,1]])
+    with pytest.raises(ValueError):
+        mapper.export(io.BytesIO(), "full", "csv")
+    with pytest.raises(ValueError):
+        mapper.export(io.BytesIO(), "all", "lines")
+
+def test_construction_stats_record_every_dimension():
+    T = [list(v) for v in itertools.product([0, 1], repeat=8) if 0 < sum(v) <= 2]
+    seen = []
+    stats = ConstructionStats(callback=seen.append)
+    mapper = GreedySyndromeMapper(T, stats=stats)
+    assert mapper.packed_syndrome_map == GreedySyndromeMapper(T).packed_syndrome_map
+    assert seen == stats.dimensions
+    assert [d.dimension for d in stats.dimensions] == list(range(8))
+    taken = 0
+    for d in stats.dimensions:
+        taken += d.group_size
+        assert d.failure is None
+        assert d.candidates == d.syndrome
+        assert d.rejected_unavailable + d.rejected_collision == d.syndrome - 1
+        assert d.pool_taken == taken
+    assert stats.totals()["pool_taken"] == len(mapper.syndrome_map)
+    assert len(stats.format_table().splitlines()) == 9
+
+def test_construction_stats_record_failure():
+    stats = ConstructionStats()
+    with pytest.raises(RuntimeError):
+        GreedySyndromeMapper([[1,0], [1,1]], stats=stats)
+    assert stats.dimensions[-1].dimension == 1
+    assert stats.dimensions[-1].failure == "missing residual"
+
+def test_syndrome_pool_grows_only_when_needed():
+    pool = _SyndromePool(2, max_width=4)
+    pool.take([1, 2, 3])
+    assert pool.first_fit([]) == 4
+    assert pool.width == 3
+    pool.take([4, 5, 6, 7])
+    assert pool.first_fit([1]) == 8
+    assert pool.width == 4
+    pool.take(range(8, 16))
+    assert pool.first_fit([]) is None
+
+def test_redundancy_search_matches_full_width_search():
+    for n, max_weight in [(8, 2), (10, 3), (16, 2)]:
+        T = [list(v) for v in itertools.product([0, 1], repeat=n) if 0 < sum(v) <= max_weight]
+        mapper = GreedySyndromeMapper(T)
+        full_width = GreedySyndromeMapper(T, max_redundancy=n)
+        assert mapper.packed_syndrome_map == full_width.packed_syndrome_map
+        assert mapper.redundancy == mapper.get_parity_check_matrix().shape[0]
+        assert mapper.available_syndromes.width == mapper.redundancy
+
+def test_max_redundancy_limits_check_bits():
+    T = [list(v) for v in itertools.product([0, 1], repeat=10) if 0 < sum(v) <= 2]
+    r = GreedySyndromeMapper(T).redundancy
+    assert GreedySyndromeMapper(T, max_redundancy=r).redundancy == r
+    with pytest.raises(RuntimeError, match=f"at most {r - 1} check bits"):
+        GreedySyndromeMapper(T, max_redundancy=r - 1)
+    with pytest.raises(RuntimeError, match=f"at most {r - 1} check bits"):
+        GreedySyndromeMapper(T).check_redundancy(r - 1)
+    with pytest.raises(ValueError):
+        GreedySyndromeMapper(T, max_redundancy=0)
+
+def test_resumable_construction_matches_uninterrupted(tmp_path):
+    T = [list(v) for v in itertools.product([0, 1], repeat=14) if 0 < sum(v) <= 2]
+    expected = GreedySyndromeMapper(T)
+    checkpoint = str(tmp_path / "run.ckpt")
+    partial = GreedySyndromeMapper.resumable(T, checkpoint, time_budget=0)
+    assert not partial.complete and partial.pending_dimensions == list(range(14))
+    # Kill the run during dimension 7, with a checkpoint saved after every dimension
+    def interrupt(d):
+        if d.dimension == 7:
+            raise KeyboardInterrupt
+    with pytest.raises(KeyboardInterrupt):
+        GreedySyndromeMapper.resumable(T, checkpoint, checkpoint_interval=0, stats=ConstructionStats(interrupt))
+    resumed_stats = ConstructionStats()
+    resumed = GreedySyndromeMapper.resumable(T, checkpoint, stats=resumed_stats)
+    assert [d.dimension for d in resumed_stats.dimensions] == list(range(7, 14))
+    assert resumed.packed_syndrome_map == expected.packed_syndrome_map
+    assert resumed.get_parity_check_matrix().tolist() == expected.get_parity_check_matrix().tolist()
+    assert not os.path.exists(checkpoint) # Removed once the construction completes
+
+def test_checkpoint_must_match_the_patterns(tmp_path):
+    checkpoint = str(tmp_path / "run.ckpt")
+    GreedySyndromeMapper.resumable([[0, 1], [1, 0]], checkpoint, time_budget=0)
+    with pytest.raises(ValueError, match="other error patterns"):
+        GreedySyndromeMapper.resumable([[0, 1], [1, 0], [1, 1]], checkpoint)
+    with pytest.raises(ValueError, match="other error patterns"):
+        GreedySyndromeMapper.resumable([[0, 1], [1, 0]], checkpoint, max_redundancy=1)
+    (tmp_path / "junk").write_bytes(b"not a checkpoint")
+    with pytest.raises(ValueError, match="not a construction checkpoint"):
+        GreedySyndromeMapper.resumable([[0, 1], [1, 0]], str(tmp_path / "junk"))
+    assert GreedySyndromeMapper.resumable([1, 2], checkpoint, n=2).packed_syndrome_map == {1: 1, 2: 2}
+
 # Advanced: Test if __main__ examples run correctly (optional)
 def test_main_examples():
     script_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'greedy_syndrome_mapper.py'))
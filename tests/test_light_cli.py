@@ -0,0 +1,43 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the Python path BEFORE importing the module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from greedy_syndrome_mapper import GreedySyndromeMapper
+from light_cli import read_pattern_file
+from pattern_generators import family_patterns
+
+
+@pytest.mark.parametrize("fmt", ["npy", "npz", "lines"])
+def test_exported_mapping_reads_back_as_patterns(tmp_path, fmt):
+    patterns = family_patterns("weight:9:2")
+    mapper = GreedySyndromeMapper(patterns)
+    path = str(tmp_path / f"mapping.{fmt}")
+    mapper.export(path, "full", fmt)
+    assert GreedySyndromeMapper(read_pattern_file(path)).packed_syndrome_map == mapper.packed_syndrome_map
+
+def test_packbits_needs_the_vector_length(tmp_path):
+    patterns = family_patterns("burst:11:3")
+    path = str(tmp_path / "patterns.bin")
+    np.packbits(patterns, axis=1).tofile(path)
+    assert (read_pattern_file(f"{path}:11") == patterns).all()
+    with pytest.raises(ValueError, match="vector length"):
+        read_pattern_file(path)
+    (tmp_path / "odd.bin").write_bytes(b"\x80\x00\x40")
+    with pytest.raises(ValueError, match="whole number"):
+        read_pattern_file(f"{tmp_path / 'odd.bin'}:11")
+
+def test_literal_lines_and_invalid_files(tmp_path):
+    text = tmp_path / "patterns.txt"
+    text.write_text("[1, 0, 0]\n\n(0, 1, 1)\n")
+    assert read_pattern_file(str(text)) == [[1, 0, 0], (0, 1, 1)]
+    lines = tmp_path / "bad.lines"
+    lines.write_text("0102\n1000\n")
+    with pytest.raises(ValueError, match="0/1 entries"):
+        read_pattern_file(str(lines))
+    with pytest.raises(ValueError, match="suffix"):
+        read_pattern_file(f"{text}:3")
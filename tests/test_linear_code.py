@@ -0,0 +1,123 @@
+import itertools
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the Python path BEFORE importing the module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from greedy_syndrome_mapper import GreedySyndromeMapper
+from linear_code import GeneratorMatrix, ParityCheckMatrix, pack_words, unpack_words
+from syndrome_decoder import SyndromeDecoder
+
+
+def dense_rank(matrix):
+    rows = [int("".join(map(str, row)), 2) for row in matrix]
+    rank = 0
+    while rows:
+        pivot = max(rows)
+        rows.remove(pivot)
+        if pivot:
+            rank += 1
+            top = pivot.bit_length()
+            rows = [r ^ pivot if r.bit_length() == top else r for r in rows]
+    return rank
+
+def test_pack_words_round_trip():
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, size=(5, 130), dtype=np.uint8)
+    words = pack_words(bits)
+    assert words.shape == (5, 3)
+    assert words[0, 0] >> np.uint64(63) == bits[0, 0]
+    assert (unpack_words(words, 130) == bits).all()
+
+@pytest.mark.parametrize("n", [7, 64, 150])
+def test_syndromes_match_dense_product(n):
+    rng = np.random.default_rng(n)
+    dense = rng.integers(0, 2, size=(12, n))
+    H = ParityCheckMatrix.from_dense(dense)
+    assert (H.to_dense() == dense).all() and H.to_dense().dtype == np.int_
+    words = rng.integers(0, 2, size=(300, n), dtype=np.uint8)
+    expected = (words.astype(np.int64) @ dense.T) % 2
+    assert (H.syndrome_bits(words) == expected).all()
+    assert (H.syndrome_bits(np.packbits(words, axis=1), packed=True) == expected).all()
+    assert (H @ words.T == expected.T).all()
+    packed = H.syndromes(words)
+    assert (((packed[:, None] >> np.arange(11, -1, -1, dtype=np.uint64)) & np.uint64(1)) == expected).all()
+
+def test_mapper_parity_check_agrees_with_decoder():
+    T = [list(v) for v in itertools.product([0, 1], repeat=11) if 0 < sum(v) <= 2]
+    mapper = GreedySyndromeMapper(T)
+    H = mapper.get_parity_check()
+    assert (H.to_dense() == mapper.get_parity_check_matrix()).all()
+    assert (H.syndromes(T) == SyndromeDecoder(mapper).syndromes(T)).all()
+
+def test_parity_check_follows_syndrome_map_for_non_unit_basis():
+    T = [[0,0,1], [0,1,1], [1,1,0], [1,0,0], [0,1,0]]
+    mapper = GreedySyndromeMapper(T)
+    H = mapper.get_parity_check()
+    expected = [mapper.packed_syndrome_map[int("".join(map(str, v)), 2)] for v in T]
+    assert H.syndromes(T).tolist() == expected
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rank_and_systematic_form(seed):
+    rng = np.random.default_rng(seed)
+    dense = rng.integers(0, 2, size=(8, 20))
+    dense[5] = dense[1] ^ dense[2] # Force a dependent row
+    H = ParityCheckMatrix.from_dense(dense)
+    r = H.rank()
+    assert r == dense_rank(dense)
+    systematic, permutation = H.systematic_form()
+    assert systematic.shape == (r, 20)
+    assert (systematic.to_dense()[:, 20 - r:] == np.eye(r, dtype=np.int_)).all()
+    assert sorted(permutation.tolist()) == list(range(20))
+    G = H.generator_matrix()
+    assert G.shape == (20 - r, 20)
+    assert not ((G.astype(np.int64) @ dense.T) % 2).any()
+    assert dense_rank(G) == 20 - r
+
+def test_packed_syndromes_need_at_most_64_rows():
+    H = ParityCheckMatrix.from_dense(np.eye(70, dtype=np.uint8))
+    with pytest.raises(ValueError):
+        H.syndromes(np.zeros((1, 70), dtype=np.uint8))
+    assert H.syndrome_bits(np.eye(70, dtype=np.uint8)).tolist() == np.eye(70, dtype=np.uint8).tolist()
+
+@pytest.mark.parametrize("n", [11, 70])
+def test_encode_batch_round_trip(n):
+    T = [list(v) for v in np.eye(n, dtype=np.uint8)] + [[1] * 2 + [0] * (n - 2)]
+    mapper = GreedySyndromeMapper(T)
+    G = mapper.get_generator_matrix()
+    assert G.shape == (n - mapper.get_parity_check().rank(), n)
+    rng = np.random.default_rng(n)
+    messages = rng.integers(0, 2, size=(500, G.k), dtype=np.uint8)
+    codewords = G.encode_batch(messages)
+    assert (codewords == (messages.astype(np.int64) @ G.to_dense()) % 2).all()
+    assert (G.extract_messages(codewords) == messages).all()
+    assert not mapper.get_parity_check().syndrome_bits(codewords).any()
+    packed = G.encode_batch(np.packbits(messages, axis=1).tobytes(), packed=True)
+    assert (packed == np.packbits(codewords, axis=1)).all()
+    errors = np.array(T, dtype=np.uint8)[rng.integers(0, len(T), size=500)]
+    corrected = SyndromeDecoder(mapper).decode_batch(codewords ^ errors)
+    assert (corrected == codewords).all()
+
+def test_generator_matrix_reduces_once(monkeypatch):
+    T = [list(v) for v in np.eye(9, dtype=np.uint8)] + [[1, 1] + [0] * 7]
+    H = GreedySyndromeMapper(T).get_parity_check()
+    calls = []
+    reduce = ParityCheckMatrix._reduce
+    monkeypatch.setattr(ParityCheckMatrix, "_reduce", lambda self: calls.append(1) or reduce(self))
+    G = GeneratorMatrix.from_parity_check(H)
+    assert len(calls) == 1
+    assert (G.to_dense() == H.generator_matrix()).all()
+
+def test_encode_file(tmp_path):
+    T = [[1, 0, 0, 0, 0], [0, 1, 0, 0, 0], [0, 0, 1, 0, 0], [0, 0, 0, 1, 0], [0, 0, 0, 0, 1]]
+    G = GreedySyndromeMapper(T).get_generator_matrix()
+    messages = np.random.default_rng(1).integers(0, 2, size=(37, G.k), dtype=np.uint8)
+    (tmp_path / "in.bin").write_bytes(np.packbits(messages, axis=1).tobytes())
+    stats = G.encode_file(str(tmp_path / "in.bin"), str(tmp_path / "out.bin"), chunk_words=8)
+    assert stats.words == 37
+    written = np.frombuffer((tmp_path / "out.bin").read_bytes(), dtype=np.uint8).reshape(37, G.n_bytes)
+    assert (written == np.packbits(G.encode_batch(messages), axis=1)).all()
@@ -0,0 +1,66 @@
+import itertools
+import os
+import random
+import shutil
+import sys
+
+import pytest
+
+# Add the parent directory to the Python path BEFORE importing the module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import native_backend
+from greedy_syndrome_mapper import GreedySyndromeMapper
+from pattern_generators import family_patterns
+
+
+@pytest.fixture(scope="module")
+def native_library(tmp_path_factory):
+    if not (os.environ.get("CXX") or shutil.which("c++") or shutil.which("g++") or shutil.which("clang++")):
+        pytest.skip("No C++ compiler available to build the native backend.")
+    path = native_backend.build(str(tmp_path_factory.mktemp("native")))
+    assert native_backend.load(path) is not None
+    return path
+
+def build_both(monkeypatch, patterns, n):
+    monkeypatch.setenv("LTC_BACKEND", "native")
+    native = GreedySyndromeMapper.from_packed(patterns, n)
+    monkeypatch.setenv("LTC_BACKEND", "python")
+    python = GreedySyndromeMapper.from_packed(patterns, n)
+    return native, python
+
+@pytest.mark.parametrize("spec", ["weight:12:3", "burst:40:6", "cyclic-burst:24:4", "weight:64:2"])
+def test_native_matches_python_on_families(native_library, monkeypatch, spec):
+    n = int(spec.split(":")[1])
+    native, python = build_both(monkeypatch, family_patterns(spec, packed=True), n)
+    assert native.packed_syndrome_map == python.packed_syndrome_map
+    assert (native.get_parity_check_matrix() == python.get_parity_check_matrix()).all()
+
+def test_native_matches_python_on_random_sets(native_library, monkeypatch):
+    rng = random.Random(3)
+    for _ in range(200):
+        n = rng.randint(1, 10)
+        patterns = {rng.getrandbits(n) for _ in range(rng.randint(1, 30))}
+        outcomes = []
+        for backend in ("native", "python"):
+            monkeypatch.setenv("LTC_BACKEND", backend)
+            try:
+                outcomes.append(GreedySyndromeMapper.from_packed(patterns, n).packed_syndrome_map)
+            except RuntimeError as e:
+                outcomes.append(str(e))
+        assert outcomes[0] == outcomes[1]
+
+def test_native_mapper_supports_incremental_additions(native_library, monkeypatch):
+    T = [list(v) for v in itertools.product([0, 1], repeat=7) if 0 < sum(v) <= 2]
+    monkeypatch.setenv("LTC_BACKEND", "native")
+    mapper = GreedySyndromeMapper(T[:10])
+    mapper.add_patterns(T[10:])
+    assert mapper.packed_syndrome_map == GreedySyndromeMapper(T).packed_syndrome_map
+
+def test_native_rejects_unsorted_patterns(native_library):
+    with pytest.raises(ValueError):
+        native_backend.construct_packed([3, 1], 2)
+
+def test_python_backend_can_be_forced(monkeypatch):
+    monkeypatch.setenv("LTC_BACKEND", "python")
+    assert not native_backend.available()
@@ -0,0 +1,62 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the Python path BEFORE importing the module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from greedy_syndrome_mapper import GreedySyndromeMapper
+from pattern_generators import (
+    burst_patterns,
+    cyclic_burst_patterns,
+    family_patterns,
+    packed_to_matrix,
+    weight_patterns,
+)
+
+
+def span(x, n, cyclic=False):
+    rotations = [((x << s) | (x >> (n - s))) & ((1 << n) - 1) for s in range(n)] if cyclic else [x]
+    best = n
+    for y in rotations:
+        ones = [i for i in range(n) if y >> i & 1]
+        best = min(best, ones[-1] - ones[0] + 1)
+    return best
+
+@pytest.mark.parametrize("n", [1, 5, 8])
+def test_families_match_brute_force(n):
+    vectors = range(1, 1 << n)
+    for t in range(1, n + 1):
+        assert weight_patterns(n, t, packed=True) == [x for x in vectors if bin(x).count("1") <= t]
+        assert burst_patterns(n, t, packed=True) == [x for x in vectors if span(x, n) <= t]
+        assert cyclic_burst_patterns(n, t, packed=True) == [x for x in vectors if span(x, n, cyclic=True) <= t]
+
+def test_long_vectors_use_python_ints():
+    n = 70
+    packed = weight_patterns(n, 2, packed=True)
+    assert len(packed) == n + n * (n - 1) // 2
+    matrix = weight_patterns(n, 2)
+    assert matrix.shape == (len(packed), n)
+    assert (matrix.sum(axis=1) <= 2).all()
+    # Seeds 1, 11, 101 and 111 in every position where they fit
+    assert len(burst_patterns(n, 3, packed=True)) == n + (n - 1) + 2 * (n - 2)
+
+def test_matrix_rows_follow_packed_order():
+    packed = burst_patterns(6, 3, packed=True)
+    assert (packed_to_matrix(packed, 6) == burst_patterns(6, 3)).all()
+
+def test_generated_matrix_feeds_mapper_directly():
+    matrix = weight_patterns(10, 2)
+    mapper = GreedySyndromeMapper(matrix)
+    expected = GreedySyndromeMapper(matrix.tolist())
+    assert dict(mapper.syndrome_map) == dict(expected.syndrome_map)
+    packed = GreedySyndromeMapper.from_packed(weight_patterns(10, 2, packed=True), 10)
+    assert dict(packed.syndrome_map) == dict(expected.syndrome_map)
+
+def test_family_spec_parsing():
+    assert family_patterns("cyclic-burst:7:2", packed=True) == cyclic_burst_patterns(7, 2, packed=True)
+    assert isinstance(family_patterns("weight:4:1"), np.ndarray)
+    with pytest.raises(ValueError):
+        family_patterns("hamming:7:1")
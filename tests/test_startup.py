@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import time
+
+# Add the parent directory to the Python path BEFORE importing the module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Extra wall time allowed for a small-code CLI call on top of a bare interpreter start.
+# Loading NumPy alone costs about 0.1 s and Typer as much again, so this leaves room for slow CI machines
+# while still catching a heavy import sneaking back onto the light path.
+STARTUP_BUDGET_SECONDS = 0.5
+
+
+def run_python(*args):
+    return subprocess.run([sys.executable, *args], cwd=REPO_DIR, stdin=subprocess.DEVNULL,
+                          capture_output=True, text=True, check=True).stdout
+
+def best_wall_time(*args, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_python(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def test_small_construction_does_not_load_numpy():
+    script = ("import sys\n"
+              "from greedy_syndrome_mapper import GreedySyndromeMapper\n"
+              "mapper = GreedySyndromeMapper([[0,0,1],[0,1,0],[1,0,0],[1,1,0]])\n"
+              "mapper.get_basis_map_list()\n"
+              "print('numpy' in sys.modules)\n"
+              "mapper.get_parity_check_matrix()\n"
+              "print('numpy' in sys.modules)\n")
+    assert run_python("-c", script).split() == ["False", "True"]
+
+def test_cli_modules_import_without_numpy():
+    script = "import sys, main, light_cli; print('numpy' in sys.modules, 'typer' in sys.modules)"
+    assert run_python("-c", script).split() == ["False", "True"]
+    script = "import sys, light_cli; print('numpy' in sys.modules, 'typer' in sys.modules)"
+    assert run_python("-c", script).split() == ["False", "False"]
+
+def test_light_cli_startup_budget():
+    output = run_python("light_cli.py", "basis-mapping", "--standard-basis", "8")
+    assert output.startswith("Basis mapping in original format:")
+    baseline = best_wall_time("-c", "pass")
+    elapsed = best_wall_time("light_cli.py", "basis-mapping", "--standard-basis", "8")
+    assert elapsed - baseline < STARTUP_BUDGET_SECONDS, f"light_cli.py took {elapsed:.3f} s (interpreter alone: {baseline:.3f} s)"
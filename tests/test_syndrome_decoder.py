@@ -0,0 +1,104 @@
+import itertools
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the Python path BEFORE importing the module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from greedy_syndrome_mapper import GreedySyndromeMapper
+from syndrome_decoder import SyndromeDecoder
+
+
+def weight_two_mapper(n):
+    T = [list(v) for v in itertools.product([0, 1], repeat=n) if 0 < sum(v) <= 2]
+    return GreedySyndromeMapper(T), np.array(T, dtype=np.uint8)
+
+def test_syndromes_match_parity_check_matrix():
+    mapper, errors = weight_two_mapper(9)
+    decoder = SyndromeDecoder(mapper)
+    H = mapper.get_parity_check_matrix()
+    assert decoder.r == H.shape[0]
+    expected = (errors.astype(np.int64) @ H.T) % 2
+    syndromes = decoder.syndromes(errors)
+    got = (syndromes[:, None] >> np.arange(decoder.r - 1, -1, -1, dtype=np.uint64)) & np.uint64(1)
+    assert (got == expected).all()
+
+@pytest.mark.parametrize("dense_bits", [22, 0])
+def test_decode_batch_corrects_every_pattern(monkeypatch, dense_bits):
+    monkeypatch.setattr(SyndromeDecoder, "_DENSE_TABLE_BITS", dense_bits)
+    mapper, errors = weight_two_mapper(10)
+    decoder = SyndromeDecoder(mapper)
+    corrected, uncorrectable = decoder.decode_batch(errors, return_uncorrectable=True)
+    assert not uncorrectable.any()
+    assert (corrected == 0).all()
+
+def test_decode_batch_packed_bytes_round_trip():
+    mapper, errors = weight_two_mapper(12)
+    decoder = SyndromeDecoder(mapper)
+    packed = np.packbits(errors, axis=1)
+    corrected = decoder.decode_batch(packed.tobytes(), packed=True)
+    assert corrected.shape == packed.shape
+    assert (corrected == 0).all()
+
+def test_uncorrectable_words_are_flagged_and_unchanged():
+    T = [[1,0,0,0], [0,1,0,0], [0,0,1,0], [0,0,0,1]]
+    decoder = SyndromeDecoder(GreedySyndromeMapper(T))
+    # Syndromes 1..4 are used; (1,0,0,1) has syndrome 4 ^ 1 = 5, which matches no pattern
+    words = np.array([[1,0,0,1], [0,0,1,0], [0,0,0,0]], dtype=np.uint8)
+    corrected, uncorrectable = decoder.decode_batch(words, return_uncorrectable=True)
+    assert uncorrectable.tolist() == [True, False, False]
+    assert corrected.tolist() == [[1,0,0,1], [0,0,0,0], [0,0,0,0]]
+
+@pytest.mark.parametrize("T", [[[0,1,0], [0,0,1]], [[0,1,0], [1,0,0]], [[1,1,0,0], [0,1,0,0], [0,0,1,1]]])
+def test_positions_without_a_basis_vector(T):
+    # Some positions are no pattern's highest dimension; their columns are free and set to zero
+    mapper = GreedySyndromeMapper(T)
+    errors = np.array(T, dtype=np.uint8)
+    H = mapper.get_parity_check_matrix()
+    assert H.shape[1] == len(mapper.get_basis_map_list())
+    syndromes = mapper.get_parity_check().syndrome_bits(errors)
+    assert sorted(map(tuple, syndromes.tolist())) == sorted(
+        tuple(int(b) for b in format(s, f"0{syndromes.shape[1]}b")) for s in mapper.packed_syndrome_map.values())
+    corrected = SyndromeDecoder(mapper).decode_batch(errors)
+    assert (corrected == 0).all()
+    G = mapper.get_generator_matrix()
+    assert not mapper.get_parity_check().syndrome_bits(G.to_dense()).any()
+
+def test_decode_batch_rejects_wrong_width():
+    mapper, _ = weight_two_mapper(6)
+    with pytest.raises(ValueError):
+        SyndromeDecoder(mapper).decode_batch(np.zeros((3, 5), dtype=np.uint8))
+
+def test_decode_file_in_chunks(tmp_path):
+    mapper, errors = weight_two_mapper(10)
+    decoder = SyndromeDecoder(mapper)
+    received = np.packbits(np.vstack([errors, np.ones((3, 10), dtype=np.uint8)]), axis=1)
+    input_path = tmp_path / "received.bin"
+    output_path = tmp_path / "corrected.bin"
+    received.tofile(input_path)
+    stats = decoder.decode_file(str(input_path), str(output_path), chunk_words=7)
+    corrected = np.fromfile(output_path, dtype=np.uint8).reshape(received.shape)
+    assert stats.words == len(received)
+    assert (corrected == decoder.decode_batch(received, packed=True)).all()
+    assert (corrected[:len(errors)] == 0).all()
+    assert stats.uncorrectable == int(decoder.decode_batch(received, packed=True, return_uncorrectable=True)[1].sum())
+
+def test_decode_file_rejects_partial_words(tmp_path):
+    mapper, _ = weight_two_mapper(10)
+    input_path = tmp_path / "received.bin"
+    input_path.write_bytes(b"\x00" * 5)
+    with pytest.raises(ValueError):
+        SyndromeDecoder(mapper).decode_file(str(input_path), str(tmp_path / "out.bin"))
+
+def test_decode_batch_parallel_matches_serial():
+    mapper, errors = weight_two_mapper(12)
+    decoder = SyndromeDecoder(mapper)
+    rng = np.random.default_rng(7)
+    words = np.vstack([errors, rng.integers(0, 2, size=(500, 12), dtype=np.uint8)])
+    expected, expected_mask = decoder.decode_batch(words, return_uncorrectable=True)
+    corrected, mask = decoder.decode_batch_parallel(words, return_uncorrectable=True, workers=2, slice_words=97)
+    assert (corrected == expected).all()
+    assert (mask == expected_mask).all()